@@ -10,10 +10,22 @@ class Settings(BaseSettings):
 
     # Rate Limiting
     requests_per_minute: int = 600
+    # Per route class; 0 disables the limit (uploads are unlimited by default)
+    auth_requests_per_minute: int = 20
+    upload_requests_per_minute: int = 0
+    export_requests_per_minute: int = 30
+    rate_limit_max_clients: int = 100_000  # LRU bound of tracked clients per worker
     max_login_attempts: int = 5
 
     # Database
     database_url: str
+    # Connection pool, per engine and per worker process. Size it so that
+    # workers * (pool_size + max_overflow) stays below Postgres max_connections.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # Seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # Replace connections older than this (seconds)
+    db_pool_pre_ping: bool = False  # Extra round-trip per checkout; recycle is usually enough
 
     # Security
     jwt_secret: SecretStr
@@ -22,17 +34,39 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
     allowed_origins: str = "*"
     allowed_hosts: List[str] = ["localhost", "127.0.0.1"]
+    # Authenticated principals cached per worker; the TTL bounds cross-worker staleness
+    principal_cache_ttl: int = 60
+    principal_cache_size: int = 10000
     create_tables: bool = False
 
+    # Response cache for the public call endpoints
+    response_cache_ttl: int = 30  # Upper bound; call start/end dates can shorten it
+    response_cache_size: int = 1000  # Entries per worker
+    # Call rankings are cleared on every review write; the TTL is only a safety net
+    rankings_cache_ttl: int = 300
+    review_divergence_threshold: int = 30  # Score spread (max - min) that flags an application
+    review_lease_seconds: int = 900  # How long a queue item stays with the session that opened it
+
     # File Upload
     upload_dir: str = "uploads"  # <--- Yeni eklendi
     max_upload_size: int = 10 * 1024 * 1024  # <--- Yeni eklendi
+    max_request_size: int = 50 * 1024 * 1024  # Whole multipart body, all files included
+    blob_store_backend: str = "local"  # Attachment bytes are kept outside the DB
+    # Internal location served by the reverse proxy (e.g. "/protected-uploads").
+    # When set, local downloads are handed off with X-Accel-Redirect.
+    accel_redirect_prefix: str | None = None
+
+    # PDF exports
+    export_dir: str = "exports"  # Cached artifacts and job state, shared by workers
+    export_workers: int = 2  # Processes rendering PDFs per API worker
+    export_chunk_size: int = 200  # Applications per wkhtmltopdf run
 
     # App
     base_url: str
 
     # Redis
-    redis_url: str | None = None
+    redis_url: str | None = None  # Shares rate limits and the response cache across workers
+    rate_limit_redis_timeout: float = 0.2  # Seconds before falling back to local limits
 
     # Monitoring
     sentry_dsn: str | None = None
@@ -44,6 +78,15 @@ class Settings(BaseSettings):
     smtp_user: str | None = None
     smtp_password: SecretStr | None = None
     from_email: str | None = None
+    smtp_use_ssl: bool = True  # Implicit TLS (port 465); False sends STARTTLS when offered
+    smtp_pool_size: int = 2  # Open connections kept by the outbox sender, per process
+    # Outbox sender
+    email_sender_enabled: bool = False  # Also run the sender inside each API worker
+    email_batch_size: int = 50
+    email_rate_per_second: float = 10.0  # 0 disables the cap
+    email_max_attempts: int = 5
+    email_retry_backoff: float = 30.0  # Seconds before the first retry; doubles per attempt
+    email_poll_interval: float = 5.0  # Seconds between checks for due retries
 
     @validator("jwt_secret", pre=True, always=True)
     def validate_jwt_secret(cls, v):
@@ -1,12 +1,21 @@
+from collections import defaultdict
+
+from sqlalchemy import func, select, true
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..models.application import Application
+from ..models.application import Application, ApplicationStatus
 from ..models.call import Call
-from ..crud.attachment import get_attachments_by_application, attachments_confirmed
-from sqlalchemy.orm import joinedload
+from ..crud.attachment import release_blobs
+from ..models.attachment import Attachment
+from sqlalchemy.orm import aliased, joinedload
 from app.models import Application, User
-from app.schemas.application import ApplicationDetail, ReviewerShort
+from app.schemas.application import MAX_REVIEWERS_PER_APPLICATION, ApplicationDetail, ReviewerShort
+from app.schemas.attachment import AttachmentOut
 from app.models.application_reviewer import ApplicationReviewer
+from app.services.response_cache import get_rankings_cache
+from app.utils.pagination import DEFAULT_PAGE_SIZE, Page, paginate, paginate_async
 
 
 def is_reviewer_assigned(db: Session, application_id: int, user_id: int) -> bool:
@@ -33,7 +42,12 @@ def create_application(db: Session, call_id: int, content: str, user_id: int) ->
     # 3) Yeni başvuru
     application = Application(user_id=user_id, call_id=call_id, content=content)
     db.add(application)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request won the race past the check above
+        db.rollback()
+        raise ValueError("You have already applied to this call")
     db.refresh(application)
     return application
 
@@ -69,57 +83,156 @@ def confirm_documents(db: Session, application: Application) -> Application:
     return application
 
 
-def _build_application_detail(db: Session, app: Application) -> ApplicationDetail:
-    """Helper to convert an Application model to ApplicationDetail"""
-    return ApplicationDetail(
-        id=app.id,
-        user_id=app.user_id,
-        call_id=app.call_id,
-        content=app.content,
-        status=app.status,
-        created_at=app.created_at,
-        documents_confirmed=attachments_confirmed(db, app.id),
-        user=app.user,
-        attachments=get_attachments_by_application(db, app.id),
-        reviewers=[
-            ReviewerShort(
-                id=r.user.id,
-                first_name=r.user.first_name,
-                last_name=r.user.last_name,
-            )
-            for r in getattr(app, "review_assignments", [])
-            if r.user
-        ],
+def _confirmed_exists():
+    """Correlated EXISTS telling whether an application has a confirmed attachment."""
+    return (
+        select(Attachment.id)
+        .where(Attachment.application_id == Application.id, Attachment.is_confirmed == True)
+        .exists()
+        .label("documents_confirmed")
     )
 
 
+def build_application_details(db: Session, rows: list[tuple[Application, bool]]) -> list[ApplicationDetail]:
+    """Build ApplicationDetail objects for many applications at once.
+
+    ``rows`` are ``(application, documents_confirmed)`` pairs with the user
+    already loaded. Attachments and reviewers for all applications are
+    fetched with one metadata-only query each, so the total number of queries
+    does not depend on how many applications are passed in.
+    """
+    ids = [app.id for app, _ in rows]
+    if not ids:
+        return []
+
+    attachments: dict[int, list[AttachmentOut]] = defaultdict(list)
+    for att in db.execute(
+        select(
+            Attachment.id,
+            Attachment.application_id,
+            Attachment.document_id,
+            Attachment.file_name,
+            Attachment.is_confirmed,
+            Attachment.size,
+            Attachment.content_type,
+        )
+        .where(Attachment.application_id.in_(ids))
+        .order_by(Attachment.id)
+    ).mappings():
+        attachments[att["application_id"]].append(AttachmentOut(**att))
+
+    reviewers: dict[int, list[ReviewerShort]] = defaultdict(list)
+    for application_id, reviewer_id, first_name, last_name in db.execute(
+        select(ApplicationReviewer.application_id, User.id, User.first_name, User.last_name)
+        .join(User, User.id == ApplicationReviewer.user_id)
+        .where(ApplicationReviewer.application_id.in_(ids))
+        .order_by(ApplicationReviewer.id)
+    ):
+        reviewers[application_id].append(
+            ReviewerShort(id=reviewer_id, first_name=first_name, last_name=last_name)
+        )
+
+    return [
+        ApplicationDetail(
+            id=app.id,
+            user_id=app.user_id,
+            call_id=app.call_id,
+            content=app.content,
+            status=app.status,
+            created_at=app.created_at,
+            documents_confirmed=bool(confirmed),
+            user=app.user,
+            attachments=attachments[app.id],
+            reviewers=reviewers[app.id],
+        )
+        for app, confirmed in rows
+    ]
+
+
 def get_applications_by_call(db: Session, call_id: int) -> list[ApplicationDetail]:
-    applications = db.query(Application).options(
-        joinedload(Application.user),
-        joinedload(Application.review_assignments).joinedload(ApplicationReviewer.user)
-    ).filter(Application.call_id == call_id).all()
-    result = []
-    for app in applications:
-        result.append(_build_application_detail(db, app))
-    return result
+    rows = db.execute(
+        select(Application, _confirmed_exists())
+        .options(joinedload(Application.user))
+        .where(Application.call_id == call_id)
+        .order_by(Application.id)
+    ).all()
+    return build_application_details(db, rows)
 
 
-def get_application_detail(db: Session, application_id: int) -> ApplicationDetail | None:
-    app = (
-        db.query(Application)
-        .options( joinedload(Application.user),joinedload(Application.review_assignments).joinedload(ApplicationReviewer.user))
-        .filter(Application.id == application_id)
-        .first()
+def get_application_details(db: Session, application_ids: list[int]) -> list[ApplicationDetail]:
+    """ApplicationDetail objects for the given ids, ordered by id."""
+    rows = db.execute(
+        select(Application, _confirmed_exists())
+        .options(joinedload(Application.user))
+        .where(Application.id.in_(application_ids))
+        .order_by(Application.id)
+    ).all()
+    return build_application_details(db, rows)
+
+
+def paginate_applications_by_call(
+    db: Session, call_id: int, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Page[ApplicationDetail]:
+    """Return one keyset page of a call's applications as ApplicationDetail objects."""
+    page = paginate(
+        db,
+        select(Application, _confirmed_exists())
+        .options(joinedload(Application.user))
+        .where(Application.call_id == call_id),
+        sort_column=Application.created_at,
+        id_column=Application.id,
+        cursor=cursor,
+        limit=limit,
     )
-    if not app:
+    return Page(items=build_application_details(db, page.items), next_cursor=page.next_cursor)
+
+
+def get_application_detail(db: Session, application_id: int) -> ApplicationDetail | None:
+    row = db.execute(
+        select(Application, _confirmed_exists())
+        .options(joinedload(Application.user))
+        .where(Application.id == application_id)
+    ).first()
+    if not row:
         return None
-    return _build_application_detail(db, app)
+    return build_application_details(db, [row])[0]
+
+
+def get_application_detail_version(db: Session, application_id: int) -> tuple | None:
+    """Everything :func:`get_application_detail` depends on, in one small row.
+
+    The application's and applicant's ``updated_at``, and for attachments and
+    reviewer assignments their count, id sum and latest ``updated_at``. New
+    rows always get larger ids, so any change to either set changes the
+    tuple. Returns None when the application does not exist.
+    """
+    reviewer = aliased(User)
+    attachments = (
+        select(func.count(Attachment.id), func.sum(Attachment.id), func.max(Attachment.updated_at))
+        .where(Attachment.application_id == application_id)
+        .subquery()
+    )
+    reviewers = (
+        select(func.count(ApplicationReviewer.id), func.sum(ApplicationReviewer.id), func.max(reviewer.updated_at))
+        .join(reviewer, reviewer.id == ApplicationReviewer.user_id)
+        .where(ApplicationReviewer.application_id == application_id)
+        .subquery()
+    )
+    row = db.execute(
+        select(Application.id, Application.updated_at, User.updated_at, *attachments.c, *reviewers.c)
+        .join(User, User.id == Application.user_id)
+        # Both aggregates are single rows
+        .join(attachments, true())
+        .join(reviewers, true())
+        .where(Application.id == application_id)
+    ).first()
+    return tuple(row) if row else None
 
 
 def assign_reviewer(db: Session, application_id: int, reviewer_id: int) -> Application:
     """Assign a reviewer to an application with many-to-many support.
 
-    Ensures no more than 3 distinct reviewers are assigned to a single
+    Ensures no more than MAX_REVIEWERS_PER_APPLICATION distinct reviewers are assigned to a single
     application and prevents duplicate assignments.
     """
 
@@ -135,24 +248,120 @@ def assign_reviewer(db: Session, application_id: int, reviewer_id: int) -> Appli
         raise ValueError("Reviewer already assigned")
 
     count = db.query(ApplicationReviewer).filter_by(application_id=application_id).count()
-    if count >= 3:
+    if count >= MAX_REVIEWERS_PER_APPLICATION:
         raise ValueError("Maximum number of reviewers reached")
 
     assignment = ApplicationReviewer(application_id=application_id, user_id=reviewer_id)
     db.add(assignment)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("Reviewer already assigned")
+    get_rankings_cache().invalidate()
 
     db.refresh(application)
     return application
 
-def get_applications_by_user(db: Session, user_id: int) -> list[Application]:
-    """Return all applications for a given user."""
-    return db.query(Application).filter(Application.user_id == user_id).all()
+def get_applications_by_user(
+    db: Session, user_id: int, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Page[Application]:
+    """Return one keyset page of applications for a given user."""
+    return paginate(
+        db,
+        select(Application).where(Application.user_id == user_id),
+        sort_column=Application.created_at,
+        id_column=Application.id,
+        cursor=cursor,
+        limit=limit,
+    )
 
 def delete_application_by_id(db: Session, application_id: int):
     application = db.query(Application).filter(Application.id == application_id).first()
     if not application:
         return None
+    blobs = db.query(Attachment.content_hash, Attachment.storage_key).filter(
+        Attachment.application_id == application_id
+    ).all()
     db.delete(application)
     db.commit()
+    get_rankings_cache().invalidate()
+    release_blobs(db, blobs)
+    return application
+
+
+# Async equivalents for the applicant-facing endpoints
+
+async def create_application_async(db: AsyncSession, call_id: int, content: str, user_id: int) -> Application:
+    call = await db.scalar(select(Call.id).where(Call.id == call_id, Call.is_open == True))
+    if not call:
+        raise ValueError("Call not found or not open")
+
+    if await get_application_by_user_and_call_async(db, user_id, call_id):
+        raise ValueError("You have already applied to this call")
+
+    application = Application(user_id=user_id, call_id=call_id, content=content)
+    db.add(application)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("You have already applied to this call")
+    await db.refresh(application)
+    return application
+
+
+async def get_application_by_user_and_call_async(
+    db: AsyncSession, user_id: int, call_id: int
+) -> Application | None:
+    """Return application for a given user and call."""
+    return await db.scalar(
+        select(Application).where(Application.user_id == user_id, Application.call_id == call_id)
+    )
+
+
+async def get_application_for_user_async(
+    db: AsyncSession, application_id: int, user_id: int
+) -> Application | None:
+    """Return application by id belonging to the given user."""
+    return await db.scalar(
+        select(Application).where(Application.id == application_id, Application.user_id == user_id)
+    )
+
+
+async def get_application_version_async(
+    db: AsyncSession, application_id: int, user_id: int
+) -> tuple | None:
+    """``(id, updated_at)`` of the user's application, without loading its content."""
+    row = (
+        await db.execute(
+            select(Application.id, Application.updated_at).where(
+                Application.id == application_id, Application.user_id == user_id
+            )
+        )
+    ).first()
+    return tuple(row) if row else None
+
+
+async def get_applications_by_user_async(
+    db: AsyncSession, user_id: int, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Page[Application]:
+    """Return one keyset page of applications for a given user."""
+    return await paginate_async(
+        db,
+        select(Application).where(Application.user_id == user_id),
+        sort_column=Application.created_at,
+        id_column=Application.id,
+        cursor=cursor,
+        limit=limit,
+    )
+
+
+async def set_application_status_async(
+    db: AsyncSession, application: Application, status: ApplicationStatus
+) -> Application:
+    application.status = status
+    await db.commit()
+    await get_rankings_cache().invalidate_async()
+    await db.refresh(application)
     return application
@@ -1,7 +1,19 @@
+from collections import defaultdict
+from typing import BinaryIO, Iterable
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from ..models.application import Application
+from ..models.application_reviewer import ApplicationReviewer
 from ..models.attachment import Attachment
+from ..models.blob_lock import BlobLock
 from ..schemas.attachment import AttachmentCreate
+from ..services.blob_store import BlobStore, StagedBlob, StoredBlob, get_blob_store
+from ..services.zip_stream import ArchiveEntry
+
+LOCK_ATTEMPTS = 5
 
 
 def create_attachment(db: Session, attachment_in: AttachmentCreate) -> Attachment:
@@ -12,11 +24,135 @@ def create_attachment(db: Session, attachment_in: AttachmentCreate) -> Attachmen
     return attachment
 
 
+def _lock_blob(db: Session, content_hash: str) -> None:
+    """Lock the blob with this hash until the transaction ends.
+
+    An ``UPDATE`` instead of ``SELECT ... FOR UPDATE`` because SQLite ignores
+    ``FOR UPDATE`` but does take its write lock for an update. The lock row
+    is created on first use; a concurrent insert of the same row is retried.
+    """
+    for _ in range(LOCK_ATTEMPTS):
+        result = db.execute(
+            update(BlobLock).where(BlobLock.content_hash == content_hash).values(locked_at=func.now())
+        )
+        if result.rowcount == 1:
+            return
+        try:
+            db.add(BlobLock(content_hash=content_hash))
+            db.flush()
+            return
+        except IntegrityError:
+            db.rollback()
+    raise RuntimeError(f"Could not lock blob {content_hash}")
+
+
+def publish_blob(db: Session, staged: StagedBlob, store: BlobStore) -> StoredBlob:
+    """Publish staged bytes under the storage key already used for their hash.
+
+    The blob's lock is taken first and held until the caller's transaction
+    ends, so the row pointing at the blob must be written in that transaction.
+    The smallest known key is reused; a new key is only used for new content.
+    """
+    _lock_blob(db, staged.content_hash)
+    known_keys = {
+        key
+        for (key,) in db.query(Attachment.storage_key)
+        .filter(Attachment.content_hash == staged.content_hash)
+        .distinct()
+    }
+    # Restores the blob if an earlier deletion left a row without it
+    return store.publish(staged, min(known_keys) if known_keys else None)
+
+
+def store_attachment(
+    db: Session,
+    *,
+    application_id: int,
+    document_id: int | None,
+    file_name: str,
+    stream: BinaryIO,
+    content_type: str | None = None,
+    store: BlobStore | None = None,
+) -> Attachment:
+    """Write the uploaded bytes to the blob store and persist only metadata.
+
+    Identical content is stored once: if another attachment already points to
+    a blob with the same hash, that storage key is reused. When no
+    ``content_type`` is given, the one sniffed by the stream (if any) is used.
+
+    The bytes are staged and hashed first; :func:`publish_blob` and the insert
+    of the row happen under the blob's lock, so :func:`release_blobs` cannot delete
+    the blob before the new row is committed.
+    """
+    store = store or get_blob_store()
+    staged = store.stage(stream)
+    content_type = content_type or getattr(stream, "content_type", None)
+
+    try:
+        blob = publish_blob(db, staged, store)
+        attachment = Attachment(
+            application_id=application_id,
+            document_id=document_id,
+            file_name=file_name,
+            content_hash=blob.content_hash,
+            storage_key=blob.storage_key,
+            size=blob.size,
+            content_type=content_type,
+            is_confirmed=False,
+        )
+        db.add(attachment)
+        db.commit()
+    except BaseException:
+        db.rollback()
+        store.discard(staged)
+        raise
+    db.refresh(attachment)
+    return attachment
+
+
+def release_blobs(db: Session, blobs: Iterable[tuple[str, str]], store: BlobStore | None = None) -> None:
+    """Delete blobs that are no longer referenced by any attachment row.
+
+    ``blobs`` are the ``(content_hash, storage_key)`` pairs of deleted
+    attachments. Each hash is checked and deleted under its lock, one
+    transaction per hash.
+    """
+    keys_by_hash: dict[str, set[str]] = defaultdict(set)
+    for content_hash, storage_key in blobs:
+        keys_by_hash[content_hash].add(storage_key)
+    if not keys_by_hash:
+        return
+    store = store or get_blob_store()
+    for content_hash, keys in keys_by_hash.items():
+        _lock_blob(db, content_hash)
+        still_used = {
+            key
+            for (key,) in db.query(Attachment.storage_key)
+            .filter(Attachment.content_hash == content_hash)
+            .distinct()
+        }
+        for key in keys - still_used:
+            store.delete(key)
+        if not still_used:
+            db.query(BlobLock).filter(BlobLock.content_hash == content_hash).delete()
+        db.commit()
+
+
 def get_attachments_by_application(db: Session, application_id: int) -> list[Attachment]:
     # Return all attachments linked to an application
     return db.query(Attachment).filter(Attachment.application_id == application_id).all()
 
 
+def get_attachments_version(db: Session, application_id: int) -> tuple:
+    """Count, id sum and latest ``updated_at`` of an application's attachments."""
+    count, id_sum, updated = (
+        db.query(func.count(Attachment.id), func.sum(Attachment.id), func.max(Attachment.updated_at))
+        .filter(Attachment.application_id == application_id)
+        .one()
+    )
+    return application_id, count, id_sum, updated
+
+
 def confirm_attachments(db: Session, application_id: int) -> None:
     """Mark all attachments for an application as confirmed."""
     db.query(Attachment).filter(Attachment.application_id == application_id).update(
@@ -48,10 +184,58 @@ def delete_attachment(db: Session, attachment_id: int) -> None:
     # Delete an attachment by its ID
     attachment = db.query(Attachment).filter(Attachment.id == attachment_id).first()
     if attachment:
+        blob = (attachment.content_hash, attachment.storage_key)
         db.delete(attachment)
         db.commit()
+        release_blobs(db, [blob])
 
 
 def get_attachment(db: Session, attachment_id: int) -> Attachment | None:
     # Retrieve a single attachment by ID
     return db.query(Attachment).filter(Attachment.id == attachment_id).first()
+
+
+def get_archive_entries(
+    db: Session,
+    *,
+    call_id: int | None = None,
+    application_id: int | None = None,
+    reviewer_id: int | None = None,
+) -> list[ArchiveEntry]:
+    """Attachment metadata for a ZIP bundle of a call or a single application.
+
+    With ``reviewer_id`` only applications assigned to that reviewer are
+    included. Call bundles put each application in its own folder.
+    """
+    query = (
+        db.query(
+            Attachment.application_id,
+            Attachment.file_name,
+            Attachment.storage_key,
+            Attachment.size,
+            Attachment.content_type,
+            Attachment.updated_at,
+        )
+        .join(Application, Application.id == Attachment.application_id)
+        .order_by(Attachment.application_id, Attachment.id)
+    )
+    if call_id is not None:
+        query = query.filter(Application.call_id == call_id)
+    if application_id is not None:
+        query = query.filter(Attachment.application_id == application_id)
+    if reviewer_id is not None:
+        query = query.join(
+            ApplicationReviewer,
+            (ApplicationReviewer.application_id == Application.id) & (ApplicationReviewer.user_id == reviewer_id),
+        )
+    return [
+        ArchiveEntry(
+            folder=f"application_{row.application_id}" if call_id is not None else "",
+            file_name=row.file_name,
+            storage_key=row.storage_key,
+            size=row.size,
+            content_type=row.content_type,
+            modified=row.updated_at.timetuple()[:6] if row.updated_at and row.updated_at.year >= 1980 else None,
+        )
+        for row in query
+    ]
@@ -1,9 +1,20 @@
+from datetime import datetime, timezone
+from typing import Literal
+
+from sqlalchemy import func, not_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from ..models.call import Call as CallModel, CallStatus
 from ..models.application import Application
 from ..schemas.call import CallCreate, CallUpdate
+from ..services.response_cache import get_response_cache
+from ..utils.pagination import DEFAULT_PAGE_SIZE, Page, paginate, paginate_async
+
+# Sort key for calls without a deadline, so they come last when ordering by
+# coalesce(end_date, NO_DEADLINE); the review queue sorts by it
+NO_DEADLINE = datetime(9999, 12, 31, tzinfo=timezone.utc)
 
 def create_call(db: Session, call_in: CallCreate) -> CallModel:
     """
@@ -23,6 +34,7 @@ def create_call(db: Session, call_in: CallCreate) -> CallModel:
     db.add(db_call)
     db.commit()
     db.refresh(db_call)
+    get_response_cache().invalidate()
     return db_call
 
 def get_call(db: Session, call_id: int) -> CallModel | None:
@@ -43,6 +55,7 @@ def update_call(db: Session, call_id: int, call_in: CallUpdate) -> CallModel | N
 
     db.commit()
     db.refresh(db_call)
+    get_response_cache().invalidate()
     return db_call
 
 def delete_call(db: Session, call_id: int) -> bool:
@@ -58,18 +71,83 @@ def delete_call(db: Session, call_id: int) -> bool:
         raise HTTPException(status_code=409, detail="Call has active applications")
     db.delete(db_call)
     db.commit()
+    get_response_cache().invalidate()
     return True
 
-def list_calls(db: Session, skip: int = 0, limit: int = 100) -> list[CallModel]:
-    """Return a paginated list of all calls."""
-    return db.query(CallModel).offset(skip).limit(limit).all()
-
-def list_open_calls(db: Session, skip: int = 0, limit: int = 100) -> list[CallModel]:
-    """Return a paginated list of only open calls."""
-    return (
-        db.query(CallModel)
-        .filter(CallModel.is_open == True)
-        .offset(skip)
-        .limit(limit)
-        .all()
+def list_calls(db: Session, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE) -> Page[CallModel]:
+    """Return a keyset-paginated list of all calls ordered by creation time."""
+    return paginate(
+        db,
+        select(CallModel),
+        sort_column=CallModel.created_at,
+        id_column=CallModel.id,
+        cursor=cursor,
+        limit=limit,
+    )
+
+def list_open_calls(db: Session, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE) -> Page[CallModel]:
+    """Return a keyset-paginated list of only open calls."""
+    return paginate(
+        db,
+        select(CallModel).where(CallModel.is_open == True),
+        sort_column=CallModel.created_at,
+        id_column=CallModel.id,
+        cursor=cursor,
+        limit=limit,
+    )
+
+
+# Async equivalents for the public listing endpoints
+
+async def get_call_async(db: AsyncSession, call_id: int) -> CallModel | None:
+    """Fetch a call by its ID."""
+    return await db.get(CallModel, call_id)
+
+def filter_calls(
+    *,
+    only_open: bool = False,
+    status: CallStatus | None = None,
+    category: str | None = None,
+    active: bool | None = None,
+    active_at: datetime | None = None,
+):
+    """Build the ``SELECT`` for a filtered call listing.
+
+    ``active`` evaluates :meth:`Call.active_at` in SQL at ``active_at``
+    (default: now), so activity is filtered by the database rather than per
+    loaded row.
+    """
+    stmt = select(CallModel)
+    if only_open:
+        stmt = stmt.where(CallModel.is_open == True)
+    if status is not None:
+        stmt = stmt.where(CallModel.status == status)
+    if category is not None:
+        stmt = stmt.where(CallModel.category == category)
+    if active is not None:
+        clause = CallModel.active_at(active_at or datetime.now(timezone.utc))
+        stmt = stmt.where(clause if active else not_(clause))
+    return stmt
+
+async def search_calls_async(
+    db: AsyncSession,
+    stmt,
+    order: Literal["created", "deadline"] = "created",
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> tuple[Page[CallModel], int]:
+    """Return one keyset page of ``stmt`` and the total number of matching calls."""
+    # Calls without a deadline come last; end_date stays bare so its indexes apply
+    deadline = order == "deadline"
+    sort_column = CallModel.end_date if deadline else CallModel.created_at
+    total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
+    page = await paginate_async(
+        db, stmt, sort_column=sort_column, id_column=CallModel.id, cursor=cursor, limit=limit, nulls_last=deadline
     )
+    return page, total
+
+async def next_activity_change_async(db: AsyncSession, now: datetime) -> tuple[datetime | None, datetime | None]:
+    """The earliest future ``start_date`` and ``end_date`` over all calls."""
+    next_start = await db.scalar(select(func.min(CallModel.start_date)).where(CallModel.start_date > now))
+    next_end = await db.scalar(select(func.min(CallModel.end_date)).where(CallModel.end_date >= now))
+    return next_start, next_end
@@ -1,7 +1,10 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..models.document import DocumentDefinition
 from ..schemas.document import DocumentFormat, DocumentDefinitionUpdate
+from ..services.response_cache import get_response_cache
 
 
 def create_document_definition(
@@ -20,6 +23,7 @@ def create_document_definition(
     db.add(doc)
     db.commit()
     db.refresh(doc)
+    get_response_cache().invalidate()
     return doc
 
 
@@ -31,15 +35,22 @@ def update_document_definition(
         setattr(doc, field, value)
     db.commit()
     db.refresh(doc)
+    get_response_cache().invalidate()
     return doc
 
 
 def delete_document_definition(db: Session, doc: DocumentDefinition) -> None:
     db.delete(doc)
     db.commit()
+    get_response_cache().invalidate()
 
 
 def list_document_definitions(db: Session, call_id: int) -> list[DocumentDefinition]:
     return (
         db.query(DocumentDefinition).filter(DocumentDefinition.call_id == call_id).all()
     )
+
+
+async def list_document_definitions_async(db: AsyncSession, call_id: int) -> list[DocumentDefinition]:
+    result = await db.scalars(select(DocumentDefinition).where(DocumentDefinition.call_id == call_id))
+    return list(result)
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models.email_outbox import EmailOutbox, EmailStatus
+
+outbox = EmailOutbox.__table__
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue_email(db: Session, to_email: str, subject: str, body: str, commit: bool = True) -> None:
+    """Queue one email; with ``commit=False`` it is sent only if the caller commits."""
+    enqueue_emails(db, [(to_email, subject, body)], commit=commit)
+
+
+def enqueue_emails(db: Session, messages: Iterable[tuple[str, str, str]], commit: bool = True) -> int:
+    """Queue ``(to_email, subject, body)`` tuples with one batched INSERT."""
+    rows = [{"to_email": to, "subject": subject, "body": body} for to, subject, body in messages]
+    if rows:
+        db.execute(insert(outbox), rows)
+        if commit:
+            db.commit()
+    return len(rows)
+
+
+async def enqueue_email_async(db: AsyncSession, to_email: str, subject: str, body: str, commit: bool = True) -> None:
+    """Queue one email; with ``commit=False`` it is sent only if the caller commits."""
+    await db.execute(insert(outbox).values(to_email=to_email, subject=subject, body=body))
+    if commit:
+        await db.commit()
+
+
+def claim_due_emails(db: Session, limit: int, lease_seconds: float) -> list[Row]:
+    """Claim up to ``limit`` due emails for sending and commit the claim.
+
+    Claimed rows get one more attempt and are hidden for ``lease_seconds``;
+    if the sender dies before recording the outcome they become due again.
+    ``SKIP LOCKED`` lets several senders claim disjoint batches on
+    PostgreSQL; on SQLite the single UPDATE is atomic on its own.
+    """
+    now = _utcnow()
+    due = (
+        select(outbox.c.id)
+        .where(outbox.c.status == EmailStatus.PENDING, outbox.c.next_attempt_at <= now)
+        .order_by(outbox.c.next_attempt_at, outbox.c.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    rows = db.execute(
+        update(outbox)
+        .where(outbox.c.id.in_(due.scalar_subquery()))
+        .values(attempts=outbox.c.attempts + 1, next_attempt_at=now + timedelta(seconds=lease_seconds))
+        .returning(outbox.c.id, outbox.c.to_email, outbox.c.subject, outbox.c.body, outbox.c.attempts)
+    ).all()
+    db.commit()
+    return sorted(rows, key=lambda row: row.id)
+
+
+def record_delivery(
+    db: Session,
+    sent_ids: list[int],
+    failures: dict[int, tuple[int, str]],
+    max_attempts: int,
+    backoff_seconds: float,
+    max_backoff_seconds: float = 3600,
+) -> None:
+    """Store the outcome of one batch in a single transaction.
+
+    ``failures`` maps an email id to its attempt count and error. The retry
+    delay doubles with every attempt; after ``max_attempts`` the email is
+    marked failed and left for an admin to look at.
+    """
+    now = _utcnow()
+    if sent_ids:
+        db.execute(
+            update(outbox)
+            .where(outbox.c.id.in_(sent_ids))
+            .values(status=EmailStatus.SENT, sent_at=now, last_error=None)
+        )
+    for email_id, (attempts, error) in failures.items():
+        delay = min(backoff_seconds * 2 ** (attempts - 1), max_backoff_seconds)
+        db.execute(
+            update(outbox)
+            .where(outbox.c.id == email_id)
+            .values(
+                status=EmailStatus.FAILED if attempts >= max_attempts else EmailStatus.PENDING,
+                next_attempt_at=now + timedelta(seconds=delay),
+                last_error=error[:500],
+            )
+        )
+    db.commit()
+
+
+def count_by_status(db: Session) -> dict[str, int]:
+    counts = dict(db.execute(select(outbox.c.status, func.count()).group_by(outbox.c.status)).all())
+    return {status.value: counts.get(status, 0) for status in EmailStatus}
@@ -1,40 +1,101 @@
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from app.models.application import Application, ApplicationStatus
+from app.models.application_reviewer import ApplicationReviewer
 from app.models.review import Review
 from app.schemas.review import ReviewCreate
+from app.services.response_cache import get_rankings_cache
+from app.utils.pagination import DEFAULT_PAGE_SIZE, Page, paginate, paginate_async
 
-# Create a new review
-def create_review(db: Session, review_in: ReviewCreate, reviewer_id: int):
-    review = Review(
+def _new_review(review_in: ReviewCreate, reviewer_id: int) -> Review:
+    return Review(
         application_id=review_in.application_id,
         reviewer_id=reviewer_id,
         score=review_in.score,
         comment=review_in.comment,
     )
+
+# Create a new review
+def create_review(db: Session, review_in: ReviewCreate, reviewer_id: int):
+    review = _new_review(review_in, reviewer_id)
     db.add(review)
     try:
         db.commit()
         db.refresh(review)
-        return review
     except IntegrityError:
         db.rollback()
         raise ValueError("Review already exists or invalid foreign key.")
+    get_rankings_cache().invalidate()
+    return review
 
 # List all reviews for an application
 def get_reviews_by_application(db: Session, application_id: int):
     return db.query(Review).filter(Review.application_id == application_id).all()
 
-# List all reviews written by a reviewer
-def get_reviews_by_reviewer(db: Session, reviewer_id: int):
-    return db.query(Review).filter(Review.reviewer_id == reviewer_id).all()
+def call_rankings_statement(call_id: int):
+    """Per-application review statistics of a call, ranked by mean score.
 
-# Check if reviewer already submitted review for this application
-def has_submitted_review(db: Session, application_id: int, reviewer_id: int) -> bool:
-    return db.query(Review).filter(
-        Review.application_id == application_id,
-        Review.reviewer_id == reviewer_id
-    ).first() is not None
+    One ``GROUP BY`` over the call's applications outer-joined to their
+    reviews gives count, mean, min, max and spread; the number of assigned
+    reviewers is a correlated count on the assignment index. ``rank`` is
+    computed over the whole call before any page is cut, and applications
+    without reviews rank last. Cancelled applications are left out.
+    """
+    mean = cast(func.avg(Review.score), Float)
+    assigned = (
+        select(func.count(ApplicationReviewer.id))
+        .where(ApplicationReviewer.application_id == Application.id)
+        .correlate(Application)
+        .scalar_subquery()
+    )
+    stats = (
+        select(
+            Application.id.label("application_id"),
+            Application.user_id,
+            func.count(Review.id).label("review_count"),
+            assigned.label("assigned_reviewers"),
+            mean.label("mean_score"),
+            func.min(Review.score).label("min_score"),
+            func.max(Review.score).label("max_score"),
+            (func.max(Review.score) - func.min(Review.score)).label("spread"),
+            func.rank().over(order_by=func.coalesce(mean, -1).desc()).label("rank"),
+        )
+        .outerjoin(Review, Review.application_id == Application.id)
+        .where(Application.call_id == call_id, Application.status != ApplicationStatus.CANCELLED)
+        .group_by(Application.id, Application.user_id)
+        .subquery()
+    )
+    return select(stats), stats
+
+
+def _rankings_page(page: Page, stats) -> Page[dict]:
+    keys = stats.c.keys()
+    return Page(items=[dict(zip(keys, row)) for row in page.items], next_cursor=page.next_cursor)
+
+
+def get_call_rankings(
+    db: Session, call_id: int, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Page[dict]:
+    stmt, stats = call_rankings_statement(call_id)
+    page = paginate(db, stmt, sort_column=stats.c.rank, id_column=stats.c.application_id, cursor=cursor, limit=limit)
+    return _rankings_page(page, stats)
+
+# List reviews written by a reviewer, one keyset page at a time
+def get_reviews_by_reviewer(
+    db: Session, reviewer_id: int, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Page[Review]:
+    return paginate(
+        db,
+        select(Review).where(Review.reviewer_id == reviewer_id),
+        sort_column=Review.submitted_at,
+        id_column=Review.id,
+        cursor=cursor,
+        limit=limit,
+    )
 
+# Check if reviewer already submitted review for this application
 def update_review(db: Session, review_id: int, score: int, comment: str | None = None):
     review = db.query(Review).filter(Review.id == review_id).first()
     if not review:
@@ -42,6 +103,7 @@ def update_review(db: Session, review_id: int, score: int, comment: str | None =
     review.score = score
     review.comment = comment
     db.commit()
+    get_rankings_cache().invalidate()
     db.refresh(review)
     return review
 
@@ -50,5 +112,47 @@ def delete_review(db: Session, review_id: int) -> bool:
     if review:
         db.delete(review)
         db.commit()
+        get_rankings_cache().invalidate()
         return True
     return False
+
+
+# Async equivalents for the reviewer-facing endpoints
+
+async def create_review_async(db: AsyncSession, review_in: ReviewCreate, reviewer_id: int):
+    review = _new_review(review_in, reviewer_id)
+    db.add(review)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("Review already exists or invalid foreign key.")
+    await get_rankings_cache().invalidate_async()
+    await db.refresh(review)
+    return review
+
+async def get_reviews_by_reviewer_async(
+    db: AsyncSession, reviewer_id: int, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Page[Review]:
+    return await paginate_async(
+        db,
+        select(Review).where(Review.reviewer_id == reviewer_id),
+        sort_column=Review.submitted_at,
+        id_column=Review.id,
+        cursor=cursor,
+        limit=limit,
+    )
+
+async def get_review_by_reviewer_async(db: AsyncSession, application_id: int, reviewer_id: int) -> Review | None:
+    return await db.scalar(
+        select(Review).where(Review.application_id == application_id, Review.reviewer_id == reviewer_id)
+    )
+
+async def get_call_rankings_async(
+    db: AsyncSession, call_id: int, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Page[dict]:
+    stmt, stats = call_rankings_statement(call_id)
+    page = await paginate_async(
+        db, stmt, sort_column=stats.c.rank, id_column=stats.c.application_id, cursor=cursor, limit=limit
+    )
+    return _rankings_page(page, stats)
@@ -0,0 +1,163 @@
+import secrets
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Select, and_, case, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.application import Application, ApplicationStatus
+from ..models.application_reviewer import ApplicationReviewer
+from ..models.attachment import Attachment
+from ..models.call import Call
+from ..models.review import Review
+from ..models.review_lease import ReviewLease
+from ..schemas.attachment import AttachmentOut
+from ..schemas.review import ReviewQueueItem
+from ..utils.pagination import DEFAULT_PAGE_SIZE, Page, paginate_async
+from .call import NO_DEADLINE
+
+CLAIM_ATTEMPTS = 5
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _deadline_key():
+    # Calls without an end date sort after every real deadline
+    return func.coalesce(Call.end_date, NO_DEADLINE)
+
+
+def pending_assignments(reviewer_id: int, now: datetime) -> Select:
+    """The reviewer's assignments without a review, as one anti-join.
+
+    ``NOT EXISTS`` on ``reviews(application_id, reviewer_id)`` is answered
+    from the unique index, and the reviewer's assignments come from
+    ``ix_application_reviewers_user_id``. Cancelled applications are left out.
+    """
+    reviewed = (
+        select(Review.id)
+        .where(Review.application_id == ApplicationReviewer.application_id, Review.reviewer_id == ApplicationReviewer.user_id)
+        .exists()
+    )
+    return (
+        select(
+            ApplicationReviewer.id.label("assignment_id"),
+            ApplicationReviewer.application_id,
+            Application.call_id,
+            Call.title.label("call_title"),
+            Call.end_date.label("deadline"),
+            case((ReviewLease.expires_at > now, ReviewLease.expires_at)).label("leased_until"),
+            ReviewLease.id.label("lease_id"),
+        )
+        .join(Application, Application.id == ApplicationReviewer.application_id)
+        .join(Call, Call.id == Application.call_id)
+        .outerjoin(ReviewLease, ReviewLease.assignment_id == ApplicationReviewer.id)
+        .where(ApplicationReviewer.user_id == reviewer_id, ~reviewed, Application.status != ApplicationStatus.CANCELLED)
+    )
+
+
+async def _queue_items(db: AsyncSession, rows: list[dict]) -> list[ReviewQueueItem]:
+    """Turn queue rows into items, loading attachment metadata in one more query."""
+    ids = [row["application_id"] for row in rows]
+    attachments: dict[int, list[AttachmentOut]] = {}
+    if ids:
+        for attachment in await db.scalars(
+            select(Attachment).where(Attachment.application_id.in_(ids)).order_by(Attachment.id)
+        ):
+            attachments.setdefault(attachment.application_id, []).append(AttachmentOut.model_validate(attachment))
+    return [
+        ReviewQueueItem(**row, attachments=attachments.get(row["application_id"], []))
+        for row in rows
+    ]
+
+
+async def get_review_queue_async(
+    db: AsyncSession, reviewer_id: int, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Page[ReviewQueueItem]:
+    """One keyset page of the reviewer's pending work, earliest deadline first."""
+    stmt = pending_assignments(reviewer_id, _utcnow())
+    page = await paginate_async(
+        db, stmt, sort_column=_deadline_key(), id_column=ApplicationReviewer.id, cursor=cursor, limit=limit
+    )
+    keys = stmt.selected_columns.keys()
+    rows = [dict(zip(keys, item)) for item in page.items]
+    return Page(items=await _queue_items(db, rows), next_cursor=page.next_cursor)
+
+
+async def _renew_lease(db: AsyncSession, reviewer_id: int, token: str, expires_at: datetime):
+    """Extend the lease held under ``token``; ``None`` if it is gone or was taken over."""
+    row = (await db.execute(pending_assignments(reviewer_id, _utcnow()).where(ReviewLease.token == token))).first()
+    if row is None:
+        return None
+    # Another session may have taken the expired lease over since the SELECT
+    result = await db.execute(
+        update(ReviewLease)
+        .where(ReviewLease.id == row.lease_id, ReviewLease.token == token)
+        .values(expires_at=expires_at)
+    )
+    if result.rowcount != 1:
+        await db.rollback()
+        return None
+    await db.commit()
+    return row
+
+
+async def _take_next(db: AsyncSession, reviewer_id: int, token: str, expires_at: datetime):
+    """Lease the first pending assignment nobody holds; ``None`` when there is none."""
+    for _ in range(CLAIM_ATTEMPTS):
+        now = _utcnow()
+        row = (
+            await db.execute(
+                pending_assignments(reviewer_id, now)
+                .where(or_(ReviewLease.id.is_(None), ReviewLease.expires_at <= now))
+                .order_by(_deadline_key(), ApplicationReviewer.id)
+                .limit(1)
+            )
+        ).first()
+        if row is None:
+            return None
+        # Both writes only succeed if no other session took the item since the SELECT
+        try:
+            if row.lease_id is None:
+                await db.execute(
+                    insert(ReviewLease).values(assignment_id=row.assignment_id, token=token, expires_at=expires_at)
+                )
+            else:
+                result = await db.execute(
+                    update(ReviewLease)
+                    .where(and_(ReviewLease.id == row.lease_id, ReviewLease.expires_at <= now))
+                    .values(token=token, expires_at=expires_at)
+                )
+                if result.rowcount != 1:
+                    await db.rollback()
+                    continue
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            continue
+        return row
+    return None
+
+
+async def claim_next_review_async(
+    db: AsyncSession, reviewer_id: int, lease_seconds: float, lease_token: str | None = None
+) -> tuple[ReviewQueueItem, str, datetime] | None:
+    """Lease the reviewer's next pending item for ``lease_seconds``.
+
+    A session that passes the token of a lease it still holds gets the same
+    item back with the lease renewed, so reloading the page does not move
+    on. Otherwise the earliest-deadline item that no other session holds is
+    leased under a new token. Returns ``None`` when nothing is left.
+    """
+    expires_at = _utcnow() + timedelta(seconds=lease_seconds)
+    row = await _renew_lease(db, reviewer_id, lease_token, expires_at) if lease_token else None
+    token = lease_token
+    if row is None:
+        token = secrets.token_urlsafe(24)
+        row = await _take_next(db, reviewer_id, token, expires_at)
+        if row is None:
+            return None
+    (item,) = await _queue_items(db, [row._asdict()])
+    item.leased_until = expires_at
+    return item, token, expires_at
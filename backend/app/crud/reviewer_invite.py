@@ -1,9 +1,44 @@
+import secrets
+import string
 from datetime import datetime
+from typing import Callable, Iterable
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from pydantic import validate_email
+from pydantic_core import PydanticCustomError
 
 from ..models.reviewer_invite import ReviewerInvite
 from ..models.call_reviewer import CallReviewer
+from ..models.user import User
+from ..schemas.reviewer_invite import BulkInviteResult, BulkInviteStatus
+from .email_outbox import enqueue_emails
+
+TOKEN_ALPHABET = string.ascii_uppercase + string.digits
+TOKEN_LENGTH = 6
+
+
+def new_token() -> str:
+    return "".join(secrets.choice(TOKEN_ALPHABET) for _ in range(TOKEN_LENGTH))
+
+
+def generate_tokens(db: Session, count: int) -> list[str]:
+    """Return ``count`` tokens that are unique among themselves and in the table.
+
+    Candidates are checked against existing invites in one query per round;
+    with 36**6 possible codes a second round is rarely needed.
+    """
+    tokens: set[str] = set()
+    while len(tokens) < count:
+        candidates = set()
+        while len(candidates) < count - len(tokens):
+            token = new_token()
+            if token not in tokens:
+                candidates.add(token)
+        taken = set(db.scalars(select(ReviewerInvite.token).where(ReviewerInvite.token.in_(candidates))))
+        tokens |= candidates - taken
+    return list(tokens)
 
 
 def create_invite(
@@ -27,6 +62,96 @@ def create_invite(
     return invite
 
 
+def _normalize_email(raw: str) -> str | None:
+    try:
+        return validate_email(raw.strip())[1]
+    except PydanticCustomError:
+        return None
+
+
+def create_invites_bulk(
+    db: Session,
+    *,
+    call_id: int,
+    emails: Iterable[str],
+    expires_at: datetime,
+    render_email: Callable[[str], tuple[str, str]],
+) -> list[BulkInviteResult]:
+    """Invite many reviewers to a call in one transaction.
+
+    Emails that are invalid, repeated, already invited (unused and not
+    expired) or already reviewers of the call are reported and skipped.
+    The rest get collision-free tokens and are written with one multi-row
+    INSERT, together with their queued invitation emails, so the whole
+    request costs a constant number of round trips. ``render_email`` turns
+    a token into the email's subject and body. Results follow the order of
+    ``emails``.
+    """
+    results: list[BulkInviteResult] = []
+    pending: dict[str, BulkInviteResult] = {}
+    seen: set[str] = set()
+    for raw in emails:
+        email = _normalize_email(raw)
+        if email is None:
+            results.append(BulkInviteResult(email=raw, status=BulkInviteStatus.invalid, detail="Not a valid email"))
+        elif email.lower() in seen:
+            results.append(BulkInviteResult(email=email, status=BulkInviteStatus.duplicate))
+        else:
+            seen.add(email.lower())
+            pending[email] = BulkInviteResult(email=email, status=BulkInviteStatus.invited)
+            results.append(pending[email])
+    if not pending:
+        return results
+
+    # Compared case-insensitively, like the duplicate check above
+    keys = [email.lower() for email in pending]
+    invited = set(db.scalars(
+        select(func.lower(ReviewerInvite.email)).where(
+            ReviewerInvite.call_id == call_id,
+            func.lower(ReviewerInvite.email).in_(keys),
+            ReviewerInvite.used == False,
+            ReviewerInvite.expires_at > datetime.utcnow(),
+        )
+    ))
+    reviewers = set(db.scalars(
+        select(func.lower(User.email))
+        .join(CallReviewer, CallReviewer.reviewer_id == User.id)
+        .where(CallReviewer.call_id == call_id, func.lower(User.email).in_(keys))
+    ))
+    for email, result in pending.items():
+        if email.lower() in reviewers:
+            result.status = BulkInviteStatus.already_reviewer
+        elif email.lower() in invited:
+            result.status = BulkInviteStatus.already_invited
+    new = [email for email, result in pending.items() if result.status is BulkInviteStatus.invited]
+    if not new:
+        return results
+
+    # A concurrent request can take a token between the check and the insert
+    for attempt in range(3):
+        tokens = generate_tokens(db, len(new))
+        rows = [
+            {"call_id": call_id, "email": email, "token": token, "expires_at": expires_at, "used": False}
+            for email, token in zip(new, tokens)
+        ]
+        try:
+            # Executed as batched multi-row VALUES ("insertmanyvalues"), compiled once
+            inserted = db.execute(
+                insert(ReviewerInvite).returning(ReviewerInvite.id, ReviewerInvite.email),
+                rows,
+            ).all()
+            enqueue_emails(db, [(email, *render_email(token)) for email, token in zip(new, tokens)], commit=False)
+            db.commit()
+            break
+        except IntegrityError:
+            db.rollback()
+            if attempt == 2:
+                raise
+    for invite_id, email in inserted:
+        pending[email].invite_id = invite_id
+    return results
+
+
 def get_invite_by_token(db: Session, token: str) -> ReviewerInvite | None:
     return db.query(ReviewerInvite).filter(ReviewerInvite.token == token).first()
 
@@ -37,9 +162,10 @@ def accept_invite(db: Session, invite: ReviewerInvite, reviewer_id: int) -> None
     if invite.expires_at < datetime.utcnow():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invite token expired")
 
-    link = CallReviewer(call_id=invite.call_id, reviewer_id=reviewer_id)
     invite.used = True
-    db.add(link)
+    # Accepting a second invite for the same call must not duplicate the link
+    linked = db.query(CallReviewer).filter_by(call_id=invite.call_id, reviewer_id=reviewer_id).first()
+    if linked is None:
+        db.add(CallReviewer(call_id=invite.call_id, reviewer_id=reviewer_id))
     db.add(invite)
     db.commit()
-
@@ -1,28 +1,39 @@
 import secrets
 from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 
 from ..models.user import User, UserRole
 from ..schemas.user import UserCreate, UserUpdate
 from ..config import settings
+from ..services.principal_cache import principal_cache
+from ..utils.pagination import DEFAULT_PAGE_SIZE, Page, paginate, paginate_async
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
-def create_user(db: Session, user_in: UserCreate) -> User:
-    if get_user_by_email(db, user_in.email):
-        raise HTTPException(status_code=400, detail="Email already registered")
+def get_users(
+    db: Session,
+    role: UserRole | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[User]:
+    """Return one keyset page of users, optionally filtered by role."""
+    stmt = select(User)
+    if role is not None:
+        stmt = stmt.where(User.role == role)
+    return paginate(db, stmt, sort_column=User.created_at, id_column=User.id, cursor=cursor, limit=limit)
 
-    hashed_password = pwd_context.hash(user_in.password)
+def _new_user(user_in: UserCreate, hashed_password: str) -> User:
     verification_token = secrets.token_urlsafe(32)
-
     is_verified = settings.environment == "development"
-
-    user = User(
+    return User(
         email=user_in.email,
         hashed_password=hashed_password,
         role=UserRole(user_in.role),
@@ -32,6 +43,12 @@ def create_user(db: Session, user_in: UserCreate) -> User:
         verification_token=None if is_verified else verification_token,
         is_verified=is_verified
     )
+
+def create_user(db: Session, user_in: UserCreate) -> User:
+    if get_user_by_email(db, user_in.email):
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    user = _new_user(user_in, pwd_context.hash(user_in.password))
     db.add(user)
     db.commit()
     db.refresh(user)
@@ -43,6 +60,7 @@ def update_user(db: Session, user: User, update_data: UserUpdate) -> User:
     user.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate(user.id)
     return user
 
 def verify_user(db: Session, token: str) -> User:
@@ -54,14 +72,16 @@ def verify_user(db: Session, token: str) -> User:
     user.verification_token = None
     user.updated_at = datetime.utcnow()
     db.commit()
+    principal_cache.invalidate(user.id)
     return user
 
-def create_password_reset(db: Session, user: User) -> str:
+def create_password_reset(db: Session, user: User, commit: bool = True) -> str:
     token = secrets.token_urlsafe(32)
     user.password_reset_token = token
     user.password_reset_expires = datetime.utcnow() + timedelta(hours=1)
     user.updated_at = datetime.utcnow()
-    db.commit()
+    if commit:
+        db.commit()
     return token
 
 def reset_password(db: Session, token: str, new_password: str) -> User:
@@ -81,9 +101,10 @@ def reset_password(db: Session, token: str, new_password: str) -> User:
     user.password_reset_expires = None
     user.updated_at = datetime.utcnow()
     db.commit()
+    principal_cache.invalidate(user.id)
     return user
 
-def track_login_attempt(db: Session, user: User, success: bool):
+def _apply_login_attempt(user: User, success: bool):
     if success:
         user.login_attempts = 0
         user.last_login = datetime.utcnow()
@@ -94,9 +115,60 @@ def track_login_attempt(db: Session, user: User, success: bool):
             user.locked_until = datetime.utcnow() + timedelta(minutes=15)
     
     user.updated_at = datetime.utcnow()
+
+def track_login_attempt(db: Session, user: User, success: bool):
+    _apply_login_attempt(user, success)
     db.commit()
+    principal_cache.invalidate(user.id)
 
 def is_account_locked(user: User) -> bool:
     if user.locked_until and user.locked_until > datetime.utcnow():
         return True
     return False
+
+
+# Async equivalents used by routes running on the event loop. Password
+# hashing is CPU bound, so it runs in the thread pool instead.
+
+async def get_user_by_email_async(db: AsyncSession, email: str) -> User | None:
+    return await db.scalar(select(User).where(User.email == email))
+
+async def get_users_async(
+    db: AsyncSession,
+    role: UserRole | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[User]:
+    stmt = select(User)
+    if role is not None:
+        stmt = stmt.where(User.role == role)
+    return await paginate_async(db, stmt, sort_column=User.created_at, id_column=User.id, cursor=cursor, limit=limit)
+
+async def create_user_async(db: AsyncSession, user_in: UserCreate, commit: bool = True) -> User:
+    """Create the user; with ``commit=False`` the row is only flushed."""
+    if await get_user_by_email_async(db, user_in.email):
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    hashed_password = await run_in_threadpool(pwd_context.hash, user_in.password)
+    user = _new_user(user_in, hashed_password)
+    db.add(user)
+    if not commit:
+        await db.flush()
+        return user
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+async def update_user_async(db: AsyncSession, user: User, update_data: UserUpdate) -> User:
+    for field, value in update_data.model_dump(exclude_unset=True).items():
+        setattr(user, field, value)
+    user.updated_at = datetime.utcnow()
+    await db.commit()
+    await db.refresh(user)
+    principal_cache.invalidate(user.id)
+    return user
+
+async def track_login_attempt_async(db: AsyncSession, user: User, success: bool):
+    _apply_login_attempt(user, success)
+    await db.commit()
+    principal_cache.invalidate(user.id)
@@ -1,13 +1,167 @@
+import bisect
+import threading
+import time
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from .config import settings
 
+# Async drivers used for each sync dialect in DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def async_database_url(url: str) -> str:
+    """Return ``url`` rewritten to use the async driver of its dialect."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()}")
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+class PoolMetrics:
+    """Thread-safe counters for connection checkouts of one pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bucket_counts = [0] * (len(WAIT_BUCKETS) + 1)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.bucket_counts[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self.bucket_counts)
+            observed = sum(counts)
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+        # Cumulative buckets, Prometheus style
+        buckets, running = {}, 0
+        for bound, count in zip([*map(str, WAIT_BUCKETS), "+Inf"], counts):
+            running += count
+            buckets[bound] = running
+        data["wait_seconds_avg"] = round(data["wait_seconds_total"] / observed, 6) if observed else 0.0
+        data["wait_histogram"] = buckets
+        return data
+
+
+class _InstrumentedPoolMixin:
+    """Time how long each checkout waits for a pooled connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.observe(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep the counters
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_options(url: str, poolclass: type) -> dict:
+    """Engine keyword arguments for the configured connection pool."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite needs its own single-connection pool
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _attach_metrics(engine: Engine | AsyncEngine):
+    pool = engine.pool
+    if isinstance(pool, _InstrumentedPoolMixin):
+        pool.metrics = PoolMetrics()
+    return engine
+
+
+def pool_status(engine: Engine | AsyncEngine) -> dict:
+    """Live statistics of ``engine``'s connection pool."""
+    pool = engine.pool
+    data = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        data.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, _InstrumentedPoolMixin):
+        data.update(pool.metrics.snapshot())
+    return data
+
+
 # Create a SQLAlchemy engine using the database URL from settings
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+engine = _attach_metrics(
+    create_engine(settings.database_url, **_pool_options(settings.database_url, InstrumentedQueuePool))
+)
 
 # Create a session local class for database sessions
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# Async engine and sessions for routes that run on the event loop.
+# Objects stay usable after commit so responses can be serialized without
+# lazy loads (which are not allowed under asyncio).
+async_engine = _attach_metrics(
+    create_async_engine(
+        async_database_url(settings.database_url),
+        **_pool_options(settings.database_url, InstrumentedAsyncQueuePool),
+    )
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Base class for all ORM models (used for table mapping)
 class Base(DeclarativeBase):
     pass
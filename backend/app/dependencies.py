@@ -1,12 +1,13 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 
 from .models.user import User, UserRole
-from .database import SessionLocal
+from .database import SessionLocal, AsyncSessionLocal
 from .config import settings
+from .services.principal_cache import Principal, principal_cache
 
 # Corrected tokenUrl based on actual login endpoint
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -19,11 +20,25 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Provide an async database session to ``async def`` path operations."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    """Return the authenticated user based on the JWT token."""
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """Return the authenticated principal for the JWT token.
+
+    Principals are served from ``principal_cache`` when possible, so most
+    requests authenticate without decoding the token again or querying
+    the database.
+    """
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
     try:
         payload = jwt.decode(
             token,
@@ -37,15 +52,17 @@ async def get_current_user(
             detail="Invalid or expired token",
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.put(token, principal, payload.get("exp"))
+    return principal
 
-async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_admin(current_user: Principal = Depends(get_current_user)) -> Principal:
     """Ensure the current user has admin privileges."""
     if current_user.role is not UserRole.ADMIN:
         raise HTTPException(
@@ -55,8 +72,8 @@ async def get_current_admin(current_user: User = Depends(get_current_user)) -> U
     return current_user
 
 async def get_current_admin_or_reviewer(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """Allow access to admins and reviewers."""
     if current_user.role not in (UserRole.ADMIN, UserRole.REVIEWER):
         raise HTTPException(
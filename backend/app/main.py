@@ -1,12 +1,15 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 import logging
 
 from .config import settings
-from .database import Base, engine
-from .middleware.security import SecurityMiddleware, RateLimiter
+from .database import Base, engine, async_engine
+from .middleware.security import SecurityMiddleware, RateLimiter, route_limits_from_settings
+from .middleware.compression import SelectiveGZipMiddleware
+from .middleware.upload_limit import RequestSizeLimitMiddleware
+from .services.pdf_export import get_pdf_export_service
+from .services.email_sender import get_outbox_sender
 
 # Yeni router importları
 from .routes import (
@@ -17,6 +20,7 @@ from .routes import (
     auth_router,
     review_router,
     reviewer_invite_router,
+    metrics_router,
 )
 
 # Configure root logger
@@ -41,21 +45,42 @@ async def startup_event():
     try:
         if settings.create_tables:
             Base.metadata.create_all(bind=engine)
-        app.state.rate_limiter = RateLimiter(settings.requests_per_minute)
+        app.state.rate_limiter = RateLimiter(settings.requests_per_minute, route_limits_from_settings())
+        if settings.email_sender_enabled:
+            get_outbox_sender().start()
         logger.info("Startup complete — DB tables ready and rate limiter initialized.")
     except Exception as e:
         logger.error(f"Startup error: {e}", exc_info=True)
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Close pooled asyncpg/aiosqlite connections on the loop that opened them
+    if get_outbox_sender.cache_info().currsize:
+        await get_outbox_sender().stop()
+    await async_engine.dispose()
+    if get_pdf_export_service.cache_info().currsize:
+        get_pdf_export_service().shutdown()
+
 # Middleware
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    minimum_size=1000,
+    exclude_paths=[
+        r"^/applications/attachments/\d+/(review-)?download$",
+        r"^/calls/\d+/exports/\w+/download$",
+        r"^/calls/\d+/export-applications\.pdf$",
+        r"^/(calls|applications)/\d+/attachments\.zip$",
+    ],
+)
+app.add_middleware(RequestSizeLimitMiddleware, max_size=settings.max_request_size)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[o.strip() for o in settings.allowed_origins.split(',')],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Content-Disposition"],
+    expose_headers=["Content-Disposition", "Link", "X-Next-Cursor", "X-Total-Count", "ETag", "Last-Modified"],
     max_age=3600,
 )
 app.add_middleware(SecurityMiddleware)
@@ -65,7 +90,7 @@ app.add_middleware(SecurityMiddleware)
 async def http_exception_handler(request: Request, exc: HTTPException):
     allowed = [o.strip() for o in settings.allowed_origins.split(',')]
     origin = request.headers.get("origin")
-    headers = {}
+    headers = dict(exc.headers or {})
     if "*" in allowed or (origin and origin in allowed):
         headers["Access-Control-Allow-Origin"] = origin or "*"
         headers["Access-Control-Allow-Credentials"] = "true"
@@ -95,3 +120,4 @@ app.include_router(application_router)
 app.include_router(document_router)
 app.include_router(review_router)
 app.include_router(reviewer_invite_router)
+app.include_router(metrics_router)
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .security import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Sliding window counter, same algorithm as RateLimiter but shared by every
+# worker. One hash per (route class, client) holds the window start and the
+# previous/current counts; Redis' own clock keeps workers consistent.
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local current_start = now - (now % window)
+
+local state = redis.call('HMGET', KEYS[1], 'w', 'p', 'c')
+local start = tonumber(state[1])
+local prev = tonumber(state[2]) or 0
+local curr = tonumber(state[3]) or 0
+if not start or current_start - start > window then
+    prev, curr = 0, 0
+elseif current_start - start == window then
+    prev, curr = curr, 0
+end
+
+local weighted = math.floor(prev * (window - (now - current_start)) / window) + curr
+if weighted >= limit then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'w', current_start, 'p', prev, 'c', curr + 1)
+redis.call('PEXPIRE', KEYS[1], window * 2)
+return 1
+"""
+
+
+class RedisRateLimiter:
+    """Rate limiter whose counters live in Redis and are shared by all workers.
+
+    Checks issued during the same event-loop iteration are sent together in
+    one pipeline, so a burst of requests costs one round trip per worker
+    rather than one per request. When Redis cannot be reached the local
+    ``fallback`` limiter answers instead, and Redis is retried after
+    ``retry_after`` seconds.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        fallback: RateLimiter,
+        window_seconds: int = 60,
+        prefix: str = "rl",
+        retry_after: float = 5.0,
+    ):
+        self.redis = redis
+        self.fallback = fallback
+        self.limits = fallback.limits
+        self.window_ms = window_seconds * 1000
+        self.prefix = prefix
+        self.retry_after = retry_after
+        self._script = redis.register_script(SLIDING_WINDOW_LUA)
+        self._pending: list[tuple[str, int, asyncio.Future]] = []
+        # The loop only keeps weak references to tasks
+        self._flushes: set[asyncio.Task] = set()
+        self._down_until = 0.0
+
+    async def check(self, client_ip: str, route_class: str = "default") -> bool:
+        limit = self.limits.get(route_class, self.fallback.requests_per_minute)
+        if limit <= 0:
+            return True
+        if time.monotonic() < self._down_until:
+            return self.fallback.is_allowed(client_ip, route_class)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((f"{self.prefix}:{route_class}:{client_ip}", limit, future))
+        if len(self._pending) == 1:
+            asyncio.get_running_loop().call_soon(self._schedule_flush)
+        try:
+            return await future
+        except RedisError as exc:
+            self._mark_down(exc)
+            return self.fallback.is_allowed(client_ip, route_class)
+
+    def _schedule_flush(self) -> None:
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task) -> None:
+        self._flushes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Rate limiter flush failed", exc_info=task.exception())
+
+    async def aclose(self) -> None:
+        """Wait for the flushes still in flight; called on shutdown."""
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def _flush(self, batch) -> None:
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, limit, _ in batch:
+                    await self._script(keys=[key], args=[limit, self.window_ms], client=pipe)
+                results = await pipe.execute()
+        except (RedisError, OSError) as exc:
+            error = exc if isinstance(exc, RedisError) else RedisError(str(exc))
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, _, future), allowed in zip(batch, results):
+            if not future.done():
+                future.set_result(bool(int(allowed)))
+
+    def _mark_down(self, exc: Exception) -> None:
+        if time.monotonic() >= self._down_until:
+            logger.warning("Redis rate limiter unavailable, using local limits: %s", exc)
+        self._down_until = time.monotonic() + self.retry_after
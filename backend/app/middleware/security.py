@@ -1,79 +1,215 @@
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Dict, List
-from datetime import datetime, timedelta
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
 import logging
+import re
+import time
 
 from ..config import settings  # Load rate limit and allowed hosts from settings
 
 logger = logging.getLogger(__name__)
 
-class RateLimiter:
-    def __init__(self, requests_per_minute: int):
-        self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, List[datetime]] = {}
+# Route classes with their own per-minute budget. The first matching rule
+# wins; everything else falls into "default".
+ROUTE_CLASSES = (
+    ("auth", "POST", re.compile(r"^/auth/(login|register|password-reset)")),
+    ("upload", "POST", re.compile(r"^/applications/[^/]+/(attachments|upload)$")),
+    ("export", "GET", re.compile(r"^/calls/\d+/export|^/(calls|applications)/\d+/attachments\.zip$")),
+)
 
-    def is_allowed(self, client_ip: str) -> bool:
-        now = datetime.now()
-        minute_ago = now - timedelta(minutes=1)
 
-        if client_ip not in self.requests:
-            self.requests[client_ip] = []
+def classify_route(method: str, path: str) -> str:
+    """Return the rate-limit class of a request."""
+    for name, rule_method, pattern in ROUTE_CLASSES:
+        if method == rule_method and pattern.match(path):
+            return name
+    return "default"
 
-        self.requests[client_ip] = [
-            ts for ts in self.requests[client_ip] if ts > minute_ago
-        ]
 
-        if len(self.requests[client_ip]) >= self.requests_per_minute:
-            return False
-
-        self.requests[client_ip].append(now)
-        return True
+def route_limits_from_settings() -> Dict[str, int]:
+    return {
+        "default": settings.requests_per_minute,
+        "auth": settings.auth_requests_per_minute,
+        "upload": settings.upload_requests_per_minute,
+        "export": settings.export_requests_per_minute,
+    }
 
-    async def cleanup(self):
-        """Remove old entries older than one minute to free memory."""
-        now = datetime.now()
-        minute_ago = now - timedelta(minutes=1)
-        for ip in list(self.requests.keys()):
-            self.requests[ip] = [ts for ts in self.requests[ip] if ts > minute_ago]
-            if not self.requests[ip]:
-                del self.requests[ip]
 
-class SecurityMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
-        self.rate_limiter = RateLimiter(settings.requests_per_minute)
-        self.allowed_hosts = settings.allowed_hosts
+class RateLimiter:
+    """Sliding-window-counter limiter with bounded memory.
+
+    Each (client, route class) pair keeps three integers: the start of the
+    current window and the request counts of the current and previous
+    windows. The previous count is weighted by how much of it still overlaps
+    the sliding window, which approximates a true sliding log in O(1) time
+    and space. Clients are kept in LRU order; at most ``max_clients`` are
+    tracked and a few idle ones are expired on every call instead of
+    sweeping the whole table. A limit of 0 disables limiting for a class.
+    """
+
+    EXPIRE_PER_CALL = 2
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        route_limits: Dict[str, int] | None = None,
+        window_seconds: int = 60,
+        max_clients: int = 100_000,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.limits = {"default": requests_per_minute, **(route_limits or {})}
+        self.window = window_seconds * 1_000_000_000
+        self.max_clients = max_clients
+        self._clock = clock
+        # (client, route class) -> [window start ns, previous count, current count]
+        self._clients: OrderedDict[Tuple[str, str], List[int]] = OrderedDict()
+
+    def is_allowed(self, client_ip: str, route_class: str = "default") -> bool:
+        limit = self.limits.get(route_class, self.requests_per_minute)
+        if limit <= 0:
+            return True
+
+        now = self._clock()
+        self._expire(now)
+        key = (client_ip, route_class)
+        state = self._clients.get(key)
+        if state is None:
+            state = [now - now % self.window, 0, 0]
+            self._clients[key] = state
+            if len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(key)
+            self._roll(state, now)
+
+        elapsed = now - state[0]
+        weighted = state[1] * (self.window - elapsed) // self.window + state[2]
+        if weighted >= limit:
+            return False
+        state[2] += 1
+        return True
 
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host if request.client else "unknown"
+    async def check(self, client_ip: str, route_class: str = "default") -> bool:
+        """Async entry point shared with :class:`RedisRateLimiter`."""
+        return self.is_allowed(client_ip, route_class)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _roll(self, state: List[int], now: int) -> None:
+        windows = (now - state[0]) // self.window
+        if windows == 1:
+            state[0] += self.window
+            state[1], state[2] = state[2], 0
+        elif windows > 1:
+            state[0] = now - now % self.window
+            state[1] = state[2] = 0
+
+    def _expire(self, now: int) -> None:
+        # Idle clients sit at the front of the LRU order. After two windows
+        # without requests their state no longer affects any decision.
+        for _ in range(self.EXPIRE_PER_CALL):
+            if not self._clients:
+                return
+            key, state = next(iter(self._clients.items()))
+            if now - state[0] < 2 * self.window:
+                return
+            del self._clients[key]
+
+def create_rate_limiter():
+    """Build the limiter for this worker.
+
+    With ``REDIS_URL`` set, limits are enforced in Redis across all workers
+    and the in-process limiter is only used while Redis is unreachable.
+    """
+    local = RateLimiter(
+        settings.requests_per_minute,
+        route_limits_from_settings(),
+        max_clients=settings.rate_limit_max_clients,
+    )
+    if not settings.redis_url:
+        return local
+
+    from redis.asyncio import Redis
+    from .redis_limiter import RedisRateLimiter
+
+    client = Redis.from_url(
+        settings.redis_url,
+        socket_timeout=settings.rate_limit_redis_timeout,
+        socket_connect_timeout=settings.rate_limit_redis_timeout,
+    )
+    return RedisRateLimiter(client, local)
+
+
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+}
+
+
+class SecurityMiddleware:
+    """Host validation, rate limiting and security headers as plain ASGI.
+
+    Headers are added to the ``http.response.start`` message on its way out,
+    so response bodies stream through untouched and no extra task or memory
+    stream is created per request.
+    """
+
+    def __init__(self, app: ASGIApp, rate_limiter=None, allowed_hosts: List[str] | None = None):
+        self.app = app
+        self.rate_limiter = rate_limiter if rate_limiter is not None else create_rate_limiter()
+        self.allowed_hosts = allowed_hosts if allowed_hosts is not None else settings.allowed_hosts
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self.app(scope, self._closing_receive(receive), send)
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        client_ip = scope["client"][0] if scope.get("client") else "unknown"
 
         # Handle forwarded host headers (e.g. behind NGINX/Cloudflare)
-        host = request.headers.get("host", "").split(":")[0]
-        forwarded = request.headers.get("x-forwarded-host")
-        real_host = forwarded.split(",")[0] if forwarded else host
+        host = headers.get("host", "").split(":")[0]
+        forwarded = headers.get("x-forwarded-host")
+        real_host = forwarded.split(",")[0].strip() if forwarded else host
 
         if real_host not in self.allowed_hosts and "*" not in self.allowed_hosts:
-            raise HTTPException(status_code=400, detail="Invalid host header")
-
-        # Path kontrolü: Dosya yükleme endpoint'ini rate-limit'ten muaf tut
-        path = request.url.path
-        if request.method == "POST" and path.startswith("/applications/") and path.endswith("/attachments"):
-            response = await call_next(request)
-            self.add_security_headers(response)
-            return response
-
-        # Rate limit kontrolü
-        await self.rate_limiter.cleanup()
-        if not self.rate_limiter.is_allowed(client_ip):
-            raise HTTPException(status_code=429, detail="Too many requests")
-
-        response = await call_next(request)
-        self.add_security_headers(response)
-        return response
-
-    def add_security_headers(self, response):
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+            await self._reject(scope, receive, send, 400, "Invalid host header")
+            return
+
+        # Rate limit kontrolü (route class başına ayrı limit)
+        route_class = classify_route(scope["method"], scope["path"])
+        if not await self.rate_limiter.check(client_ip, route_class):
+            await self._reject(scope, receive, send, 429, "Too many requests")
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for name, value in SECURITY_HEADERS.items():
+                    response_headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def _closing_receive(self, receive: Receive) -> Receive:
+        # Let the Redis limiter finish its in-flight checks before the app shuts down
+        async def wrapped() -> Message:
+            message = await receive()
+            if message["type"] == "lifespan.shutdown" and hasattr(self.rate_limiter, "aclose"):
+                await self.rate_limiter.aclose()
+            return message
+
+        return wrapped
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send, status_code: int, detail: str) -> None:
+        response = JSONResponse({"detail": detail}, status_code=status_code, headers=SECURITY_HEADERS)
+        await response(scope, receive, send)
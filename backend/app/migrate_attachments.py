@@ -0,0 +1,130 @@
+"""Move attachment bytes from ``attachments.data`` into the blob store.
+
+Run from the ``backend`` directory::
+
+    python -m app.migrate_attachments --batch-size 100
+    python -m app.migrate_attachments --drop-column   # once every row is moved
+
+The tool is idempotent: rows that already have a ``content_hash`` are skipped,
+so it can be interrupted and restarted at any point.
+"""
+import argparse
+import io
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.crud.attachment import publish_blob
+from app.database import engine
+from app.models.blob_lock import BlobLock
+from app.services.blob_store import BlobStore, get_blob_store
+
+NEW_COLUMNS = {
+    "content_hash": "VARCHAR(64)",
+    "storage_key": "VARCHAR",
+    "size": "BIGINT",
+    "content_type": "VARCHAR(100)",
+}
+
+
+def prepare_schema(engine: Engine) -> None:
+    """Add the metadata columns and make the legacy ``data`` column optional."""
+    columns = {c["name"] for c in inspect(engine).get_columns("attachments")}
+    with engine.begin() as conn:
+        for name, ddl_type in NEW_COLUMNS.items():
+            if name not in columns:
+                conn.execute(text(f"ALTER TABLE attachments ADD COLUMN {name} {ddl_type}"))
+                print(f"Added column attachments.{name}")
+        if "data" in columns and engine.dialect.name == "postgresql":
+            conn.execute(text("ALTER TABLE attachments ALTER COLUMN data DROP NOT NULL"))
+        if "content_hash" not in columns:
+            conn.execute(
+                text("CREATE INDEX IF NOT EXISTS ix_attachments_content_hash ON attachments (content_hash)")
+            )
+    BlobLock.__table__.create(engine, checkfirst=True)
+
+
+def migrate_batches(engine: Engine, store: BlobStore, batch_size: int = 100) -> int:
+    """Copy ``data`` into the blob store in keyset-ordered batches.
+
+    At most ``batch_size`` payloads are held in memory at once. Each row is
+    published and updated in its own transaction under the blob's lock, like
+    an upload, so the tool can run while the application serves requests
+    and progress survives interruptions.
+    """
+    moved = 0
+    last_id = 0
+    with Session(engine) as db:
+        while True:
+            rows = db.execute(
+                text(
+                    "SELECT id, data FROM attachments "
+                    "WHERE content_hash IS NULL AND id > :last_id "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": batch_size},
+            ).all()
+            db.commit()
+            if not rows:
+                break
+
+            for row_id, data in rows:
+                staged = store.stage(io.BytesIO(data or b""))
+                try:
+                    blob = publish_blob(db, staged, store)
+                    db.execute(
+                        text(
+                            "UPDATE attachments SET content_hash = :h, storage_key = :k, "
+                            "size = :s, data = NULL WHERE id = :id"
+                        ),
+                        {"id": row_id, "h": blob.content_hash, "k": blob.storage_key, "s": blob.size},
+                    )
+                    db.commit()
+                except BaseException:
+                    db.rollback()
+                    store.discard(staged)
+                    raise
+            last_id = rows[-1][0]
+            moved += len(rows)
+            print(f"Moved {moved} attachments (last id {last_id})")
+    return moved
+
+
+def finalize_schema(engine: Engine) -> None:
+    """Drop the legacy ``data`` column once every row has been moved."""
+    with engine.begin() as conn:
+        remaining = conn.execute(
+            text("SELECT COUNT(*) FROM attachments WHERE content_hash IS NULL")
+        ).scalar()
+        if remaining:
+            raise SystemExit(f"{remaining} attachments have not been migrated yet")
+        conn.execute(text("ALTER TABLE attachments DROP COLUMN data"))
+        if engine.dialect.name == "postgresql":
+            for name in ("content_hash", "storage_key", "size"):
+                conn.execute(text(f"ALTER TABLE attachments ALTER COLUMN {name} SET NOT NULL"))
+    print("Dropped attachments.data")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument(
+        "--drop-column",
+        action="store_true",
+        help="Drop attachments.data after verifying every row was migrated",
+    )
+    args = parser.parse_args()
+
+    columns = {c["name"] for c in inspect(engine).get_columns("attachments")}
+    prepare_schema(engine)
+    if "data" in columns:
+        migrate_batches(engine, get_blob_store(), args.batch_size)
+        if args.drop_column:
+            finalize_schema(engine)
+    else:
+        print("attachments.data is already gone; nothing to migrate")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Create the indexes and unique indexes declared on the models that an existing database lacks.
+
+Run from the ``backend`` directory::
+
+    python -m app.migrate_indexes --dry-run   # list what would be created
+    python -m app.migrate_indexes
+
+``create_all`` only creates missing tables, so databases created before an
+index was added to a model never get it. The tool compares every table with
+``Base.metadata`` and creates what is missing; it is idempotent and can be
+re-run at any time. Before a unique index is created the table is checked
+for duplicate rows, which are reported and the index skipped so the rest can
+still go in. On PostgreSQL indexes are built ``CONCURRENTLY`` so writes are
+not blocked while they build; an interrupted build leaves an invalid index
+behind, which the next run drops and builds again.
+"""
+import argparse
+
+from sqlalchemy import Index, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.database import Base, engine
+
+
+def _existing(engine: Engine, table: str) -> list[tuple[str, tuple[str, ...], bool]]:
+    inspector = inspect(engine)
+    found = [(ix["name"], tuple(ix["column_names"]), bool(ix["unique"])) for ix in inspector.get_indexes(table)]
+    found += [(uc["name"], tuple(uc["column_names"]), True) for uc in inspector.get_unique_constraints(table)]
+    return found
+
+
+def _invalid_indexes(conn: Connection) -> set[str]:
+    if conn.dialect.name != "postgresql":
+        return set()
+    return set(conn.scalars(text(
+        "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE NOT i.indisvalid"
+    )))
+
+
+def missing_indexes(engine: Engine, invalid: set[str] = frozenset()) -> list[Index]:
+    """Declared indexes that the database has neither by name nor by columns."""
+    tables = set(inspect(engine).get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = _existing(engine, table.name)
+        for index in sorted(table.indexes, key=lambda ix: ix.name):
+            columns = tuple(c.name for c in index.columns)
+            if any(
+                name not in invalid and (name == index.name or (cols == columns and (unique or not index.unique)))
+                for name, cols, unique in existing
+            ):
+                continue
+            missing.append(index)
+    return missing
+
+
+def find_duplicates(conn: Connection, index: Index, limit: int = 5) -> list[tuple]:
+    """Return up to ``limit`` value tuples that occur more than once for ``index``."""
+    quote = conn.dialect.identifier_preparer.quote
+    columns = ", ".join(quote(c.name) for c in index.columns)
+    not_null = " AND ".join(f"{quote(c.name)} IS NOT NULL" for c in index.columns)
+    return [
+        tuple(row)
+        for row in conn.execute(
+            text(
+                f"SELECT {columns}, COUNT(*) FROM {quote(index.table.name)} WHERE {not_null} "
+                f"GROUP BY {columns} HAVING COUNT(*) > 1 LIMIT :limit"
+            ),
+            {"limit": limit},
+        )
+    ]
+
+
+def create_index_sql(engine: Engine, index: Index) -> str:
+    quote = engine.dialect.identifier_preparer.quote
+    unique = "UNIQUE " if index.unique else ""
+    concurrently = "CONCURRENTLY " if engine.dialect.name == "postgresql" else ""
+    columns = ", ".join(quote(c.name) for c in index.columns)
+    return (
+        f"CREATE {unique}INDEX {concurrently}IF NOT EXISTS {quote(index.name)} "
+        f"ON {quote(index.table.name)} ({columns})"
+    )
+
+
+def migrate(engine: Engine, dry_run: bool = False) -> tuple[list[str], list[str]]:
+    """Create missing indexes; return the names created and the ones skipped."""
+    created, skipped = [], []
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        invalid = _invalid_indexes(conn)
+        for index in missing_indexes(engine, invalid):
+            if index.unique:
+                duplicates = find_duplicates(conn, index)
+                if duplicates:
+                    print(f"Skipping {index.name}: duplicate rows in {index.table.name}, e.g. {duplicates}")
+                    skipped.append(index.name)
+                    continue
+            sql = create_index_sql(engine, index)
+            if dry_run:
+                print(f"Would run: {sql}")
+            else:
+                if index.name in invalid:
+                    name = engine.dialect.identifier_preparer.quote(index.name)
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+                conn.execute(text(sql))
+                print(f"Created {index.name}")
+            created.append(index.name)
+    return created, skipped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="Only print the statements")
+    args = parser.parse_args()
+
+    created, skipped = migrate(engine, dry_run=args.dry_run)
+    if not created and not skipped:
+        print("Every declared index already exists")
+    if skipped:
+        raise SystemExit(f"{len(skipped)} unique indexes skipped; remove the duplicate rows and re-run")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,15 @@ from .user import User  # noqa: F401
 from .call import Call  # noqa: F401
 from .application import Application  # noqa: F401
 from .attachment import Attachment  # noqa: F401
+from .blob_lock import BlobLock  # noqa: F401
 from .document import DocumentDefinition  # noqa: F401
 from .application_reviewer import ApplicationReviewer  # noqa: F401
 from .review import Review
 from .reviewer_invite import ReviewerInvite  # noqa: F401
 from .call_reviewer import CallReviewer  # noqa: F401
 from .reviewer_invite_token import ReviewerInviteToken  # noqa: F401
+from .email_outbox import EmailOutbox  # noqa: F401
+from .review_lease import ReviewLease  # noqa: F401
 
 
 __all__ = [
@@ -21,11 +24,14 @@ __all__ = [
     "Call",
     "Application",
     "Attachment",
+    "BlobLock",
     "DocumentDefinition",
     "ApplicationReviewer",
     "Review",
     "ReviewerInvite",
     "CallReviewer",
     "ReviewerInviteToken",
+    "EmailOutbox",
+    "ReviewLease",
 
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, Boolean, DateTime, Enum
+from sqlalchemy import Column, Integer, Text, ForeignKey, Boolean, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
@@ -14,6 +14,13 @@ class ApplicationStatus(str, PyEnum):
 # Represents a project application submitted by a user for a specific call
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        # Keyset pagination of "my applications" and per-call lists
+        Index("ix_applications_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_applications_call_id_created_at_id", "call_id", "created_at", "id"),
+        # One application per user and call
+        Index("uq_applications_user_id_call_id", "user_id", "call_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
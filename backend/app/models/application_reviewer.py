@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class ApplicationReviewer(Base):
     __tablename__ = "application_reviewers"
+    __table_args__ = (
+        Index("uq_application_reviewers_application_id_user_id", "application_id", "user_id", unique=True),
+        # A reviewer's assignments
+        Index("ix_application_reviewers_user_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
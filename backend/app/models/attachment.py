@@ -1,18 +1,26 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, LargeBinary
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, BigInteger, Index
 from sqlalchemy.sql import func
 from ..database import Base
 
 
 class Attachment(Base):
     __tablename__ = "attachments"
+    __table_args__ = (
+        Index("ix_attachments_application_id", "application_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
     document_id = Column(Integer, ForeignKey("document_definitions.id"), nullable=True)
     file_name = Column(String, nullable=False)
-    data = Column(LargeBinary, nullable=False)
     is_confirmed = Column(Boolean, default=False)
 
+    # File bytes live in the blob store; the row only keeps metadata
+    content_hash = Column(String(64), nullable=False, index=True)  # SHA-256 hex digest
+    storage_key = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    content_type = Column(String(100), nullable=True)
+
     # Timestamp fields
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
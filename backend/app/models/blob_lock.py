@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+
+from ..database import Base
+
+
+# Per-content lock for the blob store. Uploads and deletions of the same
+# SHA-256 update this row first, so they run one at a time for that blob.
+# The row is removed together with the last copy of the blob.
+class BlobLock(Base):
+    __tablename__ = "blob_locks"
+
+    content_hash = Column(String(64), primary_key=True)
+    locked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
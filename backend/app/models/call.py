@@ -1,6 +1,7 @@
 from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Enum, CheckConstraint
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Enum, CheckConstraint, Index, and_, or_
+from sqlalchemy.ext.hybrid import hybrid_method, hybrid_property
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
@@ -23,6 +24,11 @@ class Call(Base):
             'end_date IS NULL OR start_date IS NULL OR end_date > start_date',
             name='valid_dates'
         ),
+        # Keyset pagination over (created_at, id)
+        Index('ix_calls_created_at_id', 'created_at', 'id'),
+        # Active/published listings, optionally per category, by deadline
+        Index('ix_calls_status_end_date', 'status', 'end_date', 'id'),
+        Index('ix_calls_category_status_end_date', 'category', 'status', 'end_date'),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -40,12 +46,34 @@ class Call(Base):
     # Relationship to document definitions (one-to-many)
     document_definitions = relationship("DocumentDefinition", backref="call", cascade="all, delete-orphan")
 
-    @property
-    def is_active(self) -> bool:
-        """Return whether the call is currently active based on dates and status."""
-        now = datetime.now(timezone.utc)
+    @hybrid_method
+    def active_at(self, when: datetime) -> bool:
+        """Whether the call is published and ``when`` lies within its dates."""
+        def utc(value):
+            # SQLite returns naive datetimes; they are stored in UTC
+            return value.replace(tzinfo=timezone.utc) if value and value.tzinfo is None else value
+
         return (
             self.status == CallStatus.PUBLISHED
-            and (self.start_date is None or self.start_date <= now)
-            and (self.end_date is None or now <= self.end_date)
+            and (self.start_date is None or utc(self.start_date) <= when)
+            and (self.end_date is None or when <= utc(self.end_date))
+        )
+
+    @active_at.inplace.expression
+    @classmethod
+    def _active_at_expression(cls, when: datetime):
+        return and_(
+            cls.status == CallStatus.PUBLISHED,
+            or_(cls.start_date.is_(None), cls.start_date <= when),
+            or_(cls.end_date.is_(None), cls.end_date >= when),
         )
+
+    @hybrid_property
+    def is_active(self) -> bool:
+        """Return whether the call is currently active based on dates and status."""
+        return self.active_at(datetime.now(timezone.utc))
+
+    @is_active.inplace.expression
+    @classmethod
+    def _is_active_expression(cls):
+        return cls.active_at(datetime.now(timezone.utc))
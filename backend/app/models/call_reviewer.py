@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from ..database import Base
 
 class CallReviewer(Base):
     __tablename__ = "call_reviewers"
+    __table_args__ = (
+        Index("uq_call_reviewers_call_id_reviewer_id", "call_id", "reviewer_id", unique=True),
+        Index("ix_call_reviewers_reviewer_id", "reviewer_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     call_id = Column(Integer, ForeignKey("calls.id"), nullable=False)
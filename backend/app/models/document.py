@@ -1,5 +1,5 @@
 from enum import Enum as PyEnum
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Index
 from ..database import Base
 
 class DocumentFormat(str, PyEnum):
@@ -9,6 +9,9 @@ class DocumentFormat(str, PyEnum):
 
 class DocumentDefinition(Base):
     __tablename__ = "document_definitions"
+    __table_args__ = (
+        Index("ix_document_definitions_call_id", "call_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     call_id = Column(Integer, ForeignKey("calls.id"), nullable=False)
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Index
+from sqlalchemy.sql import func
+from enum import Enum as PyEnum
+
+from ..database import Base
+
+
+class EmailStatus(str, PyEnum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"  # Gave up after the maximum number of attempts
+
+
+# An email waiting to be sent. Rows are written in the same session as the
+# change that triggers them and drained by the background sender.
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # The sender's claim query: due pending rows, oldest first
+        Index("ix_email_outbox_status_next_attempt_at_id", "status", "next_attempt_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)  # HTML
+    status = Column(Enum(EmailStatus), nullable=False, default=EmailStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    # Not before this time; a claimed row is pushed forward by the claim lease
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, ForeignKey, Text, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, Text, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_reviewer_id_submitted_at_id", "reviewer_id", "submitted_at", "id"),
+        # One review per reviewer and application
+        Index("uq_reviews_application_id_reviewer_id", "application_id", "reviewer_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
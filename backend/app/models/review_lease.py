@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+
+from ..database import Base
+
+
+# A reviewer session's short claim on one assignment of the review queue.
+# There is at most one row per assignment; an expired row is taken over by
+# the next claim instead of being deleted.
+class ReviewLease(Base):
+    __tablename__ = "review_leases"
+    __table_args__ = (
+        Index("uq_review_leases_assignment_id", "assignment_id", unique=True),
+        Index("uq_review_leases_token", "token", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    assignment_id = Column(Integer, ForeignKey("application_reviewers.id", ondelete="CASCADE"), nullable=False)
+    token = Column(String(64), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
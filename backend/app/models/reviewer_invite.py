@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -6,6 +6,10 @@ from ..database import Base
 
 class ReviewerInvite(Base):
     __tablename__ = "reviewer_invites"
+    __table_args__ = (
+        # Open invites of a call, checked before inviting an address again
+        Index("ix_reviewer_invites_call_id_email", "call_id", "email"),
+    )
 
     id = Column(Integer, primary_key=True)
     call_id = Column(Integer, ForeignKey("calls.id"), nullable=False)
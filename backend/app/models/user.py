@@ -1,6 +1,6 @@
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, Integer, String, Enum, Boolean, DateTime, func
+from sqlalchemy import Column, Integer, String, Enum, Boolean, DateTime, Index, func
 from datetime import datetime, timedelta
 from sqlalchemy.orm import relationship
 
@@ -14,6 +14,14 @@ class UserRole(PyEnum):
 
 class User(Base):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Keyset pagination of user lists, optionally filtered by role
+        Index('ix_users_created_at_id', 'created_at', 'id'),
+        Index('ix_users_role_created_at_id', 'role', 'created_at', 'id'),
+        # Token lookups; NULLs do not collide
+        Index('uq_users_verification_token', 'verification_token', unique=True),
+        Index('uq_users_password_reset_token', 'password_reset_token', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -4,6 +4,7 @@ from .documents import router as document_router
 from .users import router as user_router, auth_router, list_reviewers
 from .review import router as review_router
 from .reviewer_invites import router as reviewer_invite_router
+from .metrics import router as metrics_router
 
 __all__ = [
     "application_router",
@@ -14,4 +15,5 @@ __all__ = [
     "auth_router",
     "review_router",
     "reviewer_invite_router",
+    "metrics_router",
 ]
@@ -1,25 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Path, status, Response
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Path, status, Response, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 from pathlib import Path as Pathlib
 import os, uuid
 
-from app.dependencies import get_db
+from app.dependencies import get_db, get_async_db
 from ..dependencies import get_current_user, get_current_admin, get_current_admin_or_reviewer
 from ..models.application import Application, ApplicationStatus
+from ..models.call import Call
 from ..models.user import User, UserRole
 from ..models.document import DocumentDefinition, DocumentFormat
 from ..models.attachment import Attachment
-from ..schemas.application import ApplicationCreate, ApplicationOut, ApplicationDetail
+from ..schemas.application import (
+    ApplicationCreate,
+    ApplicationOut,
+    ApplicationDetail,
+    ReviewerAssignmentRequest,
+    ReviewerAssignmentOut,
+)
 from ..schemas.attachment import AttachmentOut
 from app.config import settings
+from ..services.blob_store import get_blob_store
+from ..services.blob_response import attachment_response
+from ..services.file_upload import UploadStream
+from ..services.reviewer_assignment import assign_call_reviewers
+from ..services.zip_stream import stream_zip
+from ..utils.conditional import Validators
+from ..utils.pagination import PageParams, set_page_headers
 from ..crud.application import (
-    create_application,
+    create_application_async,
     get_application_by_user_and_call,
+    get_application_by_user_and_call_async,
     get_application_for_user,
-    get_applications_by_call,
+    get_application_for_user_async,
+    paginate_applications_by_call,
     get_application_detail,
-    get_applications_by_user,
+    get_application_detail_version,
+    get_application_version_async,
+    get_applications_by_user_async,
+    set_application_status_async,
     delete_application_by_id,
     assign_reviewer,
     is_reviewer_assigned,
@@ -27,11 +48,14 @@ from ..crud.application import (
 )
 from ..crud.attachment import (
     create_attachment,
+    store_attachment,
     get_attachments_by_application,
     confirm_attachments,
     confirm_attachment,
     attachments_confirmed,
     delete_attachment,
+    get_archive_entries,
+    get_attachments_version,
 )
 
 router = APIRouter(prefix="/applications", tags=["applications"])
@@ -51,36 +75,50 @@ def _is_valid_extension(document: DocumentDefinition, ext: str) -> bool:
 
 # Submit a new application
 @router.post("/", response_model=ApplicationOut, status_code=status.HTTP_201_CREATED)
-def submit_application(
+async def submit_application(
     app_in: ApplicationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
     if not app_in.content.strip():
         raise HTTPException(status_code=400, detail="Application content is required")
     try:
-        return create_application(db, call_id=app_in.call_id, content=app_in.content, user_id=current_user.id)
+        return await create_application_async(db, call_id=app_in.call_id, content=app_in.content, user_id=current_user.id)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
 # List my applications
 @router.get("/me", response_model=List[ApplicationOut], summary="List my applications")
-def list_my_applications(
-    db: Session = Depends(get_db),
+async def list_my_applications(
+    request: Request,
+    response: Response,
+    page_params: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    return get_applications_by_user(db, current_user.id)
+    page = await get_applications_by_user_async(db, current_user.id, cursor=page_params.cursor, limit=page_params.limit)
+    set_page_headers(request, response, page)
+    return page.items
 
 # Read current user's application for a call
 @router.get("/{application_id}", response_model=ApplicationOut)
-def read_application(
+async def read_application(
     application_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    application = get_application_for_user(db, application_id, current_user.id)
+    version = await get_application_version_async(db, application_id, current_user.id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Application not found")
+    validators = Validators.from_version(version)
+    if validators.matches(request):
+        return validators.not_modified()
+    application = await get_application_for_user_async(db, application_id, current_user.id)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
+    validators.apply(response)
     return application
 
 # Multi-file upload for an application (legacy)
@@ -116,19 +154,13 @@ def upload_application_files(
             raise HTTPException(status_code=400, detail=f"Invalid file format: .{ext}")
 
         unique_name = f"{uuid.uuid4().hex}_{filename}"
-        data = file.file.read()
-
-        attachment = Attachment(
+        attachment = store_attachment(
+            db,
             application_id=application.id,
             document_id=document_id,
             file_name=unique_name,
-            data=data,
-            is_confirmed=False,
+            stream=UploadStream(file.file, settings.max_upload_size, [document.allowed_formats.value]),
         )
-        db.add(attachment)
-        db.commit()
-        db.refresh(attachment)
-
         attachments.append(attachment)
 
     return attachments
@@ -158,36 +190,37 @@ def upload_attachment(
         raise HTTPException(status_code=400, detail=f"Invalid file format: .{ext}")
 
     filename = f"{uuid.uuid4().hex}.{ext}"
-    data = file.file.read()
-
-    attachment = Attachment(
+    return store_attachment(
+        db,
         application_id=application.id,
         document_id=document.id,
         file_name=filename,
-        data=data,
-        is_confirmed=False,
+        stream=UploadStream(file.file, settings.max_upload_size, [document.allowed_formats.value]),
     )
-    db.add(attachment)
-    db.commit()
-    db.refresh(attachment)
-    return attachment
 
 # List attachments for an application
 @router.get("/{application_id}/attachments", response_model=List[AttachmentOut])
 def list_attachments(
     application_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
     application = get_application_for_user(db, application_id, current_user.id)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
+    validators = Validators.from_version(get_attachments_version(db, application.id), aggregate=True)
+    if validators.matches(request):
+        return validators.not_modified()
+    validators.apply(response)
     return get_attachments_by_application(db, application.id)
 
 # Download attachment data
 @router.get("/attachments/{attachment_id}/download")
 def download_attachment(
     attachment_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
@@ -197,16 +230,13 @@ def download_attachment(
     ).first()
     if not attachment:
         raise HTTPException(status_code=404, detail="Attachment not found")
-    return Response(
-        content=attachment.data,
-        media_type="application/octet-stream",
-        headers={"Content-Disposition": f"attachment; filename={attachment.file_name}"},
-    )
+    return attachment_response(request, attachment, get_blob_store())
 
 # Admin/Reviewer: Download attachment for review
 @router.get("/attachments/{attachment_id}/review-download")
 def download_attachment_for_review(
     attachment_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_or_reviewer),
 ):
@@ -223,10 +253,29 @@ def download_attachment_for_review(
         db, application.id, current_user.id
     ):
         raise HTTPException(status_code=403, detail="Not assigned to this application")
-    return Response(
-        content=attachment.data,
-        media_type="application/octet-stream",
-        headers={"Content-Disposition": f"attachment; filename={attachment.file_name}"},
+    return attachment_response(request, attachment, get_blob_store())
+
+# All attachments of an application as one streamed ZIP
+@router.get("/{application_id}/attachments.zip")
+def download_attachments_zip(
+    application_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    application = db.get(Application, application_id)
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+    if current_user.role == UserRole.REVIEWER:
+        if not is_reviewer_assigned(db, application.id, current_user.id):
+            raise HTTPException(status_code=403, detail="Not assigned to this application")
+    elif current_user.role != UserRole.ADMIN and application.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Application not found")
+
+    entries = get_archive_entries(db, application_id=application.id)
+    return StreamingResponse(
+        stream_zip(entries, get_blob_store()),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="application_{application.id}_attachments.zip"'},
     )
 
 # Delete an attachment by its ID
@@ -298,21 +347,15 @@ def confirm_single_attachment(
 
 # Submit application status
 @router.patch("/{application_id}/submit", response_model=ApplicationOut)
-def submit_application_status(
+async def submit_application_status(
     application_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    app_obj = db.query(Application).filter(
-        Application.id == application_id,
-        Application.user_id == current_user.id
-    ).first()
+    app_obj = await get_application_for_user_async(db, application_id, current_user.id)
     if not app_obj:
         raise HTTPException(status_code=404, detail="Application not found")
-    app_obj.status = ApplicationStatus.SUBMITTED
-    db.commit()
-    db.refresh(app_obj)
-    return app_obj
+    return await set_application_status_async(db, app_obj, ApplicationStatus.SUBMITTED)
 
 # Delete draft application
 @router.delete("/{application_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -335,34 +378,39 @@ def delete_draft_application(
 
 # Get or create application by call
 @router.get("/by_call/{call_id}", response_model=ApplicationOut)
-def get_or_create_application_by_call(
+async def get_or_create_application_by_call(
     call_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    existing = get_application_by_user_and_call(db, current_user.id, call_id)
+    existing = await get_application_by_user_and_call_async(db, current_user.id, call_id)
     if existing:
         return existing
     try:
-        return create_application(db, call_id=call_id, content="", user_id=current_user.id)
+        return await create_application_async(db, call_id=call_id, content="", user_id=current_user.id)
     except ValueError:
-        existing = get_application_by_user_and_call(db, current_user.id, call_id)
+        existing = await get_application_by_user_and_call_async(db, current_user.id, call_id)
         if existing:
             return existing
         raise HTTPException(status_code=400, detail="Could not create or fetch application")
 
 # Admin: List all applications for a call
 @router.get("/admin/{call_id}/applications", response_model=List[ApplicationDetail])
-async def admin_list_call_applications(
+def admin_list_call_applications(
     call_id: int,
+    request: Request,
+    response: Response,
+    page_params: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_admin = Depends(get_current_admin),
 ):
-    return get_applications_by_call(db, call_id)
+    page = paginate_applications_by_call(db, call_id, cursor=page_params.cursor, limit=page_params.limit)
+    set_page_headers(request, response, page)
+    return page.items
 
 # Admin: Assign reviewer to an application
 @router.post("/admin/applications/{application_id}/assign-reviewer", status_code=status.HTTP_200_OK)
-async def assign_reviewer_route(
+def assign_reviewer_route(
     application_id: int = Path(...),
     reviewer_id: int = Query(...),
     db: Session = Depends(get_db),
@@ -375,14 +423,47 @@ async def assign_reviewer_route(
     return {"detail": f"Reviewer {reviewer_id} assigned", "application_id": application_id}
 
 
+# Admin: Assign reviewers from the call's pool to all of its applications at once
+@router.post("/admin/calls/{call_id}/assign-reviewers", response_model=ReviewerAssignmentOut)
+def assign_call_reviewers_route(
+    data: ReviewerAssignmentRequest,
+    call_id: int = Path(...),
+    db: Session = Depends(get_db),
+    current_admin = Depends(get_current_admin),
+):
+    if not db.get(Call, call_id):
+        raise HTTPException(status_code=404, detail="Call not found")
+    try:
+        plan = assign_call_reviewers(db, call_id, data.per_application, dry_run=data.dry_run)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return ReviewerAssignmentOut(
+        call_id=call_id,
+        dry_run=data.dry_run,
+        created=0 if data.dry_run else len(plan.assignments),
+        assignments=[{"application_id": a, "reviewer_id": r} for a, r in plan.assignments],
+        shortfalls=[{"application_id": a, "missing": n} for a, n in sorted(plan.shortfalls.items())],
+        reviewer_loads=[{"reviewer_id": r, "assigned": n} for r, n in plan.loads.items()],
+    )
+
+
 # Admin/Reviewer: Get application details
 @router.get("/{application_id}/details", response_model=ApplicationDetail)
 def get_application_details(
     application_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_or_reviewer),
 ):
+    version = get_application_detail_version(db, application_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Application not found")
+    validators = Validators.from_version(version, aggregate=True)
+    if validators.matches(request):
+        return validators.not_modified()
     application = get_application_detail(db, application_id)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
+    validators.apply(response)
     return application
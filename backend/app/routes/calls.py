@@ -1,30 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status, Query, Path
-from fastapi.responses import Response as FastAPIResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query, Path
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.exc import IntegrityError
-from typing import List
-import pdfkit
+from datetime import datetime, timezone
+from typing import List, Literal
 
-from app.dependencies import get_db
+from pydantic import TypeAdapter
+
+from app.config import settings
+from app.dependencies import get_db, get_async_db
 from ..dependencies import get_current_admin, get_current_admin_or_reviewer, get_current_user
-from ..models.call import Call
+from ..models.call import Call, CallStatus
+from ..models.user import UserRole
 from ..schemas.call import CallCreate, CallOut, CallUpdate
 from ..schemas.document import DocumentDefinitionOut
 from ..schemas.application import ApplicationDetail
+from ..schemas.export import ExportJobOut
+from ..schemas.review import ApplicationRanking, NormalizedRanking
+from ..services.blob_store import get_blob_store
+from ..services.call_export import csv_stream, iter_call_export_rows, ndjson_stream
+from ..services.response_cache import (
+    cached_json_response,
+    get_rankings_cache,
+    get_response_cache,
+    seconds_until_next_boundary,
+)
+from ..services.pdf_export import DONE, ExportJob, get_pdf_export_service
+from ..services.score_normalization import NormalizationMethod, load_score_matrix_async, normalize_rankings
+from ..services.zip_stream import stream_zip
 from ..crud.call import (
     create_call,
     get_call,
     update_call,
     delete_call,
-    list_calls,
-    list_open_calls,
+    get_call_async,
+    filter_calls,
+    next_activity_change_async,
+    search_calls_async,
 )
-from ..crud.application import get_applications_by_call
-from ..crud.attachment import get_attachments_by_application
-from ..crud.document import list_document_definitions
+from ..crud.application import paginate_applications_by_call
+from ..crud.attachment import get_archive_entries
+from ..crud.document import list_document_definitions_async
+from ..crud.review import get_call_rankings_async
+from ..utils.pagination import PageParams, set_page_headers
 
-templates = Jinja2Templates(directory="app/templates")
 router = APIRouter(prefix="/calls", tags=["calls"])
 
 
@@ -46,17 +67,63 @@ def create_new_call(
     return call
 
 
+CALL_LIST = TypeAdapter(List[CallOut])
+DOCUMENT_LIST = TypeAdapter(List[DocumentDefinitionOut])
+RANKING_LIST = TypeAdapter(List[ApplicationRanking])
+NORMALIZED_RANKING_LIST = TypeAdapter(List[NormalizedRanking])
+
+
+def _cache_ttl(calls) -> float:
+    """The configured TTL, cut short when a call's ``is_active`` is about to flip."""
+    now = datetime.now(timezone.utc)
+    boundary = seconds_until_next_boundary(((c.start_date, c.end_date) for c in calls), now)
+    ttl = settings.response_cache_ttl
+    return ttl if boundary is None else min(ttl, boundary)
+
+
 @router.get("/", response_model=List[CallOut])
-def read_calls(
-    only_open: bool = Query(False, description="Filter only currently open calls"),
-    db: Session = Depends(get_db),
+async def read_calls(
+    request: Request,
+    only_open: bool = Query(False, description="Filter only calls flagged as open"),
+    status: CallStatus | None = Query(None, description="Filter by status"),
+    category: str | None = Query(None, max_length=50, description="Filter by category"),
+    active: bool | None = Query(None, description="Filter by whether the call is active"),
+    active_at: datetime | None = Query(None, description="Evaluate `active` at this time instead of now"),
+    order: Literal["created", "deadline"] = Query("created", description="Sort by creation time or closing date"),
+    page_params: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return list_open_calls(db) if only_open else list_calls(db)
+    """List calls, filtered and sorted in SQL. ``X-Total-Count`` has the number of matches."""
+    if active_at is not None and active_at.tzinfo is None:
+        active_at = active_at.replace(tzinfo=timezone.utc)
+    stmt = filter_calls(only_open=only_open, status=status, category=category, active=active, active_at=active_at)
+
+    async def build():
+        page, total = await search_calls_async(db, stmt, order, cursor=page_params.cursor, limit=page_params.limit)
+        page_headers = Response()
+        set_page_headers(request, page_headers, page)
+        headers = {k: v for k, v in page_headers.headers.items() if k in ("link", "x-next-cursor")}
+        headers["X-Total-Count"] = str(total)
+        ttl = _cache_ttl(page.items)
+        if active is not None and active_at is None:
+            # Calls outside this page can start or end and change the result
+            now = datetime.now(timezone.utc)
+            boundary = seconds_until_next_boundary([await next_activity_change_async(db, now)], now)
+            ttl = ttl if boundary is None else min(ttl, boundary)
+        return CALL_LIST.dump_json(CALL_LIST.validate_python(page.items)), ttl, headers
+
+    return await cached_json_response(get_response_cache(), request, build)
 
 
 @router.get("/{call_id}", response_model=CallOut)
-def read_call(call_id: int, db: Session = Depends(get_db)):
-    return get_call_or_404(call_id, db)
+async def read_call(call_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        call = await get_call_async(db, call_id)
+        if not call:
+            raise HTTPException(status_code=404, detail="Call not found")
+        return CallOut.model_validate(call).model_dump_json().encode(), _cache_ttl([call]), {}
+
+    return await cached_json_response(get_response_cache(), request, build)
 
 
 @router.put("/{call_id}", response_model=CallOut)
@@ -90,41 +157,236 @@ def delete_existing_call(
 @router.get("/{call_id}/applications", response_model=List[ApplicationDetail])
 def list_call_applications(
     call_id: int,
+    request: Request,
+    response: Response,
+    page_params: PageParams = Depends(),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_admin_or_reviewer),
 ):
     get_call_or_404(call_id, db)
-    return get_applications_by_call(db, call_id)
+    page = paginate_applications_by_call(db, call_id, cursor=page_params.cursor, limit=page_params.limit)
+    set_page_headers(request, response, page)
+    return page.items
+
+
+def _ranking(row: dict, divergence: int) -> ApplicationRanking:
+    return ApplicationRanking(
+        **row,
+        missing_reviews=row["review_count"] == 0 or row["review_count"] < row["assigned_reviewers"],
+        divergent=row["spread"] is not None and row["spread"] > divergence,
+    )
+
+
+@router.get(
+    "/{call_id}/rankings",
+    response_model=List[ApplicationRanking],
+    summary="Rank a call's applications by their review scores",
+)
+async def read_call_rankings(
+    call_id: int,
+    request: Request,
+    divergence: int = Query(
+        settings.review_divergence_threshold, ge=0, le=100,
+        description="Flag applications whose scores are spread wider than this",
+    ),
+    page_params: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_admin=Depends(get_current_admin),
+):
+    """Applications by mean score, best first, with flags for missing and divergent reviews.
+
+    Served from a cache that every review or assignment write clears.
+    """
+    async def build():
+        if not await get_call_async(db, call_id):
+            raise HTTPException(status_code=404, detail="Call not found")
+        page = await get_call_rankings_async(db, call_id, cursor=page_params.cursor, limit=page_params.limit)
+        page_headers = Response()
+        set_page_headers(request, page_headers, page)
+        headers = {k: v for k, v in page_headers.headers.items() if k in ("link", "x-next-cursor")}
+        rankings = [_ranking(row, divergence) for row in page.items]
+        return RANKING_LIST.dump_json(rankings), settings.rankings_cache_ttl, headers
+
+    return await cached_json_response(get_rankings_cache(), request, build)
+
+
+@router.get(
+    "/{call_id}/rankings/normalized",
+    response_model=List[NormalizedRanking],
+    summary="Rank a call's reviewed applications after correcting for reviewer bias",
+)
+async def read_normalized_call_rankings(
+    call_id: int,
+    request: Request,
+    method: NormalizationMethod = Query(
+        "zscore", description="`zscore` per reviewer, or `calibration` of each reviewer's offset",
+    ),
+    page_params: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_admin=Depends(get_current_admin),
+):
+    """Applications by mean normalized score, each with its raw rank for comparison.
+
+    Only reviewed applications are ranked. Shares the rankings cache.
+    """
+    async def build():
+        if not await get_call_async(db, call_id):
+            raise HTTPException(status_code=404, detail="Call not found")
+        matrix = await load_score_matrix_async(db, call_id)
+        ranking = await run_in_threadpool(normalize_rankings, matrix, method)
+        page = ranking.page(cursor=page_params.cursor, limit=page_params.limit)
+        page_headers = Response()
+        set_page_headers(request, page_headers, page)
+        headers = {k: v for k, v in page_headers.headers.items() if k in ("link", "x-next-cursor")}
+        body = NORMALIZED_RANKING_LIST.dump_json(NORMALIZED_RANKING_LIST.validate_python(page.items))
+        return body, settings.rankings_cache_ttl, headers
+
+    return await cached_json_response(get_rankings_cache(), request, build)
+
+
+def _job_out(request: Request, job: ExportJob) -> ExportJobOut:
+    status_url = request.url_for("read_export_job", call_id=job.call_id, job_id=job.id)
+    return ExportJobOut(
+        id=job.id,
+        call_id=job.call_id,
+        status=job.status,
+        progress=job.progress,
+        error=job.error,
+        status_url=str(status_url),
+        events_url=str(request.url_for("stream_export_job", call_id=job.call_id, job_id=job.id)),
+        download_url=(
+            str(request.url_for("download_export_job", call_id=job.call_id, job_id=job.id))
+            if job.status == DONE else None
+        ),
+    )
+
+
+def _load_job(call_id: int, job_id: str) -> ExportJob:
+    job = get_pdf_export_service().load(job_id)
+    if not job or job.call_id != call_id:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return job
+
+
+@router.post(
+    "/{call_id}/exports",
+    response_model=ExportJobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Start (or reuse) a PDF export of a call's applications",
+)
+async def create_export_job(
+    call_id: int,
+    request: Request,
+    response: Response,
+    current_admin=Depends(get_current_admin),
+):
+    job = await get_pdf_export_service().enqueue(call_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Call not found")
+    out = _job_out(request, job)
+    response.headers["Location"] = out.status_url
+    return out
+
+
+@router.get("/{call_id}/exports/{job_id}", response_model=ExportJobOut)
+def read_export_job(
+    call_id: int,
+    job_id: str,
+    request: Request,
+    current_admin=Depends(get_current_admin),
+):
+    return _job_out(request, _load_job(call_id, job_id))
+
+
+@router.get("/{call_id}/exports/{job_id}/events", summary="Server-sent events with export progress")
+async def stream_export_job(
+    call_id: int,
+    job_id: str,
+    request: Request,
+    current_admin=Depends(get_current_admin),
+):
+    job = _load_job(call_id, job_id)
+
+    async def events():
+        async for state in get_pdf_export_service().wait(job):
+            yield f"event: status\ndata: {_job_out(request, state).model_dump_json()}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/{call_id}/exports/{job_id}/download")
+def download_export_job(
+    call_id: int,
+    job_id: str,
+    current_admin=Depends(get_current_admin),
+):
+    job = _load_job(call_id, job_id)
+    path = get_pdf_export_service().artifact_path(job)
+    if job.status != DONE or not path.exists():
+        raise HTTPException(status_code=409, detail="Export is not ready")
+    return FileResponse(path, media_type="application/pdf", filename=f"call_{call_id}_applications.pdf")
 
 
 @router.get("/{call_id}/export-applications.pdf")
-def export_applications_pdf(
+async def export_applications_pdf(
+    call_id: int,
+    request: Request,
+    current_admin=Depends(get_current_admin),
+):
+    """Serve the cached export, or start one and point to its status (202)."""
+    job = await get_pdf_export_service().enqueue(call_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Call not found")
+    if job.status == DONE:
+        return download_export_job(call_id, job.id)
+    out = _job_out(request, job)
+    return JSONResponse(out.model_dump(), status_code=status.HTTP_202_ACCEPTED, headers={"Location": out.status_url})
+
+
+def _stream_call_rows(db: Session, call_id: int, encode, media_type: str, extension: str) -> StreamingResponse:
+    get_call_or_404(call_id, db)
+    # The generator outlives the request's session, so it gets its own
+    session_factory = sessionmaker(bind=db.get_bind(), autoflush=False)
+    return StreamingResponse(
+        encode(iter_call_export_rows(session_factory, call_id)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="call_{call_id}_applications.{extension}"'},
+    )
+
+
+@router.get("/{call_id}/export.csv", summary="Stream the call's applications and reviews as CSV")
+def export_call_csv(
     call_id: int,
     db: Session = Depends(get_db),
     current_admin=Depends(get_current_admin),
 ):
-    call = get_call_or_404(call_id, db)
-    applications = get_applications_by_call(db, call_id)
-    attachments_map = {
-        app.id: get_attachments_by_application(db, app.id) for app in applications
-    }
+    return _stream_call_rows(db, call_id, csv_stream, "text/csv; charset=utf-8", "csv")
 
-    try:
-        html = templates.get_template("applications_export.html").render(
-            {
-                "call": call,
-                "applications": applications,
-                "attachments": attachments_map,
-            }
-        )
-        pdf = pdfkit.from_string(html, False)
-    except Exception:
-        raise HTTPException(status_code=500, detail="Failed to generate PDF")
-
-    headers = {
-        "Content-Disposition": f"attachment; filename=call_{call_id}_applications.pdf"
-    }
-    return FastAPIResponse(content=pdf, media_type="application/pdf", headers=headers)
+
+@router.get("/{call_id}/export.ndjson", summary="Stream the call's applications and reviews as NDJSON")
+def export_call_ndjson(
+    call_id: int,
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin),
+):
+    return _stream_call_rows(db, call_id, ndjson_stream, "application/x-ndjson", "ndjson")
+
+
+@router.get("/{call_id}/attachments.zip", summary="Stream every attachment of the call as a ZIP")
+def download_call_attachments_zip(
+    call_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_admin_or_reviewer),
+):
+    """Reviewers only get the applications they are assigned to."""
+    get_call_or_404(call_id, db)
+    reviewer_id = current_user.id if current_user.role == UserRole.REVIEWER else None
+    entries = get_archive_entries(db, call_id=call_id, reviewer_id=reviewer_id)
+    return StreamingResponse(
+        stream_zip(entries, get_blob_store()),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="call_{call_id}_attachments.zip"'},
+    )
 
 
 @router.get(
@@ -132,10 +394,16 @@ def export_applications_pdf(
     response_model=List[DocumentDefinitionOut],
     summary="List a call's required documents (applicant view)",
 )
-def list_call_documents_for_applicant(
+async def list_call_documents_for_applicant(
     call_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
-    get_call_or_404(call_id, db)
-    return list_document_definitions(db, call_id)
+    async def build():
+        if not await get_call_async(db, call_id):
+            raise HTTPException(status_code=404, detail="Call not found")
+        documents = await list_document_definitions_async(db, call_id)
+        return DOCUMENT_LIST.dump_json(DOCUMENT_LIST.validate_python(documents)), settings.response_cache_ttl, {}
+
+    return await cached_json_response(get_response_cache(), request, build)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+
+from ..config import settings
+from ..database import engine, async_engine, pool_status
+from ..dependencies import get_current_admin
+
+router = APIRouter(prefix="/admin/metrics", tags=["metrics"])
+
+
+# Admin: live connection pool statistics of this worker process
+@router.get("/db-pool")
+def read_db_pool_metrics(current_admin = Depends(get_current_admin)):
+    return {
+        "settings": {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_pre_ping": settings.db_pool_pre_ping,
+        },
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine),
+    }
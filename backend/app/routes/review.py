@@ -1,52 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Path
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.dependencies import get_db
+from app.config import settings
+from app.dependencies import get_db, get_async_db
 from ..dependencies import get_current_user, get_current_admin
-from ..models.review import Review
-from ..schemas.review import ReviewCreate, ReviewOut
+from ..schemas.review import ReviewCreate, ReviewOut, ReviewQueueItem, ReviewQueueLease, ReviewQueueNext
 from ..crud.review import (
-    create_review,
+    create_review_async,
     get_reviews_by_application,
-    get_reviews_by_reviewer,
-    has_submitted_review,
+    get_reviews_by_reviewer_async,
+    get_review_by_reviewer_async,
     update_review,
     delete_review,
 )
+from ..crud.review_queue import claim_next_review_async, get_review_queue_async
+from ..utils.pagination import PageParams, set_page_headers
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
 # Reviewer: Submit a review
 @router.post("/", response_model=ReviewOut, status_code=status.HTTP_201_CREATED)
-def submit_review(
+async def submit_review(
     review_in: ReviewCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    if has_submitted_review(db, review_in.application_id, current_user.id):
+    if await get_review_by_reviewer_async(db, review_in.application_id, current_user.id):
         raise HTTPException(status_code=400, detail="Review already submitted")
-    return create_review(db, review_in, current_user.id)
+    return await create_review_async(db, review_in, current_user.id)
 
 # Reviewer: List all my reviews
 @router.get("/me", response_model=List[ReviewOut])
-def list_my_reviews(
-    db: Session = Depends(get_db),
+async def list_my_reviews(
+    request: Request,
+    response: Response,
+    page_params: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+):
+    page = await get_reviews_by_reviewer_async(db, current_user.id, cursor=page_params.cursor, limit=page_params.limit)
+    set_page_headers(request, response, page)
+    return page.items
+
+# Reviewer: Assigned applications I have not reviewed yet, earliest deadline first
+@router.get("/queue", response_model=List[ReviewQueueItem])
+async def read_review_queue(
+    request: Request,
+    response: Response,
+    page_params: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    return get_reviews_by_reviewer(db, current_user.id)
+    page = await get_review_queue_async(db, current_user.id, cursor=page_params.cursor, limit=page_params.limit)
+    set_page_headers(request, response, page)
+    return page.items
+
+# Reviewer: Open the next queue item, leased to this session for a while
+@router.post(
+    "/queue/next",
+    response_model=ReviewQueueLease,
+    responses={204: {"description": "Nothing left to review"}},
+)
+async def open_next_review(
+    body: ReviewQueueNext | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+):
+    """Send back the ``lease_token`` you hold to keep your item, e.g. after a reload."""
+    claimed = await claim_next_review_async(
+        db, current_user.id, settings.review_lease_seconds, body.lease_token if body else None
+    )
+    if claimed is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    item, token, expires_at = claimed
+    return ReviewQueueLease(item=item, lease_token=token, lease_expires_at=expires_at)
 
 # Reviewer: Get my review for a specific application
 @router.get("/applications/{application_id}/my-review", response_model=ReviewOut)
-def get_my_review_for_application(
+async def get_my_review_for_application(
     application_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user),
 ):
-    review = db.query(Review).filter(
-        Review.application_id == application_id,
-        Review.reviewer_id == current_user.id
-    ).first()
+    review = await get_review_by_reviewer_async(db, application_id, current_user.id)
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     return review
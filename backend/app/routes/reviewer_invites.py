@@ -1,6 +1,5 @@
 from datetime import datetime, timedelta
-import secrets
-import string
+from functools import partial
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
@@ -8,12 +7,23 @@ from app.dependencies import get_db
 from ..dependencies import get_current_user, get_current_admin
 from ..models.user import UserRole
 from ..models.call import Call
-from ..schemas.reviewer_invite import ReviewerInviteCreate, ReviewerInviteTokenOut
+from ..schemas.reviewer_invite import (
+    BulkReviewerInviteCreate,
+    BulkReviewerInviteOut,
+    BulkInviteStatus,
+    ReviewerInviteCreate,
+    ReviewerInviteOut,
+)
+from ..crud.email_outbox import enqueue_email
 from ..crud.reviewer_invite import (
     get_invite_by_token,
     accept_invite,
     create_invite,
+    create_invites_bulk,
+    generate_tokens,
 )
+from ..services.email_sender import wake_outbox_sender
+from ..utils.email import reviewer_invite_email
 
 router = APIRouter(prefix="/reviewer/invites", tags=["reviewer_invites"])
 
@@ -41,9 +51,16 @@ def accept_reviewer_invite(
     return {"detail": "Invite accepted"}
 
 
+def _get_call_or_404(db: Session, call_id: int) -> Call:
+    call = db.query(Call).filter(Call.id == call_id).first()
+    if not call:
+        raise HTTPException(status_code=404, detail="Call not found")
+    return call
+
+
 @router.post(
     "/generate",
-    response_model=ReviewerInviteTokenOut,
+    response_model=ReviewerInviteOut,
     status_code=status.HTTP_201_CREATED,
 )
 def generate_invite(
@@ -51,20 +68,47 @@ def generate_invite(
     db: Session = Depends(get_db),
     current_admin=Depends(get_current_admin),
 ):
-    call = db.query(Call).filter(Call.id == data.call_id).first()
-    if not call:
-        raise HTTPException(status_code=404, detail="Call not found")
-
-    token_chars = string.ascii_uppercase + string.digits
-    token = "".join(secrets.choice(token_chars) for _ in range(6))
+    call = _get_call_or_404(db, data.call_id)
 
     hours = data.expiration_hours or 24
     expires_at = datetime.utcnow() + timedelta(hours=hours)
+    token = generate_tokens(db, 1)[0]
 
     invite = create_invite(
         db,
         call_id=data.call_id,
+        email=data.email,
         token=token,
         expires_at=expires_at,
     )
+    enqueue_email(db, invite.email, *reviewer_invite_email(call.title, token, expires_at))
+    wake_outbox_sender()
     return invite
+
+
+# Admin: invite a list of reviewers at once; each email gets its own result
+@router.post(
+    "/bulk",
+    response_model=BulkReviewerInviteOut,
+    status_code=status.HTTP_201_CREATED,
+)
+def generate_invites_bulk(
+    data: BulkReviewerInviteCreate,
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin),
+):
+    call = _get_call_or_404(db, data.call_id)
+
+    hours = data.expiration_hours or 24
+    expires_at = datetime.utcnow() + timedelta(hours=hours)
+    results = create_invites_bulk(
+        db,
+        call_id=data.call_id,
+        emails=data.emails,
+        expires_at=expires_at,
+        render_email=partial(reviewer_invite_email, call.title, expires_at=expires_at),
+    )
+    invited = sum(result.status is BulkInviteStatus.invited for result in results)
+    if invited:
+        wake_outbox_sender()
+    return BulkReviewerInviteOut(call_id=data.call_id, expires_at=expires_at, invited=invited, results=results)
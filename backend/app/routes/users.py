@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
 from jose import jwt
 
-from app.dependencies import get_db
+from app.dependencies import get_db, get_async_db
 from ..dependencies import get_current_user, get_current_admin
 from ..models.user import User as UserModel, UserRole
 from ..schemas.user import (
@@ -18,16 +20,22 @@ from ..schemas.user import (
 )
 from ..crud.user import (
     get_user_by_email,
-    create_user,
-    update_user,
+    get_user_by_email_async,
+    create_user_async,
+    update_user_async,
     verify_user,
     create_password_reset,
     reset_password,
-    track_login_attempt,
+    track_login_attempt_async,
     is_account_locked,
+    get_users_async,
 )
 from ..config import settings
-from ..utils.email import send_verification_email, send_password_reset_email
+from ..utils.email import queue_verification_email, queue_password_reset_email
+from ..services.email_sender import wake_outbox_sender
+from ..services.principal_cache import principal_cache
+from ..utils.conditional import Validators
+from ..utils.pagination import PageParams, set_page_headers
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 router = APIRouter(prefix="/users", tags=["users"])
@@ -42,23 +50,24 @@ def create_access_token(data: dict) -> str:
 
 
 @auth_router.post("/login")
-def login(user_in: UserLogin, db: Session = Depends(get_db)):
-    user = get_user_by_email(db, user_in.email)
+async def login(user_in: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = await get_user_by_email_async(db, user_in.email)
 
     # track_login_attempt sadece kullanıcı varsa yapılmalı
-    if not user or not pwd_context.verify(user_in.password, user.hashed_password):
+    # bcrypt is CPU bound; verify in the thread pool to keep the event loop free
+    if not user or not await run_in_threadpool(pwd_context.verify, user_in.password, user.hashed_password):
         if user:
-            track_login_attempt(db, user, success=False)
+            await track_login_attempt_async(db, user, success=False)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
     if is_account_locked(user):
         raise HTTPException(status_code=status.HTTP_423_LOCKED, detail="Account locked")
 
     if user.role.value != user_in.role:
-        track_login_attempt(db, user, success=False)
+        await track_login_attempt_async(db, user, success=False)
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Role mismatch")
 
-    track_login_attempt(db, user, success=True)
+    await track_login_attempt_async(db, user, success=True)
 
     token = create_access_token({
         "sub": str(user.id),
@@ -73,14 +82,18 @@ def login(user_in: UserLogin, db: Session = Depends(get_db)):
 @auth_router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_in: UserCreate,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    if get_user_by_email(db, user_in.email):
+    if await get_user_by_email_async(db, user_in.email):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
-    user = create_user(db, user_in)
-    background_tasks.add_task(send_verification_email, email=user.email, token=user.verification_token)
+    # The user and the verification email are committed together
+    user = await create_user_async(db, user_in, commit=False)
+    if user.verification_token:
+        await queue_verification_email(db, user.email, user.verification_token, commit=False)
+    await db.commit()
+    await db.refresh(user)
+    wake_outbox_sender()
     return user
 
 
@@ -91,15 +104,16 @@ def verify_email(token: str, db: Session = Depends(get_db)):
 
 
 @auth_router.post("/password-reset", response_model=dict)
-async def request_password_reset(
+def request_password_reset(
     reset_request: PasswordReset,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     user = get_user_by_email(db, reset_request.email)
     if user:
-        token = create_password_reset(db, user)
-        background_tasks.add_task(send_password_reset_email, email=user.email, token=token)
+        token = create_password_reset(db, user, commit=False)
+        queue_password_reset_email(db, user.email, token, commit=False)
+        db.commit()
+        wake_outbox_sender()
     return {"detail": "If the email exists, a reset link will be sent"}
 
 
@@ -114,34 +128,54 @@ def confirm_password_reset(
 
 # User management endpoints
 @router.get("/me", response_model=UserOut)
-def read_current_user(current_user = Depends(get_current_user)):
+async def read_current_user(
+    request: Request,
+    response: Response,
+    current_user = Depends(get_current_user),
+):
+    # The principal already carries updated_at, so this needs no query at all
+    validators = Validators.from_version((current_user.id, current_user.updated_at))
+    if validators.matches(request):
+        return validators.not_modified()
+    validators.apply(response)
     return current_user
 
 
 @router.patch("/me", response_model=UserOut)
-def update_current_user(
+async def update_current_user(
     update_data: UserUpdate,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return update_user(db, current_user, update_data)
+    user = await db.get(UserModel, current_user.id)
+    return await update_user_async(db, user, update_data)
 
 
 # Admin-only endpoints
 @router.get("/", response_model=list[UserOut])
-def list_users(
-    db: Session = Depends(get_db),
+async def list_users(
+    request: Request,
+    response: Response,
+    page_params: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin),
 ):
-    return db.query(UserModel).all()
+    page = await get_users_async(db, cursor=page_params.cursor, limit=page_params.limit)
+    set_page_headers(request, response, page)
+    return page.items
 
 
 @router.get("/admin/reviewers", response_model=list[UserOut])
-def list_reviewers(
-    db: Session = Depends(get_db),
+async def list_reviewers(
+    request: Request,
+    response: Response,
+    page_params: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current_admin = Depends(get_current_admin)
 ):
-    return db.query(UserModel).filter(UserModel.role == UserRole.REVIEWER).all()
+    page = await get_users_async(db, role=UserRole.REVIEWER, cursor=page_params.cursor, limit=page_params.limit)
+    set_page_headers(request, response, page)
+    return page.items
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -155,4 +189,5 @@ def delete_user(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     db.delete(user)
     db.commit()
+    principal_cache.invalidate(user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
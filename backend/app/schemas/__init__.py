@@ -3,3 +3,4 @@ from .call import *  # noqa
 from .application import *  # noqa
 from .attachment import *  # noqa
 from .document import *  # noqa
+from .export import *  # noqa
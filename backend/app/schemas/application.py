@@ -1,8 +1,10 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from .attachment import AttachmentOut
 from .user import UserOut
 from datetime import datetime
 
+MAX_REVIEWERS_PER_APPLICATION = 3
+
 
 # Schema for creating a new application
 class ApplicationCreate(BaseModel):
@@ -45,3 +47,28 @@ class ApplicationDetail(BaseModel):
     reviewers: list[ReviewerShort]
 
     model_config = ConfigDict(from_attributes=True)
+
+# Bulk reviewer assignment for a call
+class ReviewerAssignmentRequest(BaseModel):
+    per_application: int = Field(MAX_REVIEWERS_PER_APPLICATION, ge=1, le=MAX_REVIEWERS_PER_APPLICATION)  # Reviewers each application should end up with
+    dry_run: bool = False  # Only return the plan
+
+class ReviewerAssignment(BaseModel):
+    application_id: int
+    reviewer_id: int
+
+class AssignmentShortfall(BaseModel):
+    application_id: int
+    missing: int  # Not enough eligible reviewers in the call's pool
+
+class ReviewerLoad(BaseModel):
+    reviewer_id: int
+    assigned: int  # Applications of the call after the plan is applied
+
+class ReviewerAssignmentOut(BaseModel):
+    call_id: int
+    dry_run: bool
+    created: int
+    assignments: list[ReviewerAssignment]
+    shortfalls: list[AssignmentShortfall]
+    reviewer_loads: list[ReviewerLoad]
@@ -5,7 +5,10 @@ class AttachmentCreate(BaseModel):
     application_id: int
     document_id: int | None = None
     file_name: str
-    data: bytes
+    content_hash: str
+    storage_key: str
+    size: int
+    content_type: str | None = None
     is_confirmed: bool = False
 
 
@@ -16,5 +19,7 @@ class AttachmentOut(BaseModel):
     document_id: int | None
     file_name: str
     is_confirmed: bool
+    size: int | None = None
+    content_type: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
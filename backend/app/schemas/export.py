@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+# Status of an asynchronous PDF export
+class ExportJobOut(BaseModel):
+    id: str
+    call_id: int
+    status: str  # queued | running | done | failed
+    progress: float
+    error: str | None = None
+    status_url: str
+    events_url: str
+    download_url: str | None = None
@@ -1,6 +1,8 @@
 from datetime import datetime
 from pydantic import BaseModel, ConfigDict
 
+from .attachment import AttachmentOut
+
 class ReviewCreate(BaseModel):
     application_id: int
     score: int
@@ -15,3 +17,49 @@ class ReviewOut(BaseModel):
     submitted_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+class ApplicationRanking(BaseModel):
+    """Review statistics of one application within its call."""
+    rank: int
+    application_id: int
+    user_id: int
+    review_count: int
+    assigned_reviewers: int
+    mean_score: float | None
+    min_score: int | None
+    max_score: int | None
+    spread: int | None
+    missing_reviews: bool  # fewer reviews than assigned reviewers, or none at all
+    divergent: bool  # spread above the divergence threshold
+
+
+class NormalizedRanking(BaseModel):
+    """An application's rank after correcting for lenient and harsh reviewers."""
+    rank: int
+    application_id: int
+    normalized_score: float
+    raw_rank: int
+    mean_score: float
+    review_count: int
+
+
+class ReviewQueueItem(BaseModel):
+    """An assigned application the reviewer has not reviewed yet."""
+    assignment_id: int
+    application_id: int
+    call_id: int
+    call_title: str
+    deadline: datetime | None
+    leased_until: datetime | None = None  # Opened in a session until then
+    attachments: list[AttachmentOut] = []
+
+
+class ReviewQueueNext(BaseModel):
+    # The token of the lease this session holds; it is renewed while the item is pending
+    lease_token: str | None = None
+
+
+class ReviewQueueLease(BaseModel):
+    item: ReviewQueueItem
+    lease_token: str
+    lease_expires_at: datetime
@@ -1,15 +1,45 @@
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from enum import Enum
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+
+# Upper bound of one bulk request; keeps the multi-row INSERT under driver parameter limits
+MAX_BULK_INVITES = 1000
 
 class ReviewerInviteCreate(BaseModel):
     call_id: int
+    email: EmailStr
     expiration_hours: int | None = None
 
-class ReviewerInviteTokenOut(BaseModel):
+class ReviewerInviteOut(BaseModel):
     id: int
     call_id: int
+    email: str
     token: str
     expires_at: datetime
-    created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+# Bulk invitations: emails are validated one by one so a typo only fails its own entry
+class BulkReviewerInviteCreate(BaseModel):
+    call_id: int
+    emails: list[str] = Field(min_length=1, max_length=MAX_BULK_INVITES)
+    expiration_hours: int | None = None
+
+class BulkInviteStatus(str, Enum):
+    invited = "invited"
+    invalid = "invalid"  # Not an email address
+    duplicate = "duplicate"  # Listed earlier in the same request
+    already_invited = "already_invited"  # Has an unused, unexpired invite for the call
+    already_reviewer = "already_reviewer"  # Already a reviewer of the call
+
+class BulkInviteResult(BaseModel):
+    email: str
+    status: BulkInviteStatus
+    invite_id: int | None = None
+    detail: str | None = None
+
+class BulkReviewerInviteOut(BaseModel):
+    call_id: int
+    expires_at: datetime
+    invited: int
+    results: list[BulkInviteResult]
@@ -0,0 +1,163 @@
+import re
+from typing import Mapping
+
+import anyio
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from ..config import settings
+from ..models.attachment import Attachment
+from .blob_store import BlobStore, CHUNK_SIZE
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse a single-range ``Range`` header into an inclusive ``(start, end)``.
+
+    Returns ``None`` when the header is absent, malformed or asks for several
+    ranges, in which case the full body is served (RFC 9110 allows ignoring
+    ``Range``). Raises 416 if the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise _range_not_satisfiable(size)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise _range_not_satisfiable(size)
+    return start, end
+
+
+def _range_not_satisfiable(size: int) -> HTTPException:
+    return HTTPException(
+        status_code=416,
+        detail="Requested range not satisfiable",
+        headers={"Content-Range": f"bytes */{size}"},
+    )
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+class BlobResponse(Response):
+    """Stream a byte range of a stored blob without loading it into memory.
+
+    When the server advertises the ASGI ``http.response.pathsend`` extension
+    and the whole blob is requested from local disk, the path is handed to the
+    server so it can use sendfile(2). Otherwise the range is read in
+    fixed-size chunks from a worker thread.
+    """
+
+    chunk_size = CHUNK_SIZE
+
+    def __init__(
+        self,
+        store: BlobStore,
+        storage_key: str,
+        start: int,
+        end: int,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str = "application/octet-stream",
+    ):
+        self.store = store
+        self.storage_key = storage_key
+        self.start = start
+        self.length = end - start + 1
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers({**(headers or {}), "Content-Length": str(self.length)})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        if scope.get("method") == "HEAD" or self.length <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        extensions = scope.get("extensions") or {}
+        path = self.store.local_path(self.storage_key)
+        if path is not None and "http.response.pathsend" in extensions and self.status_code == 200:
+            await send({"type": "http.response.pathsend", "path": str(path)})
+            return
+
+        fh = await anyio.to_thread.run_sync(self.store.open, self.storage_key)
+        try:
+            await anyio.to_thread.run_sync(fh.seek, self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(fh.read, min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            await anyio.to_thread.run_sync(fh.close)
+
+
+def attachment_response(request: Request, attachment: Attachment, store: BlobStore) -> Response:
+    """Build a download response honouring ``If-None-Match`` and ``Range``.
+
+    The strong ETag is the SHA-256 of the content, so it stays valid across
+    renames and re-uploads of identical files.
+    """
+    etag = f'"{attachment.content_hash}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=0, must-revalidate",
+        "Content-Disposition": f"attachment; filename={attachment.file_name}",
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if not store.exists(attachment.storage_key):
+        raise HTTPException(status_code=404, detail="Attachment content not found")
+
+    path = store.local_path(attachment.storage_key)
+    if settings.accel_redirect_prefix and path is not None:
+        # Let the reverse proxy serve the file with sendfile and its own
+        # Range handling; the worker only authorizes the request.
+        prefix = settings.accel_redirect_prefix.rstrip("/")
+        headers["X-Accel-Redirect"] = f"{prefix}/{attachment.storage_key}"
+        return Response(status_code=200, headers=headers, media_type="application/octet-stream")
+
+    size = attachment.size
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        byte_range = parse_range(request.headers.get("range"), size)
+
+    if byte_range is None:
+        return BlobResponse(store, attachment.storage_key, 0, size - 1, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return BlobResponse(store, attachment.storage_key, start, end, status_code=206, headers=headers)
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    """Result of writing a blob: its SHA-256, size and backend-specific key."""
+    content_hash: str
+    size: int
+    storage_key: str
+
+
+@dataclass(frozen=True)
+class StagedBlob(StoredBlob):
+    """Bytes written and hashed but not yet visible under a storage key."""
+    staging_key: str
+
+
+class BlobStore(ABC):
+    """Content-addressed storage for attachment bytes.
+
+    Blobs are identified by the SHA-256 of their content. The ``storage_key``
+    returned by :meth:`put` is what gets persisted on the ``attachments`` row
+    and is opaque to everything except the backend that produced it.
+    """
+
+    @abstractmethod
+    def stage(self, stream: BinaryIO) -> StagedBlob:
+        """Copy ``stream`` into a staging area chunk by chunk and hash it.
+
+        ``storage_key`` of the result is where :meth:`publish` puts it by default.
+        """
+
+    @abstractmethod
+    def publish(self, staged: StagedBlob, storage_key: str | None = None) -> StoredBlob:
+        """Move staged bytes under ``storage_key``, keeping a copy that is already there."""
+
+    @abstractmethod
+    def discard(self, staged: StagedBlob) -> None:
+        """Drop staged bytes that will not be published."""
+
+    def put(self, stream: BinaryIO) -> StoredBlob:
+        """Copy ``stream`` into the store chunk by chunk and return its identity."""
+        return self.publish(self.stage(stream))
+
+    @abstractmethod
+    def open(self, storage_key: str) -> BinaryIO:
+        """Open a stored blob for binary reading."""
+
+    @abstractmethod
+    def delete(self, storage_key: str) -> None:
+        """Remove a blob. Missing blobs are ignored."""
+
+    @abstractmethod
+    def exists(self, storage_key: str) -> bool:
+        """Return True if the blob is present in the store."""
+
+    def local_path(self, storage_key: str) -> Path | None:
+        """Return the on-disk path of a blob, if the backend keeps one."""
+        return None
+
+    def iter_chunks(self, storage_key: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the blob's content in fixed-size chunks."""
+        with self.open(storage_key) as fh:
+            while chunk := fh.read(chunk_size):
+                yield chunk
+
+
+class LocalBlobStore(BlobStore):
+    """Filesystem blob store using the ``uploads/<YYYY-MM-DD>/`` layout.
+
+    Each blob is written to ``<root>/<date>/<sha256>`` where ``date`` is the
+    day it was first stored, mirroring :class:`FileUploadService`. Writes go
+    through a temporary file in the same filesystem and are renamed into place
+    once the hash is known, so readers never observe partial blobs.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._tmp_dir = self.root / ".tmp"
+        self._tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, storage_key: str) -> Path:
+        path = (self.root / storage_key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError("Invalid storage key")
+        return path
+
+    def stage(self, stream: BinaryIO) -> StagedBlob:
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=self._tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while chunk := stream.read(CHUNK_SIZE):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    out.write(chunk)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        content_hash = digest.hexdigest()
+        date_dir = datetime.now().strftime("%Y-%m-%d")
+        return StagedBlob(
+            content_hash=content_hash, size=size, storage_key=f"{date_dir}/{content_hash}", staging_key=tmp_name
+        )
+
+    def publish(self, staged: StagedBlob, storage_key: str | None = None) -> StoredBlob:
+        storage_key = storage_key or staged.storage_key
+        dest = self._path(storage_key)
+        try:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            if dest.exists():
+                os.unlink(staged.staging_key)
+            else:
+                os.replace(staged.staging_key, dest)
+        except BaseException:
+            self.discard(staged)
+            raise
+        return StoredBlob(content_hash=staged.content_hash, size=staged.size, storage_key=storage_key)
+
+    def discard(self, staged: StagedBlob) -> None:
+        try:
+            os.unlink(staged.staging_key)
+        except FileNotFoundError:
+            pass
+
+    def open(self, storage_key: str) -> BinaryIO:
+        return open(self._path(storage_key), "rb")
+
+    def delete(self, storage_key: str) -> None:
+        try:
+            os.unlink(self._path(storage_key))
+        except FileNotFoundError:
+            pass
+
+    def exists(self, storage_key: str) -> bool:
+        return self._path(storage_key).is_file()
+
+    def local_path(self, storage_key: str) -> Path | None:
+        return self._path(storage_key)
+
+
+# Registered backends, selected through ``settings.blob_store_backend``
+_BACKENDS: Dict[str, Callable[[], BlobStore]] = {
+    "local": lambda: LocalBlobStore(settings.upload_dir),
+}
+
+
+def register_blob_store(name: str, factory: Callable[[], BlobStore]) -> None:
+    """Register an additional blob store backend (e.g. object storage)."""
+    _BACKENDS[name] = factory
+    get_blob_store.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_blob_store() -> BlobStore:
+    """Return the configured blob store instance."""
+    try:
+        factory = _BACKENDS[settings.blob_store_backend]
+    except KeyError:
+        raise RuntimeError(f"Unknown blob store backend: {settings.blob_store_backend}")
+    return factory()
+
@@ -0,0 +1,186 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Iterable, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..crud.application import _confirmed_exists
+from ..models.application import Application
+from ..models.application_reviewer import ApplicationReviewer
+from ..models.attachment import Attachment
+from ..models.review import Review
+from ..models.user import User
+
+BATCH_SIZE = 500
+
+CSV_COLUMNS = [
+    "application_id",
+    "status",
+    "created_at",
+    "documents_confirmed",
+    "applicant_id",
+    "applicant_email",
+    "applicant_name",
+    "applicant_organization",
+    "attachment_count",
+    "attachments",
+    "reviewers",
+    "review_count",
+    "average_score",
+    "scores",
+]
+
+
+def _full_name(first: str | None, last: str | None) -> str:
+    return " ".join(part for part in (first, last) if part)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _batch_details(db: Session, ids: list[int]) -> tuple[dict, dict, dict]:
+    """Attachments, assigned reviewers and reviews for one batch of applications."""
+    attachments: dict[int, list[dict]] = defaultdict(list)
+    for row in db.execute(
+        select(
+            Attachment.application_id,
+            Attachment.id,
+            Attachment.file_name,
+            Attachment.size,
+            Attachment.content_type,
+            Attachment.is_confirmed,
+        )
+        .where(Attachment.application_id.in_(ids))
+        .order_by(Attachment.id)
+    ).mappings():
+        attachments[row["application_id"]].append({k: v for k, v in row.items() if k != "application_id"})
+
+    reviewers: dict[int, list[dict]] = defaultdict(list)
+    for application_id, user_id, first_name, last_name in db.execute(
+        select(ApplicationReviewer.application_id, User.id, User.first_name, User.last_name)
+        .join(User, User.id == ApplicationReviewer.user_id)
+        .where(ApplicationReviewer.application_id.in_(ids))
+        .order_by(ApplicationReviewer.id)
+    ):
+        reviewers[application_id].append({"id": user_id, "name": _full_name(first_name, last_name)})
+
+    reviews: dict[int, list[dict]] = defaultdict(list)
+    for application_id, reviewer_id, score, submitted_at in db.execute(
+        select(Review.application_id, Review.reviewer_id, Review.score, Review.submitted_at)
+        .where(Review.application_id.in_(ids))
+        .order_by(Review.id)
+    ):
+        reviews[application_id].append(
+            {"reviewer_id": reviewer_id, "score": score, "submitted_at": submitted_at}
+        )
+    return attachments, reviewers, reviews
+
+
+def iter_call_export_rows(
+    session_factory: Callable[[], Session], call_id: int, batch_size: int = BATCH_SIZE
+) -> Iterator[dict]:
+    """Yield one dict per application of a call, in id order.
+
+    Applications and their applicants are read through a server-side cursor
+    ``batch_size`` rows at a time; attachments, reviewers and reviews are
+    fetched per batch. Memory use depends on the batch size only. The
+    function opens its own session because it keeps running after the
+    request handler has returned.
+    """
+    db = session_factory()
+    try:
+        stmt = (
+            select(
+                Application.id,
+                Application.status,
+                Application.created_at,
+                # Same definition as ApplicationDetail: any confirmed attachment
+                _confirmed_exists(),
+                User.id.label("applicant_id"),
+                User.email,
+                User.first_name,
+                User.last_name,
+                User.organization,
+            )
+            .join(User, User.id == Application.user_id)
+            .where(Application.call_id == call_id)
+            .order_by(Application.id)
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        for batch in db.execute(stmt).partitions():
+            ids = [row.id for row in batch]
+            attachments, reviewers, reviews = _batch_details(db, ids)
+            for row in batch:
+                app_reviews = reviews[row.id]
+                scores = [r["score"] for r in app_reviews]
+                yield {
+                    "application_id": row.id,
+                    "status": row.status.value if hasattr(row.status, "value") else row.status,
+                    "created_at": row.created_at,
+                    "documents_confirmed": row.documents_confirmed,
+                    "applicant": {
+                        "id": row.applicant_id,
+                        "email": row.email,
+                        "name": _full_name(row.first_name, row.last_name),
+                        "organization": row.organization,
+                    },
+                    "attachments": attachments[row.id],
+                    "reviewers": reviewers[row.id],
+                    "reviews": app_reviews,
+                    "average_score": round(sum(scores) / len(scores), 2) if scores else None,
+                }
+    finally:
+        db.close()
+
+
+def _csv_row(row: dict) -> list:
+    return [
+        row["application_id"],
+        row["status"],
+        row["created_at"].isoformat() if row["created_at"] else "",
+        row["documents_confirmed"],
+        row["applicant"]["id"],
+        row["applicant"]["email"],
+        row["applicant"]["name"],
+        row["applicant"]["organization"] or "",
+        len(row["attachments"]),
+        "; ".join(a["file_name"] for a in row["attachments"]),
+        "; ".join(r["name"] or str(r["id"]) for r in row["reviewers"]),
+        len(row["reviews"]),
+        "" if row["average_score"] is None else row["average_score"],
+        "; ".join(str(r["score"]) for r in row["reviews"]),
+    ]
+
+
+def csv_stream(rows: Iterable[dict], flush_every: int = 100) -> Iterator[str]:
+    """Encode rows as CSV, yielding the header at once and then small blocks."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    pending = 0
+    for row in rows:
+        writer.writerow(_csv_row(row))
+        pending += 1
+        if pending >= flush_every:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def ndjson_stream(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, default=_json_default, separators=(",", ":")) + "\n"
@@ -0,0 +1,316 @@
+"""Background sender that drains the ``email_outbox`` table.
+
+Deploy it as its own process from the ``backend`` directory::
+
+    python -m app.services.email_sender
+
+Setting ``EMAIL_SENDER_ENABLED`` also runs it inside each API worker.
+"""
+import asyncio
+import logging
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.message import EmailMessage
+from functools import lru_cache
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..crud.email_outbox import claim_due_emails, record_delivery
+from ..database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+Transport = Callable[[EmailMessage], None]
+
+
+def build_message(to_email: str, subject: str, body: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = settings.from_email or settings.smtp_user or "no-reply@localhost"
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg.set_content(body, subtype="html")
+    return msg
+
+
+def log_transport(msg: EmailMessage) -> None:
+    """Development stand-in used when SMTP is not configured."""
+    print(f"[DEV EMAIL] To: {msg['To']}, Subject: {msg['Subject']}")
+    print(msg.get_content())
+
+
+class SmtpConnectionPool:
+    """Up to ``size`` logged-in SMTP connections, reused across messages.
+
+    A connection is checked out for one message at a time. Servers close
+    idle connections, so a send that finds its pooled connection dropped
+    is retried once on a fresh one. Connections that raised are discarded
+    rather than returned.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str | None = None,
+        password: str | None = None,
+        use_ssl: bool = True,
+        size: int = 2,
+        timeout: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self._idle: queue.LifoQueue[smtplib.SMTP] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.connects = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_ssl:
+            conn = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            conn.ehlo()
+            if conn.has_extn("starttls"):
+                conn.starttls()
+                conn.ehlo()
+        if self.user:
+            conn.login(self.user, self.password or "")
+        self.connects += 1
+        return conn
+
+    @contextmanager
+    def connection(self):
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            except BaseException:
+                self._discard(conn)
+                raise
+            self._idle.put(conn)
+
+    def send(self, msg: EmailMessage) -> None:
+        try:
+            with self.connection() as conn:
+                conn.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            with self.connection() as conn:
+                conn.send_message(msg)
+
+    @staticmethod
+    def _discard(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+class TokenBucket:
+    """Caps sends at ``rate`` per second with bursts of up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+
+    def delay(self) -> float:
+        """Take a token and return how long to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        wait = self.delay()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+@dataclass
+class BatchResult:
+    claimed: int = 0
+    sent: int = 0
+    failed: int = 0
+
+
+class OutboxSender:
+    """Claims due outbox rows in batches and sends them through ``transport``.
+
+    Database work and the blocking SMTP calls run on the sender's own small
+    thread pool, sized to the SMTP pool, so mail bursts never occupy the
+    event loop's default executor. Sends are spread by a token bucket;
+    failures are retried with exponential backoff by :func:`record_delivery`.
+    """
+
+    def __init__(
+        self,
+        transport: Transport = log_transport,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int | None = None,
+        rate_per_second: float | None = None,
+        max_attempts: int | None = None,
+        retry_backoff: float | None = None,
+        poll_interval: float | None = None,
+        workers: int | None = None,
+        lease_seconds: float = 300,
+    ):
+        self.transport = transport
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.email_batch_size
+        rate = settings.email_rate_per_second if rate_per_second is None else rate_per_second
+        self.workers = workers or settings.smtp_pool_size
+        self.bucket = TokenBucket(rate, burst=self.workers)
+        self.max_attempts = max_attempts or settings.email_max_attempts
+        self.retry_backoff = settings.email_retry_backoff if retry_backoff is None else retry_backoff
+        self.poll_interval = poll_interval or settings.email_poll_interval
+        self.lease_seconds = lease_seconds
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="email-outbox")
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+
+    def _with_session(self, fn, *args):
+        db = self.session_factory()
+        try:
+            return fn(db, *args)
+        finally:
+            db.close()
+
+    def _send(self, to_email: str, subject: str, body: str) -> None:
+        self.transport(build_message(to_email, subject, body))
+
+    async def run_once(self) -> BatchResult:
+        """Claim, send and record one batch."""
+        loop = asyncio.get_running_loop()
+        rows = await loop.run_in_executor(
+            self._executor, self._with_session, claim_due_emails, self.batch_size, self.lease_seconds
+        )
+        if not rows:
+            return BatchResult()
+
+        async def send(row):
+            await self.bucket.acquire()
+            await loop.run_in_executor(self._executor, self._send, row.to_email, row.subject, row.body)
+
+        outcomes = await asyncio.gather(*(send(row) for row in rows), return_exceptions=True)
+        sent_ids, failures = [], {}
+        for row, outcome in zip(rows, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning("Email %s to %s failed (attempt %s): %s", row.id, row.to_email, row.attempts, outcome)
+                failures[row.id] = (row.attempts, str(outcome) or type(outcome).__name__)
+            else:
+                sent_ids.append(row.id)
+        await loop.run_in_executor(
+            self._executor, self._with_session, record_delivery,
+            sent_ids, failures, self.max_attempts, self.retry_backoff,
+        )
+        return BatchResult(claimed=len(rows), sent=len(sent_ids), failed=len(failures))
+
+    async def drain(self) -> BatchResult:
+        """Send batches until nothing is due."""
+        total = BatchResult()
+        while True:
+            result = await self.run_once()
+            total.claimed += result.claimed
+            total.sent += result.sent
+            total.failed += result.failed
+            if result.claimed < self.batch_size:
+                return total
+
+    async def _run(self) -> None:
+        delay = self.poll_interval
+        while True:
+            try:
+                await self.drain()
+                delay = self.poll_interval
+            except Exception as exc:
+                # e.g. the database is unreachable; back off instead of spinning
+                logger.warning("Email outbox sender error: %s", exc)
+                delay = min(delay * 2, 300)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    def wake(self) -> None:
+        """Ask the sender to look for new mail now; safe to call from any thread."""
+        if self._loop is not None and self._wake is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = self._wake = None
+
+
+def transport_from_settings() -> Transport:
+    if not all([settings.smtp_host, settings.smtp_port, settings.smtp_user, settings.smtp_password]):
+        return log_transport
+    pool = SmtpConnectionPool(
+        settings.smtp_host,
+        settings.smtp_port,
+        settings.smtp_user,
+        settings.smtp_password.get_secret_value(),
+        use_ssl=settings.smtp_use_ssl,
+        size=settings.smtp_pool_size,
+    )
+    return pool.send
+
+
+@lru_cache
+def get_outbox_sender() -> OutboxSender:
+    return OutboxSender(transport_from_settings())
+
+
+def wake_outbox_sender() -> None:
+    """Nudge this worker's sender after queueing mail, without creating one."""
+    if get_outbox_sender.cache_info().currsize:
+        get_outbox_sender().wake()
+
+
+async def _main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    sender = get_outbox_sender()
+    sender.start()
+    await sender._task
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -1,6 +1,6 @@
 import os
 import shutil
-from typing import List, Set
+from typing import BinaryIO, Iterable, List, Set
 from pathlib import Path
 import magic
 import aiofiles
@@ -9,8 +9,12 @@ import logging
 from datetime import datetime
 import hashlib
 
+from .blob_store import CHUNK_SIZE
+
 logger = logging.getLogger(__name__)
 
+SNIFF_BYTES = 2048  # Enough for libmagic to recognise PDF, image and text headers
+
 class FileUploadService:
     # Allowed MIME types per format
     ALLOWED_MIME_TYPES = {
@@ -72,3 +76,54 @@ class FileUploadService:
 
         # Return relative path like: /uploads/2025-06-14/file.pdf
         return f"/{self.UPLOAD_DIR.name}/{date_dir}/{safe_name}"
+
+
+class UploadStream:
+    """Read-through wrapper that validates an upload while it is being copied.
+
+    Consumers (e.g. :meth:`BlobStore.put`) read it in fixed-size chunks. The
+    byte count is checked on every read, so an oversized file is rejected as
+    soon as the limit is crossed instead of after the whole body has been
+    buffered. The MIME type is sniffed from the first ``SNIFF_BYTES`` and
+    checked against ``allowed_formats`` before anything else is consumed;
+    an empty upload is rejected at that point.
+    """
+
+    def __init__(
+        self,
+        source: BinaryIO,
+        max_size: int,
+        allowed_formats: Iterable[str] = (),
+    ):
+        self.source = source
+        self.max_size = max_size
+        self.allowed_mimes: Set[str] = set()
+        for fmt in allowed_formats:
+            self.allowed_mimes |= FileUploadService.ALLOWED_MIME_TYPES.get(fmt, set())
+        self.size = 0
+        self.content_type: str | None = None
+        self._head = b""
+
+    def _sniff(self, size: int) -> None:
+        head = self.source.read(max(size, SNIFF_BYTES))
+        if not head:
+            raise HTTPException(status_code=400, detail="Empty file")
+        self.content_type = magic.from_buffer(head, mime=True)
+        if self.allowed_mimes and self.content_type not in self.allowed_mimes:
+            raise HTTPException(status_code=400, detail="Invalid file type")
+        self._head = head
+
+    def read(self, size: int = CHUNK_SIZE) -> bytes:
+        # Never hand out more than one chunk, even for read() / read(-1)
+        if size is None or size < 0:
+            size = CHUNK_SIZE
+        if self.content_type is None:
+            self._sniff(size)
+        if self._head:
+            chunk, self._head = self._head[:size], self._head[size:]
+        else:
+            chunk = self.source.read(size)
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise HTTPException(status_code=413, detail="File too large")
+        return chunk
@@ -0,0 +1,358 @@
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+from fastapi.concurrency import run_in_threadpool
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..crud.application import get_application_details
+from ..database import SessionLocal
+from ..models.application import Application
+from ..models.attachment import Attachment
+from ..models.call import Call
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+CHUNK_TEMPLATE = "applications_export.html"
+TOC_TEMPLATE = "applications_export_toc.html"
+Renderer = Callable[[str, dict, str], None]
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+@dataclass
+class ExportJob:
+    """State of one PDF export, persisted as JSON so every worker can read it."""
+    id: str
+    call_id: int
+    version: str
+    status: str = QUEUED
+    progress: float = 0.0
+    error: str | None = None
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+
+def render_applications_pdf(template: str, context: dict, out_path: str) -> None:
+    """Render ``template`` to ``out_path`` with wkhtmltopdf.
+
+    Runs inside a worker process, so it only receives plain data. Each
+    ``<h2>`` becomes an outline entry, which is how chunk page numbers are
+    recovered afterwards.
+    """
+    import pdfkit
+
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape(["html"]))
+    html = env.get_template(template).render(context)
+    pdfkit.from_string(html, out_path, options={"outline": None})
+
+
+def render_chunk(renderer: Renderer, context: dict, out_path: str) -> tuple[int, list[int]]:
+    """Render one chunk and return its page count and each application's first page."""
+    from pypdf import PdfReader
+
+    renderer(CHUNK_TEMPLATE, context, out_path)
+    reader = PdfReader(out_path)
+    starts = [reader.get_destination_page_number(item) for item in reader.outline if not isinstance(item, list)]
+    if len(starts) != len(context["applications"]):
+        # No usable outline: point every entry at the start of its chunk
+        starts = [0] * len(context["applications"])
+    return len(reader.pages), starts
+
+
+def render_toc(renderer: Renderer, context: dict, out_path: str) -> int:
+    """Render the table of contents and return its page count."""
+    from pypdf import PdfReader
+
+    renderer(TOC_TEMPLATE, context, out_path)
+    return len(PdfReader(out_path).pages)
+
+
+def merge_export(toc_path: str, part_paths: list[str], entries: list[dict], out_path: str) -> None:
+    """Concatenate the TOC and chunk PDFs and add one bookmark per application."""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    writer.append(toc_path, import_outline=False)
+    for part in part_paths:
+        writer.append(part, import_outline=False)
+    for entry in entries:
+        writer.add_outline_item(entry["title"], entry["page"] - 1)
+    with open(out_path, "wb") as f:
+        writer.write(f)
+
+
+def export_version(db: Session, call_id: int) -> str | None:
+    """Fingerprint of everything that ends up in a call's export.
+
+    Combines the latest ``updated_at`` of the call, its applications and
+    their attachments with the row counts, so edits, uploads and deletions
+    all produce a new version. Returns None when the call does not exist.
+    """
+    apps = select(func.max(Application.updated_at), func.count(Application.id)).where(
+        Application.call_id == call_id
+    )
+    atts = (
+        select(func.max(Attachment.updated_at), func.count(Attachment.id))
+        .join(Application, Application.id == Attachment.application_id)
+        .where(Application.call_id == call_id)
+    )
+    call_updated = db.scalar(select(Call.updated_at).where(Call.id == call_id))
+    if call_updated is None:
+        return None
+    app_updated, app_count = db.execute(apps).one()
+    att_updated, att_count = db.execute(atts).one()
+    stamps = [str(ts) for ts in (call_updated, app_updated, att_updated)]
+    return "|".join([*stamps, str(app_count), str(att_count)])
+
+
+def export_application_ids(db: Session, call_id: int) -> list[int]:
+    return list(db.scalars(select(Application.id).where(Application.call_id == call_id).order_by(Application.id)))
+
+
+def load_export_context(db: Session, call_id: int, application_ids: list[int] | None = None) -> dict:
+    """Collect the template data for a call as plain, picklable values."""
+    call = db.get(Call, call_id)
+    if application_ids is None:
+        application_ids = export_application_ids(db, call_id)
+    applications = get_application_details(db, application_ids)
+    return {
+        "call": {"id": call.id, "title": call.title},
+        "applications": [
+            {
+                "id": app.id,
+                "user_id": app.user_id,
+                "content": app.content,
+                "attachments": [{"file_name": att.file_name} for att in app.attachments],
+            }
+            for app in applications
+        ],
+    }
+
+
+class PdfExportService:
+    """Queue PDF exports, render them off the request path and cache the result.
+
+    Jobs are identified by the call and its :func:`export_version`, so
+    exporting an unchanged call again returns the finished artifact at once.
+    Rendering runs in a bounded process pool; the request and event loop
+    only wait on it.
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike,
+        executor_factory: Callable[[], Executor] | None = None,
+        renderer: Renderer = render_applications_pdf,
+        session_factory: Callable[[], Session] = SessionLocal,
+        stale_after: float = 3600,
+        chunk_size: int | None = None,
+        max_in_flight: int | None = None,
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.renderer = renderer
+        self.chunk_size = chunk_size or settings.export_chunk_size
+        # Chunks loaded and queued at once; bounds memory in this process
+        self.max_in_flight = max_in_flight or settings.export_workers * 2
+        self.session_factory = session_factory
+        self.stale_after = stale_after
+        self._executor_factory = executor_factory or self._default_executor
+        self._executor: Executor | None = None
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _default_executor() -> Executor:
+        # spawn: forking a process that runs threads (the server) is unsafe
+        return ProcessPoolExecutor(
+            max_workers=settings.export_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._executor_factory()
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def artifact_path(self, job: ExportJob) -> Path:
+        return self.root / f"call_{job.call_id}_{job.id}.pdf"
+
+    def _job_path(self, job_id: str) -> Path:
+        return self.root / f"{job_id}.json"
+
+    def load(self, job_id: str) -> ExportJob | None:
+        if not job_id.isalnum():
+            return None
+        try:
+            return ExportJob(**json.loads(self._job_path(job_id).read_text()))
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            return None
+
+    def _save(self, job: ExportJob, **changes) -> None:
+        for name, value in changes.items():
+            setattr(job, name, value)
+        job.updated_at = time.time()
+        tmp = self._job_path(job.id).with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(asdict(job)))
+        os.replace(tmp, self._job_path(job.id))
+
+    def _reusable(self, job: ExportJob | None) -> bool:
+        if job is None:
+            return False
+        if job.status == DONE:
+            return self.artifact_path(job).exists()
+        if job.status == FAILED:
+            return False
+        return time.time() - job.updated_at < self.stale_after
+
+    def _version(self, call_id: int) -> str | None:
+        return self._with_session(export_version, call_id)
+
+    def _with_session(self, fn, *args):
+        db = self.session_factory()
+        try:
+            return fn(db, *args)
+        finally:
+            db.close()
+
+    async def enqueue(self, call_id: int) -> ExportJob | None:
+        """Return the export job for the call's current state, starting it if needed."""
+        version = await run_in_threadpool(self._version, call_id)
+        if version is None:
+            return None
+        job_id = hashlib.sha256(f"{call_id}:{version}".encode()).hexdigest()[:32]
+        job = self.load(job_id)
+        if job_id in self._tasks or self._reusable(job):
+            return job
+
+        job = ExportJob(id=job_id, call_id=call_id, version=version)
+        self._save(job)
+        self._tasks[job.id] = asyncio.create_task(self._run(job))
+        return job
+
+    async def _run(self, job: ExportJob) -> None:
+        try:
+            self._save(job, status=RUNNING, progress=0.02)
+            await self.render(job)
+            self._save(job, status=DONE, progress=1.0)
+            self._prune(job)
+        except Exception:
+            logger.exception("PDF export %s for call %s failed", job.id, job.call_id)
+            self._save(job, status=FAILED, error="Failed to generate PDF")
+        finally:
+            self._tasks.pop(job.id, None)
+
+    async def render(self, job: ExportJob) -> None:
+        """Render the call in chunks on the pool, then merge them behind a TOC.
+
+        Only ``max_in_flight`` chunks are loaded from the database and queued
+        at a time, so memory in both this process and the workers is bounded
+        by the chunk size rather than by the size of the call.
+        """
+        loop = asyncio.get_running_loop()
+        ids = await run_in_threadpool(self._with_session, export_application_ids, job.call_id)
+        chunks = [ids[i:i + self.chunk_size] for i in range(0, len(ids), self.chunk_size)] or [[]]
+        workdir = self.root / f"{job.id}.parts"
+        workdir.mkdir(exist_ok=True)
+        target = self.artifact_path(job)
+        tmp = target.with_suffix(".pdf.tmp")
+        gate = asyncio.Semaphore(self.max_in_flight)
+        finished = 0
+
+        async def render_one(index: int, chunk_ids: list[int]):
+            nonlocal finished
+            async with gate:
+                context = await run_in_threadpool(self._with_session, load_export_context, job.call_id, chunk_ids)
+                path = str(workdir / f"{index:05d}.pdf")
+                pages, starts = await loop.run_in_executor(
+                    self.executor, render_chunk, self.renderer, context, path
+                )
+            finished += 1
+            self._save(job, progress=round(0.05 + 0.85 * finished / len(chunks), 3))
+            return path, pages, starts, context["call"], [
+                (app["id"], app["user_id"]) for app in context["applications"]
+            ]
+
+        try:
+            results = await asyncio.gather(*(render_one(i, c) for i, c in enumerate(chunks)))
+            call = results[0][3]
+
+            # Page numbers depend on the TOC length; re-render until it is stable
+            toc_path = str(workdir / "toc.pdf")
+            toc_pages = 1
+            for _ in range(3):
+                entries = self._toc_entries(results, toc_pages)
+                rendered = await loop.run_in_executor(
+                    self.executor, render_toc, self.renderer, {"call": call, "entries": entries}, toc_path
+                )
+                if rendered == toc_pages:
+                    break
+                toc_pages = rendered
+
+            await loop.run_in_executor(
+                self.executor, merge_export, toc_path, [r[0] for r in results], entries, str(tmp)
+            )
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    @staticmethod
+    def _toc_entries(results, toc_pages: int) -> list[dict]:
+        entries, offset = [], toc_pages
+        for _, pages, starts, _, apps in results:
+            for (app_id, user_id), start in zip(apps, starts):
+                entries.append({
+                    "id": app_id,
+                    "user_id": user_id,
+                    "title": f"Application #{app_id}",
+                    "page": offset + start + 1,
+                })
+            offset += pages
+        return entries
+
+    def _prune(self, job: ExportJob) -> None:
+        """Drop artifacts of older versions of the same call."""
+        for old in self.root.glob(f"call_{job.call_id}_*.pdf"):
+            if old != self.artifact_path(job):
+                old.unlink(missing_ok=True)
+                self._job_path(old.stem.rsplit("_", 1)[-1]).unlink(missing_ok=True)
+
+    async def wait(self, job: ExportJob, interval: float = 0.5):
+        """Yield the job's state whenever it changes until it finishes."""
+        last = None
+        while True:
+            current = self.load(job.id) or job
+            snapshot = (current.status, current.progress)
+            if snapshot != last:
+                last = snapshot
+                yield current
+            if current.finished:
+                return
+            await asyncio.sleep(interval)
+
+
+@lru_cache
+def get_pdf_export_service() -> PdfExportService:
+    return PdfExportService(settings.export_dir)
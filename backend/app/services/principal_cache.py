@@ -0,0 +1,124 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from ..config import settings
+from ..models.user import User, UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of an authenticated user.
+
+    Carries the fields of ``UserOut`` so it can be returned from ``/users/me``
+    and checked for roles without touching a database session.
+    """
+    id: int
+    email: str
+    role: UserRole
+    first_name: str | None
+    last_name: str | None
+    organization: str | None
+    is_active: bool
+    is_verified: bool
+    last_login: datetime | None
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            organization=user.organization,
+            is_active=user.is_active,
+            is_verified=user.is_verified,
+            last_login=user.last_login,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class PrincipalCache:
+    """Bounded TTL/LRU cache of principals keyed by user id and token hash.
+
+    A hit skips both JWT decoding and the user lookup. Entries never outlive
+    the token's ``exp`` claim. The cache is per process, so ``ttl`` also
+    bounds how long another worker may serve a principal after a change.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # token digest -> (user id, principal, monotonic expiry)
+        self._entries: OrderedDict[bytes, tuple[int, Principal, float]] = OrderedDict()
+        self._by_user: dict[int, set[bytes]] = {}
+
+    def get(self, token: str) -> Principal | None:
+        key = token_digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user_id, principal, expires = entry
+            if expires <= self._clock():
+                self._remove(key, user_id)
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def put(self, token: str, principal: Principal, token_exp: float | None = None) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        lifetime = self.ttl
+        if token_exp is not None:
+            lifetime = min(lifetime, token_exp - time.time())
+        if lifetime <= 0:
+            return
+        key = token_digest(token)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._by_user.get(old[0], set()).discard(key)
+            self._entries[key] = (principal.id, principal, self._clock() + lifetime)
+            self._by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                oldest, (user_id, _, _) = next(iter(self._entries.items()))
+                self._remove(oldest, user_id)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop every cached principal of ``user_id``."""
+        with self._lock:
+            for key in self._by_user.pop(user_id, ()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: bytes, user_id: int) -> None:
+        self._entries.pop(key, None)
+        keys = self._by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_id]
+
+
+principal_cache = PrincipalCache(settings.principal_cache_size, settings.principal_cache_ttl)
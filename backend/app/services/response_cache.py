@@ -0,0 +1,266 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Awaitable, Callable, Iterable
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from ..config import settings
+from ..utils.conditional import Validators
+
+logger = logging.getLogger(__name__)
+
+# Lua keeps the generation read and the entry read in one round trip
+LOOKUP_LUA = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+return {generation, redis.call('GET', ARGV[1] .. ':' .. generation .. ':' .. ARGV[2])}
+"""
+
+
+@dataclass
+class CachedResponse:
+    """A pre-serialized JSON response and the wall-clock time it expires at."""
+    body: bytes
+    expires_at: float
+    headers: dict[str, str] = field(default_factory=dict)
+    status_code: int = 200
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at <= time.time()
+
+    def to_response(self, cache_status: str) -> Response:
+        headers = {**self.headers, "X-Cache": cache_status}
+        return Response(self.body, status_code=self.status_code, headers=headers, media_type="application/json")
+
+    def encode(self) -> bytes:
+        meta = {"expires_at": self.expires_at, "headers": self.headers, "status_code": self.status_code}
+        return json.dumps(meta).encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "CachedResponse":
+        meta, _, body = raw.partition(b"\n")
+        return cls(body=body, **json.loads(meta))
+
+
+class ResponseCache:
+    """In-process LRU of serialized responses.
+
+    :meth:`invalidate` drops everything and bumps a generation counter. A
+    response computed while an invalidation happened carries the old
+    generation and is not stored, so it cannot bring stale data back.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.generation = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[CachedResponse | None, int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expired:
+                del self._entries[key]
+                entry = None
+            elif entry is not None:
+                self._entries.move_to_end(key)
+            return entry, self.generation
+
+    def put(self, key: str, generation: int, entry: CachedResponse) -> None:
+        if self.maxsize <= 0 or entry.expired:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    async def lookup(self, key: str) -> tuple[CachedResponse | None, int]:
+        return self.get(key)
+
+    async def store(self, key: str, generation: int, entry: CachedResponse) -> None:
+        self.put(key, generation, entry)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    async def invalidate_async(self) -> None:
+        self.invalidate()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisResponseCache:
+    """Response cache shared by every worker through Redis.
+
+    Entries live under ``{prefix}:{generation}:{key}`` with a Redis TTL, and
+    invalidation is a single ``INCR`` of the generation, so old entries are
+    simply never read again and expire on their own. Reads and async writers
+    use the async client; sync CRUD code invalidates through a sync one.
+    While Redis is unreachable the local ``fallback`` cache is used.
+    """
+
+    def __init__(self, redis, sync_redis, fallback: ResponseCache, prefix: str = "rc", retry_after: float = 5.0):
+        self.redis = redis
+        self.sync_redis = sync_redis
+        self.fallback = fallback
+        self.prefix = prefix
+        self.generation_key = f"{prefix}:generation"
+        self.retry_after = retry_after
+        self._lookup = redis.register_script(LOOKUP_LUA)
+        self._down_until = 0.0
+
+    async def lookup(self, key: str) -> tuple[CachedResponse | None, int]:
+        from redis.exceptions import RedisError
+
+        if time.monotonic() < self._down_until:
+            return self.fallback.get(key)
+        try:
+            generation, raw = await self._lookup(keys=[self.generation_key], args=[self.prefix, key])
+        except (RedisError, OSError) as exc:
+            self._mark_down(exc)
+            return self.fallback.get(key)
+        entry = CachedResponse.decode(raw) if raw else None
+        return (None if entry is not None and entry.expired else entry), int(generation)
+
+    async def store(self, key: str, generation: int, entry: CachedResponse) -> None:
+        from redis.exceptions import RedisError
+
+        ttl_ms = int((entry.expires_at - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        if time.monotonic() < self._down_until:
+            self.fallback.put(key, generation, entry)
+            return
+        try:
+            await self.redis.set(f"{self.prefix}:{generation}:{key}", entry.encode(), px=ttl_ms)
+        except (RedisError, OSError) as exc:
+            self._mark_down(exc)
+
+    def invalidate(self) -> None:
+        """Invalidate from sync code; async code must use :meth:`invalidate_async`."""
+        from redis.exceptions import RedisError
+
+        self.fallback.invalidate()
+        if time.monotonic() < self._down_until:
+            return
+        try:
+            self.sync_redis.incr(self.generation_key)
+        except (RedisError, OSError) as exc:
+            # Entries already in Redis still expire after their TTL
+            logger.warning("Could not invalidate the shared response cache: %s", exc)
+            self._mark_down(exc)
+
+    async def invalidate_async(self) -> None:
+        """Like :meth:`invalidate`, without blocking the event loop on Redis."""
+        from redis.exceptions import RedisError
+
+        self.fallback.invalidate()
+        if time.monotonic() < self._down_until:
+            return
+        try:
+            await self.redis.incr(self.generation_key)
+        except (RedisError, OSError) as exc:
+            logger.warning("Could not invalidate the shared response cache: %s", exc)
+            self._mark_down(exc)
+
+    def _mark_down(self, exc: Exception) -> None:
+        if time.monotonic() >= self._down_until:
+            logger.warning("Redis response cache unavailable, using the local cache: %s", exc)
+        self._down_until = time.monotonic() + self.retry_after
+
+
+def seconds_until_next_boundary(bounds: Iterable[tuple[datetime | None, datetime | None]], now: datetime) -> float | None:
+    """Seconds until the earliest future ``start_date``/``end_date`` flip.
+
+    ``Call.is_active`` turns true at ``start_date`` and false just after
+    ``end_date``, so cached copies must not outlive either moment.
+    """
+    soonest = None
+    for start, end in bounds:
+        for moment in (start, end + timedelta(milliseconds=1) if end else None):
+            if moment is None:
+                continue
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=timezone.utc)
+            if moment > now:
+                delta = (moment - now).total_seconds()
+                soonest = delta if soonest is None else min(soonest, delta)
+    return soonest
+
+
+async def cached_json_response(
+    cache: ResponseCache | RedisResponseCache,
+    request: Request,
+    build: Callable[[], Awaitable[tuple[bytes, float, dict[str, str]]]],
+) -> Response:
+    """Serve ``request`` from ``cache`` or build, store and return it.
+
+    ``build`` returns the serialized body, how long it may be cached and any
+    headers to replay on hits. The key is the full URL, so every route and
+    query string gets its own entry. Responses carry an ETag of the body
+    (``is_active`` changes without ``updated_at``), and a matching
+    ``If-None-Match`` is answered with 304.
+    """
+    key = str(request.url)
+    entry, generation = await cache.lookup(key)
+    cache_status = "HIT"
+    if entry is None:
+        body, ttl, headers = await build()
+        validators = Validators.from_body(body, cache_control="no-cache")
+        entry = CachedResponse(body=body, expires_at=time.time() + ttl, headers={**headers, **validators.headers})
+        if ttl > 0:
+            await cache.store(key, generation, entry)
+        cache_status = "MISS"
+    validators = Validators(etag=entry.headers["ETag"], cache_control="no-cache")
+    if validators.matches(request):
+        return validators.not_modified()
+    return entry.to_response(cache_status)
+
+
+def _build_cache(prefix: str) -> ResponseCache | RedisResponseCache:
+    local = ResponseCache(settings.response_cache_size)
+    if not settings.redis_url:
+        return local
+
+    from redis import Redis
+    from redis.asyncio import Redis as AsyncRedis
+
+    options = {
+        "socket_timeout": settings.rate_limit_redis_timeout,
+        "socket_connect_timeout": settings.rate_limit_redis_timeout,
+    }
+    return RedisResponseCache(
+        AsyncRedis.from_url(settings.redis_url, **options),
+        Redis.from_url(settings.redis_url, **options),
+        local,
+        prefix=prefix,
+    )
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache | RedisResponseCache:
+    """Cache for the public call endpoints; shared through Redis when configured."""
+    return _build_cache("rc")
+
+
+@lru_cache
+def get_rankings_cache() -> ResponseCache | RedisResponseCache:
+    """Cache for call rankings, cleared on every review or assignment write.
+
+    It is kept apart from :func:`get_response_cache` so that a submitted
+    review does not also throw away the cached call listings.
+    """
+    return _build_cache("rankings")
@@ -0,0 +1,144 @@
+import heapq
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.application import Application, ApplicationStatus
+from ..models.application_reviewer import ApplicationReviewer
+from ..models.call_reviewer import CallReviewer
+from ..models.user import User
+from .response_cache import get_rankings_cache
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """An application or a reviewer, with what conflict checks need."""
+    id: int
+    user_id: int
+    organization: str | None = None
+
+    @property
+    def org_key(self) -> str | None:
+        org = (self.organization or "").strip().casefold()
+        return org or None
+
+
+@dataclass
+class AssignmentPlan:
+    assignments: list[tuple[int, int]] = field(default_factory=list)  # (application_id, reviewer_id)
+    shortfalls: dict[int, int] = field(default_factory=dict)  # application_id -> reviewers still missing
+    loads: dict[int, int] = field(default_factory=dict)  # reviewer_id -> assignments in the call afterwards
+
+
+def conflicts(application: Candidate, reviewer: Candidate) -> bool:
+    """A reviewer may not review their own application or one from their organization."""
+    if reviewer.user_id == application.user_id:
+        return True
+    return application.org_key is not None and application.org_key == reviewer.org_key
+
+
+def plan_assignments(
+    applications: list[Candidate],
+    reviewers: list[Candidate],
+    existing: dict[int, set[int]],
+    per_application: int,
+) -> AssignmentPlan:
+    """Give every application ``per_application`` reviewers, spreading the load.
+
+    Reviewers sit in a min-heap keyed by how many applications of the call
+    they already have, so each pick goes to the least loaded eligible
+    reviewer and loads end up as even as conflicts and existing rows allow.
+    Existing assignments count towards both the application's quota and
+    the reviewer's load. Applications with the fewest eligible reviewers
+    are served first so the scarce reviewers are not used up elsewhere.
+    Ties are broken by id, so the same input always gives the same plan.
+    """
+    loads = Counter({r.id: 0 for r in reviewers})
+    for assigned in existing.values():
+        loads.update(r for r in assigned if r in loads)
+    heap = [(loads[r.id], r.id, r) for r in reviewers]
+    heapq.heapify(heap)
+
+    eligible = {
+        a.id: sum(1 for r in reviewers if r.id not in existing.get(a.id, ()) and not conflicts(a, r))
+        for a in applications
+    }
+    plan = AssignmentPlan()
+    for application in sorted(applications, key=lambda a: (eligible[a.id], a.id)):
+        assigned = existing.get(application.id, set())
+        need = per_application - len(assigned)
+        picked, skipped = [], []
+        while need > 0 and heap:
+            load, reviewer_id, reviewer = heapq.heappop(heap)
+            if reviewer_id in assigned or conflicts(application, reviewer):
+                skipped.append((load, reviewer_id, reviewer))
+                continue
+            picked.append((load + 1, reviewer_id, reviewer))
+            plan.assignments.append((application.id, reviewer_id))
+            need -= 1
+        for item in picked + skipped:
+            heapq.heappush(heap, item)
+        for load, reviewer_id, _ in picked:
+            loads[reviewer_id] = load
+        if need > 0:
+            plan.shortfalls[application.id] = need
+    plan.assignments.sort()
+    plan.loads = dict(sorted(loads.items()))
+    return plan
+
+
+def load_call_candidates(db: Session, call_id: int) -> tuple[list[Candidate], list[Candidate], dict[int, set[int]]]:
+    """Applications, the reviewer pool and current assignments of a call in three queries."""
+    applications = [
+        Candidate(id=row.id, user_id=row.user_id, organization=row.organization)
+        for row in db.execute(
+            select(Application.id, Application.user_id, User.organization)
+            .join(User, User.id == Application.user_id)
+            .where(Application.call_id == call_id, Application.status != ApplicationStatus.CANCELLED)
+            .order_by(Application.id)
+        )
+    ]
+    reviewers = [
+        Candidate(id=row.id, user_id=row.id, organization=row.organization)
+        for row in db.execute(
+            select(User.id, User.organization)
+            .join(CallReviewer, CallReviewer.reviewer_id == User.id)
+            .where(CallReviewer.call_id == call_id)
+            .order_by(User.id)
+        )
+    ]
+    existing: dict[int, set[int]] = defaultdict(set)
+    for application_id, reviewer_id in db.execute(
+        select(ApplicationReviewer.application_id, ApplicationReviewer.user_id)
+        .join(Application, Application.id == ApplicationReviewer.application_id)
+        .where(Application.call_id == call_id)
+    ):
+        existing[application_id].add(reviewer_id)
+    return applications, reviewers, existing
+
+
+def assign_call_reviewers(db: Session, call_id: int, per_application: int, dry_run: bool = False) -> AssignmentPlan:
+    """Plan reviewer assignments for a whole call and, unless ``dry_run``, store them.
+
+    All new rows are inserted in one transaction. If another admin assigned
+    reviewers in the meantime the unique index rejects the batch, nothing
+    is written and a ValueError asks for a retry.
+    """
+    applications, reviewers, existing = load_call_candidates(db, call_id)
+    plan = plan_assignments(applications, reviewers, existing, per_application)
+    if dry_run or not plan.assignments:
+        return plan
+    try:
+        db.execute(
+            insert(ApplicationReviewer),
+            [{"application_id": a, "user_id": r} for a, r in plan.assignments],
+        )
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("Assignments changed while planning; please retry")
+    get_rankings_cache().invalidate()
+    return plan
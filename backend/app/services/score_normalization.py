@@ -0,0 +1,187 @@
+from dataclasses import dataclass
+from itertools import chain
+from typing import Literal
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models.application import Application, ApplicationStatus
+from ..models.review import Review
+from ..utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page, decode_cursor, encode_cursor
+
+NormalizationMethod = Literal["zscore", "calibration"]
+
+
+@dataclass
+class ScoreMatrix:
+    """A call's reviews as a sparse application × reviewer matrix.
+
+    Every review is one entry of the three parallel arrays ``app_index``,
+    ``reviewer_index`` and ``scores``; the indexes point into the sorted
+    ``application_ids`` and ``reviewer_ids``.
+    """
+    application_ids: np.ndarray  # int64
+    reviewer_ids: np.ndarray  # int64
+    app_index: np.ndarray  # int32
+    reviewer_index: np.ndarray  # int32
+    scores: np.ndarray  # float32
+
+    @classmethod
+    def from_triples(cls, application_ids, reviewer_ids, scores) -> "ScoreMatrix":
+        apps, app_index = np.unique(np.asarray(application_ids, dtype=np.int64), return_inverse=True)
+        reviewers, reviewer_index = np.unique(np.asarray(reviewer_ids, dtype=np.int64), return_inverse=True)
+        return cls(
+            application_ids=apps,
+            reviewer_ids=reviewers,
+            app_index=app_index.astype(np.int32),
+            reviewer_index=reviewer_index.astype(np.int32),
+            scores=np.asarray(scores, dtype=np.float32),
+        )
+
+    @classmethod
+    def from_rows(cls, rows) -> "ScoreMatrix":
+        """Build the matrix from ``(application_id, reviewer_id, score)`` rows."""
+        # fromiter over the flattened rows skips the temporary object array np.array builds
+        data = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=3 * len(rows)).reshape(-1, 3)
+        return cls.from_triples(data[:, 0], data[:, 1], data[:, 2])
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.application_ids), len(self.reviewer_ids)
+
+    def per_application(self, values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.app_index, weights=values, minlength=self.shape[0])
+
+    def per_reviewer(self, values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.reviewer_index, weights=values, minlength=self.shape[1])
+
+
+def zscore_scores(matrix: ScoreMatrix, min_reviews: int = 2) -> np.ndarray:
+    """Each review's score with its reviewer's leniency and spread removed.
+
+    Scores become z-scores against the reviewer's own mean and standard
+    deviation and are mapped back onto the call-wide mean and standard
+    deviation, so results stay on the 0-100 scale. Reviewers with fewer than
+    ``min_reviews`` reviews, or who gave every application the same score,
+    are standardized against the whole call instead.
+    """
+    scores = matrix.scores.astype(np.float64)
+    if scores.size == 0 or scores.std() == 0:
+        return scores
+    mean, std = scores.mean(), scores.std()
+    counts = matrix.per_reviewer(np.ones_like(scores))
+    reviewer_mean = matrix.per_reviewer(scores) / counts
+    reviewer_std = np.sqrt(np.maximum(matrix.per_reviewer(scores * scores) / counts - reviewer_mean ** 2, 0))
+    fallback = (counts < min_reviews) | (reviewer_std < 1e-9)
+    reviewer_mean = np.where(fallback, mean, reviewer_mean)
+    reviewer_std = np.where(fallback, std, reviewer_std)
+    r = matrix.reviewer_index
+    return mean + (scores - reviewer_mean[r]) / reviewer_std[r] * std
+
+
+def calibrated_scores(
+    matrix: ScoreMatrix, prior: float = 5.0, iterations: int = 50, tolerance: float = 1e-6
+) -> np.ndarray:
+    """Each review's score minus its reviewer's estimated offset.
+
+    Fits ``score = quality[application] + bias[reviewer]`` by alternating
+    least squares. Each bias is shrunk towards zero as if the reviewer had
+    ``prior`` extra reviews without bias, so reviewers with only a few
+    reviews are barely corrected. Unlike z-scores this keeps each
+    reviewer's spread and only removes leniency or harshness.
+    """
+    scores = matrix.scores.astype(np.float64)
+    a, r = matrix.app_index, matrix.reviewer_index
+    app_counts = matrix.per_application(np.ones_like(scores))
+    reviewer_counts = matrix.per_reviewer(np.ones_like(scores))
+    bias = np.zeros(matrix.shape[1])
+    for _ in range(iterations):
+        quality = matrix.per_application(scores - bias[r]) / app_counts
+        updated = matrix.per_reviewer(scores - quality[a]) / (reviewer_counts + prior)
+        converged = updated.size == 0 or np.abs(updated - bias).max() < tolerance
+        bias = updated
+        if converged:
+            break
+    return scores - bias[r]
+
+
+NORMALIZERS = {"zscore": zscore_scores, "calibration": calibrated_scores}
+
+
+def competition_rank(values: np.ndarray, decimals: int = 6) -> np.ndarray:
+    """SQL ``rank()`` over ``values``, highest first: ties share the smaller rank."""
+    keys = -np.round(values, decimals)
+    return np.searchsorted(np.sort(keys), keys, side="left") + 1
+
+
+@dataclass
+class NormalizedRanking:
+    """Applications ordered by normalized rank, as parallel arrays."""
+    application_ids: np.ndarray
+    rank: np.ndarray
+    normalized_score: np.ndarray
+    raw_rank: np.ndarray
+    mean_score: np.ndarray
+    review_count: np.ndarray
+
+    def page(self, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE) -> Page[dict]:
+        """One keyset page ordered by ``(rank, application_id)``, like the raw rankings."""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        start = 0
+        if cursor:
+            last_rank, last_id = decode_cursor(cursor)
+            after = (self.rank > last_rank) | ((self.rank == last_rank) & (self.application_ids > last_id))
+            start = int(np.argmax(after)) if after.any() else len(self.rank)
+        end = min(start + limit, len(self.rank))
+        items = [
+            {
+                "rank": int(self.rank[i]),
+                "application_id": int(self.application_ids[i]),
+                "normalized_score": round(float(self.normalized_score[i]), 2),
+                "raw_rank": int(self.raw_rank[i]),
+                "mean_score": float(self.mean_score[i]),
+                "review_count": int(self.review_count[i]),
+            }
+            for i in range(start, end)
+        ]
+        next_cursor = None
+        if end < len(self.rank):
+            next_cursor = encode_cursor(int(self.rank[end - 1]), int(self.application_ids[end - 1]))
+        return Page(items=items, next_cursor=next_cursor)
+
+
+def normalize_rankings(matrix: ScoreMatrix, method: NormalizationMethod = "zscore") -> NormalizedRanking:
+    """Rank applications by the mean of their reviewer-normalized scores."""
+    adjusted = NORMALIZERS[method](matrix)
+    counts = matrix.per_application(np.ones(len(matrix.scores)))
+    normalized = matrix.per_application(adjusted) / counts
+    raw = matrix.per_application(matrix.scores.astype(np.float64)) / counts
+    rank, raw_rank = competition_rank(normalized), competition_rank(raw)
+    order = np.lexsort((matrix.application_ids, rank))
+    return NormalizedRanking(
+        application_ids=matrix.application_ids[order],
+        rank=rank[order],
+        normalized_score=normalized[order],
+        raw_rank=raw_rank[order],
+        mean_score=raw[order],
+        review_count=counts[order].astype(np.int64),
+    )
+
+
+def score_matrix_statement(call_id: int):
+    return (
+        select(Review.application_id, Review.reviewer_id, Review.score)
+        .join(Application, Application.id == Review.application_id)
+        .where(Application.call_id == call_id, Application.status != ApplicationStatus.CANCELLED)
+    )
+
+
+def load_score_matrix(db: Session, call_id: int) -> ScoreMatrix:
+    """Every review of the call in one query, straight into arrays; no ORM objects."""
+    return ScoreMatrix.from_rows(db.execute(score_matrix_statement(call_id)).all())
+
+
+async def load_score_matrix_async(db: AsyncSession, call_id: int) -> ScoreMatrix:
+    return ScoreMatrix.from_rows((await db.execute(score_matrix_statement(call_id))).all())
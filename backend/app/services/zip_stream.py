@@ -0,0 +1,110 @@
+import logging
+import posixpath
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from .blob_store import BlobStore, CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Formats that are already compressed; deflating them again only costs CPU
+STORED_EXTENSIONS = {"pdf", "png", "jpg", "jpeg", "gif", "webp", "zip", "gz", "docx", "xlsx", "pptx"}
+STORED_CONTENT_TYPES = ("application/pdf", "image/", "application/zip")
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    """One attachment to put in an archive, detached from the ORM session."""
+    folder: str
+    file_name: str
+    storage_key: str
+    size: int
+    content_type: str | None = None
+    modified: tuple[int, int, int, int, int, int] | None = None
+
+
+class _StreamSink:
+    """Write-only, non-seekable file object that collects what zipfile writes.
+
+    ``zipfile`` notices that it cannot seek and writes a data descriptor after
+    each member instead of patching the local header, so the archive can be
+    sent as it is produced.
+    """
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._offset = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def compression_for(entry: ArchiveEntry) -> int:
+    ext = entry.file_name.rsplit(".", 1)[-1].lower() if "." in entry.file_name else ""
+    if ext in STORED_EXTENSIONS or (entry.content_type or "").startswith(STORED_CONTENT_TYPES):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _safe_name(name: str) -> str:
+    # Uploaded names are user input; keep them from escaping their folder
+    name = posixpath.basename(name.replace("\\", "/")).strip() or "file"
+    return "_" + name if name in (".", "..") else name
+
+
+def _unique(name: str, taken: set[str]) -> str:
+    candidate, n = name, 1
+    stem, dot, ext = name.rpartition(".")
+    while candidate in taken:
+        candidate = f"{stem} ({n}).{ext}" if dot and stem else f"{name} ({n})"
+        n += 1
+    taken.add(candidate)
+    return candidate
+
+
+def stream_zip(entries: Iterable[ArchiveEntry], store: BlobStore, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a ZIP archive of ``entries`` chunk by chunk.
+
+    Blobs are copied from the store ``chunk_size`` bytes at a time and each
+    piece of the archive is yielded as soon as zipfile has written it, so
+    memory stays at roughly one chunk whatever the archive size. Blobs that
+    are missing from the store are skipped.
+    """
+    sink = _StreamSink()
+    taken: set[str] = set()
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as archive:
+        for entry in entries:
+            if not store.exists(entry.storage_key):
+                logger.warning("Skipping missing blob %s in archive", entry.storage_key)
+                continue
+            name = _unique(posixpath.join(entry.folder, _safe_name(entry.file_name)), taken)
+            info = zipfile.ZipInfo(name, date_time=entry.modified or time.localtime()[:6])
+            info.compress_type = compression_for(entry)
+            # Known size up front lets zipfile decide on ZIP64 before writing
+            info.file_size = entry.size
+            with archive.open(info, mode="w") as member:
+                for chunk in store.iter_chunks(entry.storage_key, chunk_size):
+                    member.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            if data := sink.drain():
+                yield data
+    if data := sink.drain():
+        yield data
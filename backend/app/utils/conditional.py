@@ -0,0 +1,85 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable
+
+from fastapi import Request, Response
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they are stored in UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _etag_values(header: str) -> list[str]:
+    return [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+
+@dataclass(frozen=True)
+class Validators:
+    """``ETag`` and ``Last-Modified`` for one representation of a resource.
+
+    Built from a version tuple, typically ``(id, updated_at)`` of every row
+    that ends up in the response, which a small query can fetch before the
+    full object graph is loaded. The ETag is weak because the same data may
+    be sent with or without gzip.
+    """
+    etag: str
+    last_modified: datetime | None = None
+    # Clients may keep a copy but must revalidate it before every use
+    cache_control: str = "private, no-cache"
+
+    @classmethod
+    def from_version(cls, version: Iterable[Any], aggregate: bool = False, **kwargs) -> "Validators":
+        """Validators for ``version``; pass ``aggregate=True`` if it has counts over child rows.
+
+        The newest ``updated_at`` of a set of child rows does not move
+        forward when an older row is added (an assignment of a reviewer last
+        updated long ago) and moves back when the newest one is deleted. Such
+        versions therefore only get an ETag, and ``If-Modified-Since`` is
+        not honoured for them.
+        """
+        version = tuple(version)
+        digest = hashlib.sha256(repr(version).encode()).hexdigest()[:32]
+        stamps = [] if aggregate else [_as_utc(v) for v in version if isinstance(v, datetime)]
+        return cls(etag=f'W/"{digest}"', last_modified=max(stamps) if stamps else None, **kwargs)
+
+    @classmethod
+    def from_body(cls, body: bytes, **kwargs) -> "Validators":
+        """Validators for a response whose content is not tied to ``updated_at``."""
+        return cls(etag=f'W/"{hashlib.sha256(body).hexdigest()[:32]}"', **kwargs)
+
+    def matches(self, request: Request) -> bool:
+        """Return True if the client's cached copy is still current.
+
+        ``If-None-Match`` wins over ``If-Modified-Since`` (RFC 9110 13.2.2);
+        ETags are compared weakly.
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            return self.etag.removeprefix("W/") in _etag_values(if_none_match)
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = _as_utc(parsedate_to_datetime(if_modified_since))
+            except (TypeError, ValueError):
+                return False
+            # HTTP dates have one-second resolution
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def apply(self, response: Response) -> None:
+        response.headers.update(self.headers)
+
+    def not_modified(self) -> Response:
+        return Response(status_code=304, headers=self.headers)
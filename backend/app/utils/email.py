@@ -1,45 +1,55 @@
-import smtplib
-import asyncio
-import functools
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from datetime import datetime
+from html import escape
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from ..config import settings
+from ..crud.email_outbox import enqueue_email, enqueue_email_async
+from ..services.email_sender import wake_outbox_sender
+
+# Emails are not sent from the request: they are written to the outbox and
+# delivered by the background sender (app/services/email_sender.py).
 
-def _send_sync_email(msg: MIMEMultipart):
-    """Send the email synchronously via SMTP."""
-    with smtplib.SMTP_SSL(settings.smtp_host, settings.smtp_port) as server:
-        server.login(settings.smtp_user, settings.smtp_password.get_secret_value())
-        server.send_message(msg)
 
-async def send_email(to_email: str, subject: str, body: str):
-    """Send email via configured SMTP (async-safe) or log in dev."""
-    if not all([settings.smtp_host, settings.smtp_port, settings.smtp_user, settings.smtp_password]):
-        print(f"[DEV EMAIL] To: {to_email}, Subject: {subject}")
-        print(body)
-        return
+def verification_email(token: str) -> tuple[str, str]:
+    """Subject and HTML body of the account verification email."""
+    url = f"{settings.base_url}/users/verify/{token}"
+    return "Verify your email address", f"<p>Please verify your account by clicking <a href=\"{url}\">here</a>.</p>"
 
-    msg = MIMEMultipart()
-    msg["From"] = settings.from_email or settings.smtp_user
-    msg["To"] = to_email
-    msg["Subject"] = subject
-    msg.attach(MIMEText(body, "html"))
 
-    # Send via async executor
-    loop = asyncio.get_running_loop()
-    await loop.run_in_executor(None, functools.partial(_send_sync_email, msg))
+def password_reset_email(token: str) -> tuple[str, str]:
+    """Subject and HTML body of the password reset email."""
+    url = f"{settings.base_url}/password-reset/{token}"
+    return "Password Reset Request", f"<p>Reset your password <a href=\"{url}\">here</a>.</p>"
 
 
-async def send_verification_email(email: str, token: str):
-    """Send account verification link to user."""
-    url = f"{settings.base_url}/users/verify/{token}"
-    subject = "Verify your email address"
-    body = f"<p>Please verify your account by clicking <a href=\"{url}\">here</a>.</p>"
-    await send_email(email, subject, body)
+def reviewer_invite_email(call_title: str, token: str, expires_at: datetime) -> tuple[str, str]:
+    """Subject and HTML body of a reviewer invitation to a call."""
+    url = f"{settings.base_url}/reviewer/link"
+    body = (
+        f"<p>You have been invited to review applications for <b>{escape(call_title)}</b>.</p>"
+        f"<p>Sign in as a reviewer, open <a href=\"{url}\">{url}</a> and enter the code "
+        f"<b>{token}</b> before {expires_at:%Y-%m-%d %H:%M} UTC.</p>"
+    )
+    return f"Reviewer invitation: {call_title}", body
 
-async def send_password_reset_email(email: str, token: str):
-    """Send password reset link to user."""
-    url = f"{settings.base_url}/password-reset/{token}"
-    subject = "Password Reset Request"
-    body = f"<p>Reset your password <a href=\"{url}\">here</a>.</p>"
-    await send_email(email, subject, body)
+
+async def queue_verification_email(db: AsyncSession, email: str, token: str, commit: bool = True):
+    """Queue the account verification link for the user.
+
+    With ``commit=False`` the caller commits and then calls ``wake_outbox_sender``.
+    """
+    await enqueue_email_async(db, email, *verification_email(token), commit=commit)
+    if commit:
+        wake_outbox_sender()
+
+
+def queue_password_reset_email(db: Session, email: str, token: str, commit: bool = True):
+    """Queue the password reset link for the user.
+
+    With ``commit=False`` the caller commits and then calls ``wake_outbox_sender``.
+    """
+    enqueue_email(db, email, *password_reset_email(token), commit=commit)
+    if commit:
+        wake_outbox_sender()
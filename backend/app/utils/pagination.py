@@ -0,0 +1,151 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+class PageParams:
+    """Query parameters shared by every cursor-paginated list endpoint."""
+
+    def __init__(
+        self,
+        cursor: str | None = Query(None, description="Opaque cursor from the previous page"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    raw = json.dumps([_encode_value(sort_value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return _decode_value(sort_value), int(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _keyset_statement(
+    stmt: Select, sort_column, id_column, cursor: str | None, limit: int, descending: bool, nulls_last: bool
+) -> Select:
+    if cursor:
+        last_sort, last_id = decode_cursor(cursor)
+        if nulls_last and last_sort is None:
+            # Already in the trailing NULL rows, which are ordered by id alone
+            after = and_(sort_column.is_(None), id_column < last_id if descending else id_column > last_id)
+        elif descending:
+            after = or_(sort_column < last_sort, and_(sort_column == last_sort, id_column < last_id))
+        else:
+            after = or_(sort_column > last_sort, and_(sort_column == last_sort, id_column > last_id))
+        if nulls_last and last_sort is not None:
+            after = or_(after, sort_column.is_(None))
+        stmt = stmt.where(after)
+
+    order = (sort_column.desc(), id_column.desc()) if descending else (sort_column.asc(), id_column.asc())
+    if nulls_last:
+        order = (order[0].nulls_last(), order[1])
+    return (
+        stmt.add_columns(sort_column.label("_page_sort"), id_column.label("_page_id"))
+        .order_by(*order)
+        .limit(limit + 1)
+    )
+
+
+def _build_page(rows, width: int, limit: int) -> Page:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last[-2], last[-1])
+    items = [row[0] if width == 1 else tuple(row[:width]) for row in rows]
+    return Page(items=items, next_cursor=next_cursor)
+
+
+def paginate(
+    db: Session,
+    stmt: Select,
+    *,
+    sort_column,
+    id_column,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    descending: bool = False,
+    nulls_last: bool = False,
+) -> Page:
+    """Run ``stmt`` as a keyset-paginated query ordered by ``(sort_column, id_column)``.
+
+    The cursor encodes the sort key of the last row returned, so each page is
+    a range scan that starts where the previous one stopped instead of
+    skipping ``OFFSET`` rows. ``sort_column`` may be any SQL expression; if
+    it can be NULL, pass ``nulls_last`` to order those rows last, by id.
+    Sorting on a plain column this way keeps an index on it usable, which a
+    ``coalesce()`` around it would not. Items are the selected entity when
+    ``stmt`` selects a single one, otherwise the result rows.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    width = len(stmt.column_descriptions)
+    rows = db.execute(_keyset_statement(stmt, sort_column, id_column, cursor, limit, descending, nulls_last)).all()
+    return _build_page(rows, width, limit)
+
+
+async def paginate_async(
+    db: AsyncSession,
+    stmt: Select,
+    *,
+    sort_column,
+    id_column,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    descending: bool = False,
+    nulls_last: bool = False,
+) -> Page:
+    """Async counterpart of :func:`paginate` for an ``AsyncSession``."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    width = len(stmt.column_descriptions)
+    rows = (
+        await db.execute(_keyset_statement(stmt, sort_column, id_column, cursor, limit, descending, nulls_last))
+    ).all()
+    return _build_page(rows, width, limit)
+
+
+def set_page_headers(request: Request, response: Response, page: Page) -> None:
+    """Expose the next cursor as ``X-Next-Cursor`` and an RFC 8288 ``Link`` header."""
+    if page.next_cursor:
+        next_url = request.url.include_query_params(cursor=page.next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+        response.headers["X-Next-Cursor"] = page.next_cursor
@@ -0,0 +1,65 @@
+"""Benchmark for ``create_invites_bulk``.
+
+Invites N reviewers to a call in a throwaway SQLite database, covering
+token generation, the multi-row INSERTs of invites and outbox emails, and
+the commit. The table already holds earlier invites, so the token
+collision check runs against real rows.
+
+Run from the ``backend`` directory::
+
+    python -m benchmarks.bench_bulk_invites
+"""
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("JWT_SECRET", "bench")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.crud.reviewer_invite import create_invites_bulk
+from app.models.call import Call
+from app.utils.email import reviewer_invite_email
+
+
+def bench(size: int, rounds: int = 5) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        database.Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        db = Session()
+        call = Call(title="Benchmark call", is_open=True)
+        db.add(call)
+        db.commit()
+        call_id = call.id
+        expires_at = datetime.utcnow() + timedelta(days=1)
+
+        timings = []
+        for r in range(rounds):
+            emails = [f"reviewer{r}-{i}@example.com" for i in range(size)]
+            start = time.perf_counter()
+            create_invites_bulk(
+                db,
+                call_id=call_id,
+                emails=emails,
+                expires_at=expires_at,
+                render_email=lambda token: reviewer_invite_email("Benchmark call", token, expires_at),
+            )
+            timings.append(time.perf_counter() - start)
+        db.close()
+        engine.dispose()
+    return min(timings)
+
+
+def main():
+    print(f"{'invites':>8} {'best of 5':>10}")
+    for size in (100, 500, 1000):
+        print(f"{size:>8,} {bench(size) * 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Scaling benchmark for the chunked PDF export.
+
+Seeds a throwaway SQLite database with one call and N applications, then
+exports it with 1, 2, 4, ... worker processes up to the number of cores.
+Uses wkhtmltopdf when it is installed; otherwise a CPU-bound stand-in
+renders the same template and writes one PDF page per application, so the
+pool, chunking and merge are still exercised.
+
+Run from the ``backend`` directory::
+
+    python -m benchmarks.bench_pdf_export [applications] [chunk_size]
+"""
+import asyncio
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("JWT_SECRET", "bench")
+
+from jinja2 import Environment, FileSystemLoader
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.models.application import Application
+from app.models.call import Call
+from app.models.user import User
+from app.services.pdf_export import (
+    TEMPLATE_DIR,
+    TOC_TEMPLATE,
+    PdfExportService,
+    render_applications_pdf,
+)
+
+
+def synthetic_renderer(template: str, context: dict, out_path: str) -> None:
+    """CPU-bound stand-in for wkhtmltopdf."""
+    from pypdf import PdfWriter
+
+    html = Environment(loader=FileSystemLoader(TEMPLATE_DIR)).get_template(template).render(context)
+    for level in range(1, 10):
+        zlib.compress(html.encode() * 20, level)
+    writer = PdfWriter()
+    if template == TOC_TEMPLATE:
+        writer.add_blank_page(595, 842)
+    else:
+        for app in context["applications"]:
+            writer.add_blank_page(595, 842)
+            writer.add_outline_item(f"Application #{app['id']}", len(writer.pages) - 1)
+    with open(out_path, "wb") as f:
+        writer.write(f)
+
+
+def seed(path: Path, applications: int):
+    engine = create_engine(f"sqlite:///{path}")
+    database.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    call = Call(title="benchmark call", is_open=True)
+    db.add(call)
+    db.flush()
+    users = [User(email=f"bench{i}@example.com", hashed_password="x") for i in range(applications)]
+    db.add_all(users)
+    db.flush()
+    db.add_all(
+        Application(user_id=u.id, call_id=call.id, content="Lorem ipsum dolor sit amet. " * 40) for u in users
+    )
+    db.commit()
+    call_id = call.id
+    db.close()
+    return Session, call_id
+
+
+async def export_once(root: Path, session_factory, call_id: int, workers: int, chunk_size: int, renderer):
+    service = PdfExportService(
+        root,
+        executor_factory=lambda: ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")),
+        renderer=renderer,
+        session_factory=session_factory,
+        chunk_size=chunk_size,
+        max_in_flight=workers * 2,
+    )
+    # Warm the pool so process start-up is not measured
+    await asyncio.gather(*(
+        asyncio.get_running_loop().run_in_executor(service.executor, time.sleep, 0.01) for _ in range(workers)
+    ))
+    job = await service.enqueue(call_id)
+    started = time.perf_counter()
+    async for state in service.wait(job, interval=0.05):
+        if state.status == "failed":
+            raise RuntimeError("export failed")
+    elapsed = time.perf_counter() - started
+    service.shutdown()
+    return elapsed
+
+
+def main():
+    applications = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    renderer = render_applications_pdf if shutil.which("wkhtmltopdf") else synthetic_renderer
+    cores = os.cpu_count() or 1
+    counts = sorted({1, *[2 ** i for i in range(1, cores.bit_length()) if 2 ** i <= cores], cores})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory, call_id = seed(Path(tmp) / "bench.db", applications)
+        print(f"{applications} applications, chunks of {chunk_size}, renderer: {renderer.__name__}")
+        print(f"{'workers':>8} {'seconds':>9} {'speed-up':>9}")
+        baseline = None
+        for workers in counts:
+            root = Path(tmp) / f"exports-{workers}"
+            elapsed = asyncio.run(export_once(root, session_factory, call_id, workers, chunk_size, renderer))
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {baseline / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Micro-benchmark for ``RateLimiter.is_allowed``.
+
+Fills the limiter with N tracked clients and measures the cost of a call
+for a known client, a new client (which also triggers LRU eviction at the
+bound) and the amortized expiry path. The cost should stay flat as N grows.
+
+Run from the ``backend`` directory::
+
+    python -m benchmarks.bench_rate_limiter
+"""
+import os
+import timeit
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("JWT_SECRET", "bench")
+
+from app.middleware.security import RateLimiter
+
+CALLS = 200_000
+
+
+class StepClock:
+    """Deterministic clock that advances 1 µs per call."""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1_000
+        return self.now
+
+
+def bench(tracked: int) -> dict:
+    limiter = RateLimiter(requests_per_minute=1_000_000, max_clients=tracked, clock=StepClock())
+    for i in range(tracked):
+        limiter.is_allowed(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}")
+
+    known = iter(range(CALLS))
+    hit = timeit.timeit(lambda: limiter.is_allowed(f"10.0.0.{next(known) % 200}"), number=CALLS)
+    fresh = iter(range(CALLS))
+    miss = timeit.timeit(lambda: limiter.is_allowed(f"new-{next(fresh)}"), number=CALLS)
+    assert len(limiter) <= tracked
+    return {"tracked": tracked, "known_ns": hit / CALLS * 1e9, "new_ns": miss / CALLS * 1e9}
+
+
+def main():
+    print(f"{'tracked clients':>16} {'known client':>14} {'new client':>12}")
+    for tracked in (1_000, 10_000, 100_000):
+        result = bench(tracked)
+        print(f"{result['tracked']:>16,} {result['known_ns']:>11.0f} ns {result['new_ns']:>9.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
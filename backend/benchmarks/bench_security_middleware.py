@@ -0,0 +1,100 @@
+"""Compare the ASGI ``SecurityMiddleware`` with the former BaseHTTPMiddleware version.
+
+Each variant wraps the same tiny Starlette app and serves a small JSON
+response and a 4 MiB streamed body through httpx's in-process ASGI
+transport. Requests run with fixed concurrency; the script reports
+requests/sec and p99 latency for each variant.
+
+Run from the ``backend`` directory::
+
+    python -m benchmarks.bench_security_middleware
+"""
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("JWT_SECRET", "bench")
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.middleware.security import SECURITY_HEADERS, RateLimiter, SecurityMiddleware, classify_route
+
+REQUESTS = 3_000
+CONCURRENCY = 50
+STREAM_CHUNKS = 64
+CHUNK = b"x" * 65536
+
+
+class LegacySecurityMiddleware(BaseHTTPMiddleware):
+    """The previous implementation, kept here only for comparison."""
+
+    def __init__(self, app, rate_limiter):
+        super().__init__(app)
+        self.rate_limiter = rate_limiter
+
+    async def dispatch(self, request, call_next):
+        client_ip = request.client.host if request.client else "unknown"
+        host = request.headers.get("host", "").split(":")[0]
+        if not host:
+            return JSONResponse({"detail": "Invalid host header"}, status_code=400)
+        if not await self.rate_limiter.check(client_ip, classify_route(request.method, request.url.path)):
+            return JSONResponse({"detail": "Too many requests"}, status_code=429)
+        response = await call_next(request)
+        response.headers.update(SECURITY_HEADERS)
+        return response
+
+
+async def small(request):
+    return JSONResponse({"ok": True})
+
+
+async def stream(request):
+    async def body():
+        for _ in range(STREAM_CHUNKS):
+            yield CHUNK
+    return StreamingResponse(body(), media_type="application/octet-stream")
+
+
+def build(kind: str):
+    inner = Starlette(routes=[Route("/small", small), Route("/stream", stream)])
+    limiter = RateLimiter(10**9)
+    if kind == "legacy":
+        return LegacySecurityMiddleware(inner, limiter)
+    return SecurityMiddleware(inner, rate_limiter=limiter, allowed_hosts=["*"])
+
+
+async def run(app, path: str, total: int) -> tuple[float, float]:
+    latencies = []
+    queue = iter(range(total))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+        async def worker():
+            for _ in queue:
+                start = time.perf_counter()
+                resp = await client.get(path)
+                assert resp.status_code == 200
+                latencies.append(time.perf_counter() - start)
+
+        began = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - began
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    return total / elapsed, p99 * 1000
+
+
+async def main():
+    print(f"{'variant':<8} {'path':<8} {'req/s':>10} {'p99 ms':>8}")
+    for path, total in (("/small", REQUESTS), ("/stream", REQUESTS // 10)):
+        for kind in ("legacy", "asgi"):
+            rps, p99 = await run(build(kind), path, total)
+            print(f"{kind:<8} {path:<8} {rps:>10.0f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,4 @@
+import os
+
+# Never start the outbox sender from the app's startup hook; tests drive it directly
+os.environ["EMAIL_SENDER_ENABLED"] = "false"
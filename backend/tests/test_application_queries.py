@@ -0,0 +1,131 @@
+import os
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.dependencies import get_db, get_current_admin, get_current_admin_or_reviewer
+from app.models.application import Application
+from app.models.application_reviewer import ApplicationReviewer
+from app.models.attachment import Attachment
+from app.models.call import Call
+from app.models.user import User, UserRole
+
+
+class DummyAdmin:
+    id = 0
+    role = UserRole.ADMIN
+
+
+@pytest.fixture()
+def client():
+    test_engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin] = lambda: DummyAdmin()
+    app.dependency_overrides[get_current_admin_or_reviewer] = lambda: DummyAdmin()
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.engine = test_engine
+        c.session_factory = TestingSessionLocal
+        yield c
+
+    app.dependency_overrides = {}
+
+
+def seed_call(session_factory, applications: int) -> int:
+    db = session_factory()
+    call = Call(title="big call", is_open=True)
+    db.add(call)
+    db.flush()
+    reviewer = User(
+        email=f"r{call.id}@example.com", hashed_password="x", role=UserRole.REVIEWER, first_name="Rev"
+    )
+    db.add(reviewer)
+    db.flush()
+    for i in range(applications):
+        applicant = User(email=f"a{i}-{call.id}@example.com", hashed_password="x", role=UserRole.APPLICANT)
+        db.add(applicant)
+        db.flush()
+        application = Application(user_id=applicant.id, call_id=call.id, content=f"app {i}")
+        db.add(application)
+        db.flush()
+        db.add_all([
+            Attachment(
+                application_id=application.id,
+                file_name=f"doc{i}.pdf",
+                content_hash="0" * 64,
+                storage_key="k",
+                size=10,
+                is_confirmed=i % 2 == 0,
+            ),
+            ApplicationReviewer(application_id=application.id, user_id=reviewer.id),
+        ])
+    db.commit()
+    call_id = call.id
+    db.close()
+    return call_id
+
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["/calls/{call_id}/applications", "/applications/admin/{call_id}/applications"],
+)
+def test_application_list_uses_constant_number_of_queries(client, url):
+    small_call = seed_call(client.session_factory, 3)
+    with count_queries(client.engine) as small:
+        resp = client.get(url.format(call_id=small_call))
+    assert resp.status_code == 200
+    assert len(resp.json()) == 3
+
+    big_call = seed_call(client.session_factory, 40)
+    with count_queries(client.engine) as big:
+        resp = client.get(url.format(call_id=big_call))
+    assert resp.status_code == 200
+    assert len(resp.json()) == 40
+    assert len(big) == len(small)
+    assert len(big) <= 5
+
+
+def test_application_detail_content(client):
+    call_id = seed_call(client.session_factory, 2)
+    data = client.get(f"/calls/{call_id}/applications").json()
+    first, second = data
+    assert first["documents_confirmed"] is True
+    assert second["documents_confirmed"] is False
+    assert first["attachments"][0]["file_name"] == "doc0.pdf"
+    assert first["reviewers"][0]["first_name"] == "Rev"
+    assert first["user"]["email"] == f"a0-{call_id}@example.com"
@@ -0,0 +1,150 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.database import async_database_url
+from app.dependencies import get_db, get_async_db
+from app.models.application import Application
+from app.models.call import Call
+from app.models.user import User
+from app.services.principal_cache import principal_cache
+from app.services.response_cache import get_response_cache
+
+
+def test_async_database_url_uses_async_drivers():
+    assert async_database_url("postgresql://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+    assert async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+
+@pytest.fixture()
+def client(tmp_path):
+    db_path = tmp_path / "async.db"
+    test_engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    session = TestingSessionLocal()
+    session.add(Call(title="open call", is_open=True))
+    session.commit()
+    session.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    principal_cache.clear()
+    get_response_cache.cache_clear()
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.session_factory = TestingSessionLocal
+        c.async_engine = async_engine
+        yield c
+
+    app.dependency_overrides = {}
+
+
+def register_and_login(client, email, role="applicant"):
+    resp = client.post("/auth/register", json={"email": email, "password": "secret123", "role": role})
+    assert resp.status_code == 201
+    resp = client.post("/auth/login", json={"email": email, "password": "secret123", "role": role})
+    assert resp.status_code == 200
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def test_login_and_profile_run_on_async_session(client):
+    headers = register_and_login(client, "async@example.com")
+    me = client.get("/users/me", headers=headers)
+    assert me.status_code == 200
+    assert me.json()["last_login"] is not None
+
+    updated = client.patch("/users/me", json={"first_name": "Ada"}, headers=headers)
+    assert updated.status_code == 200
+    assert updated.json()["first_name"] == "Ada"
+
+    wrong = client.post("/auth/login", json={"email": "async@example.com", "password": "nope", "role": "applicant"})
+    assert wrong.status_code == 401
+    db = client.session_factory()
+    assert db.query(User).filter_by(email="async@example.com").one().login_attempts == 1
+    db.close()
+
+
+def test_application_lifecycle(client):
+    headers = register_and_login(client, "applicant@example.com")
+    call_id = client.get("/calls/").json()[0]["id"]
+    assert client.get(f"/calls/{call_id}").json()["title"] == "open call"
+
+    created = client.get(f"/applications/by_call/{call_id}", headers=headers)
+    assert created.status_code == 200
+    again = client.get(f"/applications/by_call/{call_id}", headers=headers)
+    assert again.json()["id"] == created.json()["id"]
+
+    duplicate = client.post("/applications/", json={"call_id": call_id, "content": "x"}, headers=headers)
+    assert duplicate.status_code == 400
+
+    application_id = created.json()["id"]
+    submitted = client.patch(f"/applications/{application_id}/submit", headers=headers)
+    assert submitted.json()["status"] == "submitted"
+    mine = client.get("/applications/me", headers=headers).json()
+    assert [a["id"] for a in mine] == [application_id]
+
+
+def test_reviews(client):
+    headers = register_and_login(client, "reviewer@example.com", role="reviewer")
+    db = client.session_factory()
+    applicant = User(email="a@example.com", hashed_password="x")
+    db.add(applicant)
+    db.flush()
+    application = Application(user_id=applicant.id, call_id=1, content="c")
+    db.add(application)
+    db.commit()
+    application_id = application.id
+    db.close()
+
+    body = {"application_id": application_id, "score": 8, "comment": "good"}
+    assert client.post("/reviews/", json=body, headers=headers).status_code == 201
+    assert client.post("/reviews/", json=body, headers=headers).status_code == 400
+    mine = client.get(f"/reviews/applications/{application_id}/my-review", headers=headers)
+    assert mine.json()["score"] == 8
+    assert len(client.get("/reviews/me", headers=headers).json()) == 1
+
+
+def test_cached_requests_do_not_query_the_database(client):
+    headers = register_and_login(client, "cached@example.com")
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(client.async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        assert client.get("/users/me", headers=headers).status_code == 200
+        first = len(statements)
+        assert client.get("/users/me", headers=headers).status_code == 200
+        assert len(statements) == first
+        assert first == 1
+
+        client.patch("/users/me", json={"last_name": "Lovelace"}, headers=headers)
+        assert client.get("/users/me", headers=headers).json()["last_name"] == "Lovelace"
+    finally:
+        event.remove(client.async_engine.sync_engine, "before_cursor_execute", record)
@@ -0,0 +1,130 @@
+import io
+import os
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.config import settings
+from app.crud.attachment import store_attachment
+from app.dependencies import get_db, get_current_user
+from app.models.application import Application
+from app.models.call import Call
+from app.models.user import User, UserRole
+from app.services.blob_response import parse_range
+from app.services.blob_store import get_blob_store
+
+PAYLOAD = bytes(range(256)) * 1024  # 256 KiB, larger than one chunk
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=50-500", 100) == (50, 99)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    with pytest.raises(HTTPException) as exc:
+        parse_range("bytes=100-", 100)
+    assert exc.value.status_code == 416
+
+
+@pytest.fixture()
+def client(tmp_path):
+    settings.upload_dir = str(tmp_path / "uploads")
+    settings.accel_redirect_prefix = None
+    get_blob_store.cache_clear()
+    test_engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    session = TestingSessionLocal()
+    user = User(email="u@example.com", hashed_password="x", role=UserRole.APPLICANT)
+    call = Call(title="test call", description="d", is_open=True)
+    session.add_all([user, call])
+    session.commit()
+    application = Application(user_id=user.id, call_id=call.id, content="content")
+    session.add(application)
+    session.commit()
+    attachment = store_attachment(
+        session,
+        application_id=application.id,
+        document_id=None,
+        file_name="big.pdf",
+        stream=io.BytesIO(PAYLOAD),
+    )
+    attachment_id, content_hash = attachment.id, attachment.content_hash
+    session.refresh(user)
+    session.expunge_all()
+    session.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.url = f"/applications/attachments/{attachment_id}/download"
+        c.etag = f'"{content_hash}"'
+        yield c
+
+    app.dependency_overrides = {}
+    settings.accel_redirect_prefix = None
+    get_blob_store.cache_clear()
+
+
+def test_full_download_has_strong_etag(client):
+    resp = client.get(client.url)
+    assert resp.status_code == 200
+    assert resp.content == PAYLOAD
+    assert resp.headers["etag"] == client.etag
+    assert resp.headers["accept-ranges"] == "bytes"
+    assert resp.headers["content-length"] == str(len(PAYLOAD))
+
+
+def test_if_none_match_returns_304(client):
+    resp = client.get(client.url, headers={"If-None-Match": client.etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+
+def test_range_request_returns_partial_content(client):
+    resp = client.get(client.url, headers={"Range": "bytes=100000-100099"})
+    assert resp.status_code == 206
+    assert resp.content == PAYLOAD[100000:100100]
+    assert resp.headers["content-range"] == f"bytes 100000-100099/{len(PAYLOAD)}"
+
+
+def test_stale_if_range_serves_full_body(client):
+    resp = client.get(client.url, headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+    assert resp.status_code == 200
+    assert len(resp.content) == len(PAYLOAD)
+
+
+def test_unsatisfiable_range(client):
+    resp = client.get(client.url, headers={"Range": f"bytes={len(PAYLOAD)}-"})
+    assert resp.status_code == 416
+    assert resp.headers["content-range"] == f"bytes */{len(PAYLOAD)}"
+
+
+def test_accel_redirect_hand_off(client):
+    settings.accel_redirect_prefix = "/protected-uploads/"
+    resp = client.get(client.url)
+    assert resp.status_code == 200
+    assert resp.headers["x-accel-redirect"].startswith("/protected-uploads/")
+    assert resp.content == b""
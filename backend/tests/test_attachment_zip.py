@@ -0,0 +1,147 @@
+import io
+import os
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.config import settings
+from app.crud.attachment import store_attachment
+from app.dependencies import get_db, get_current_user
+from app.models.application import Application
+from app.models.application_reviewer import ApplicationReviewer
+from app.models.call import Call
+from app.models.user import User, UserRole
+from app.services.blob_store import get_blob_store
+from app.services.zip_stream import ArchiveEntry, stream_zip
+
+PDF = b"%PDF-1.4 " + bytes(range(256)) * 1024  # larger than one chunk
+TEXT = b"plain text " * 2000
+
+
+class Caller:
+    def __init__(self, user_id, role):
+        self.id = user_id
+        self.role = role
+
+
+@pytest.fixture()
+def client(tmp_path):
+    settings.upload_dir = str(tmp_path / "uploads")
+    get_blob_store.cache_clear()
+    test_engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    session = TestingSessionLocal()
+    call = Call(title="zip call", is_open=True)
+    reviewer = User(email="rev@example.com", hashed_password="x", role=UserRole.REVIEWER)
+    owners = [User(email=f"u{i}@example.com", hashed_password="x") for i in range(2)]
+    session.add_all([call, reviewer, *owners])
+    session.flush()
+    app_ids = []
+    for owner in owners:
+        application = Application(user_id=owner.id, call_id=call.id, content="content")
+        session.add(application)
+        session.flush()
+        app_ids.append(application.id)
+        for name, payload in (("proposal.pdf", PDF), ("notes.txt", TEXT), ("proposal.pdf", PDF)):
+            store_attachment(session, application_id=application.id, document_id=None,
+                             file_name=name, stream=io.BytesIO(payload))
+    session.add(ApplicationReviewer(application_id=app_ids[0], user_id=reviewer.id))
+    session.commit()
+    ids = {"call": call.id, "reviewer": reviewer.id, "owners": [o.id for o in owners], "apps": app_ids}
+    session.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    caller = {"user": Caller(0, UserRole.ADMIN)}
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: caller["user"]
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.ids = ids
+        c.login_as = lambda user_id, role: caller.update(user=Caller(user_id, role))
+        yield c
+
+    app.dependency_overrides = {}
+    get_blob_store.cache_clear()
+
+
+def open_zip(resp):
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/zip"
+    return zipfile.ZipFile(io.BytesIO(resp.content))
+
+
+def test_call_zip_has_a_folder_per_application(client):
+    archive = open_zip(client.get(f"/calls/{client.ids['call']}/attachments.zip"))
+    assert archive.testzip() is None
+    first, second = (f"application_{i}" for i in client.ids["apps"])
+    assert sorted(archive.namelist()) == sorted([
+        f"{first}/proposal.pdf", f"{first}/notes.txt", f"{first}/proposal (1).pdf",
+        f"{second}/proposal.pdf", f"{second}/notes.txt", f"{second}/proposal (1).pdf",
+    ])
+    assert archive.read(f"{first}/proposal.pdf") == PDF
+    assert archive.read(f"{second}/notes.txt") == TEXT
+
+
+def test_pdfs_are_stored_and_text_is_deflated(client):
+    archive = open_zip(client.get(f"/applications/{client.ids['apps'][0]}/attachments.zip"))
+    assert archive.getinfo("proposal.pdf").compress_type == zipfile.ZIP_STORED
+    assert archive.getinfo("notes.txt").compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_reviewer_only_gets_assigned_applications(client):
+    first, second = client.ids["apps"]
+    client.login_as(client.ids["reviewer"], UserRole.REVIEWER)
+
+    archive = open_zip(client.get(f"/calls/{client.ids['call']}/attachments.zip"))
+    assert {name.split("/")[0] for name in archive.namelist()} == {f"application_{first}"}
+
+    assert client.get(f"/applications/{first}/attachments.zip").status_code == 200
+    assert client.get(f"/applications/{second}/attachments.zip").status_code == 403
+
+
+def test_applicants_only_get_their_own_application(client):
+    first, second = client.ids["apps"]
+    client.login_as(client.ids["owners"][0], UserRole.APPLICANT)
+
+    assert client.get(f"/applications/{first}/attachments.zip").status_code == 200
+    assert client.get(f"/applications/{second}/attachments.zip").status_code == 404
+    assert client.get(f"/calls/{client.ids['call']}/attachments.zip").status_code == 403
+
+
+def test_archive_is_streamed_in_small_pieces(client):
+    store = get_blob_store()
+    blob = store.put(io.BytesIO(PDF))
+    entries = [ArchiveEntry(folder="", file_name=f"f{i}.pdf", storage_key=blob.storage_key, size=blob.size)
+               for i in range(4)]
+
+    pieces = list(stream_zip(entries, store, chunk_size=16 * 1024))
+
+    assert max(len(piece) for piece in pieces) < 64 * 1024
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(pieces)))
+    assert [archive.read(name) for name in archive.namelist()] == [PDF] * 4
+
+
+def test_unsafe_names_stay_inside_their_folder(client):
+    store = get_blob_store()
+    blob = store.put(io.BytesIO(TEXT))
+    entries = [ArchiveEntry(folder="a", file_name="../../etc/passwd", storage_key=blob.storage_key, size=blob.size)]
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(stream_zip(entries, store))))
+    assert archive.namelist() == ["a/passwd"]
@@ -0,0 +1,243 @@
+import io
+import os
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.config import settings
+from app.crud.attachment import release_blobs, store_attachment
+from app.dependencies import get_db, get_current_user
+from app.migrate_attachments import prepare_schema, migrate_batches
+from app.models.application import Application
+from app.models.attachment import Attachment
+from app.models.call import Call
+from app.models.document import DocumentDefinition, DocumentFormat
+from app.models.user import User, UserRole
+from app.services.blob_store import LocalBlobStore, get_blob_store
+
+
+def test_local_store_is_content_addressed(tmp_path):
+    store = LocalBlobStore(tmp_path)
+    first = store.put(io.BytesIO(b"hello"))
+    second = store.put(io.BytesIO(b"hello"))
+    assert first == second
+    assert first.size == 5
+    assert first.storage_key.endswith(first.content_hash)
+    assert b"".join(store.iter_chunks(first.storage_key)) == b"hello"
+    assert not list((tmp_path / ".tmp").iterdir())
+
+    store.delete(first.storage_key)
+    assert not store.exists(first.storage_key)
+
+
+def test_local_store_rejects_path_traversal(tmp_path):
+    store = LocalBlobStore(tmp_path / "blobs")
+    with pytest.raises(ValueError):
+        store.open("../outside")
+
+
+@pytest.fixture()
+def client(tmp_path):
+    settings.upload_dir = str(tmp_path / "uploads")
+    get_blob_store.cache_clear()
+    test_engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    session = TestingSessionLocal()
+    user = User(email="u@example.com", hashed_password="x", role=UserRole.APPLICANT)
+    call = Call(title="test call", description="d", is_open=True)
+    session.add_all([user, call])
+    session.commit()
+    document = DocumentDefinition(call_id=call.id, name="Proposal", allowed_formats=DocumentFormat.pdf)
+    application = Application(user_id=user.id, call_id=call.id, content="content")
+    session.add_all([document, application])
+    session.commit()
+    ids = {"user": user.id, "application": application.id, "document": document.id}
+    session.expunge_all()
+    session.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.ids = ids
+        c.session_factory = TestingSessionLocal
+        yield c
+
+    app.dependency_overrides = {}
+    get_blob_store.cache_clear()
+
+
+def test_upload_keeps_bytes_out_of_the_database(client):
+    resp = client.post(
+        f"/applications/{client.ids['application']}/attachments",
+        params={"document_id": client.ids["document"]},
+        files={"file": ("proposal.pdf", io.BytesIO(b"%PDF-1.4 test"), "application/pdf")},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["size"] == len(b"%PDF-1.4 test")
+
+    db = client.session_factory()
+    attachment = db.query(Attachment).one()
+    assert get_blob_store().exists(attachment.storage_key)
+    db.close()
+
+    download = client.get(f"/applications/attachments/{attachment.id}/download")
+    assert download.status_code == 200
+    assert download.content == b"%PDF-1.4 test"
+
+
+def test_identical_uploads_share_one_blob(client):
+    for _ in range(2):
+        client.post(
+            f"/applications/{client.ids['application']}/attachments",
+            params={"document_id": client.ids["document"]},
+            files={"file": ("proposal.pdf", io.BytesIO(b"%PDF-1.4 same bytes"), "application/pdf")},
+        )
+    db = client.session_factory()
+    first, second = db.query(Attachment).all()
+    assert first.storage_key == second.storage_key
+    db.close()
+
+    client.delete(f"/applications/attachments/{first.id}")
+    assert get_blob_store().exists(second.storage_key)
+    client.delete(f"/applications/attachments/{second.id}")
+    assert not get_blob_store().exists(second.storage_key)
+
+
+def test_migration_moves_legacy_rows_in_batches(tmp_path):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE attachments (id INTEGER PRIMARY KEY, application_id INTEGER, "
+            "document_id INTEGER, file_name VARCHAR, data BLOB, is_confirmed BOOLEAN)"
+        ))
+        for i in range(5):
+            conn.execute(
+                text("INSERT INTO attachments (application_id, file_name, data) VALUES (1, :n, :d)"),
+                {"n": f"f{i}.txt", "d": b"dup" if i % 2 else f"unique-{i}".encode()},
+            )
+
+    store = LocalBlobStore(tmp_path / "blobs")
+    prepare_schema(legacy)
+    assert migrate_batches(legacy, store, batch_size=2) == 5
+    assert migrate_batches(legacy, store, batch_size=2) == 0
+
+    with legacy.connect() as conn:
+        rows = conn.execute(text("SELECT data, storage_key, size FROM attachments ORDER BY id")).all()
+    assert all(data is None for data, _, _ in rows)
+    assert rows[1][1] == rows[3][1]
+    assert b"".join(store.iter_chunks(rows[0][1])) == b"unique-0"
+
+
+def test_migration_reuses_the_smallest_known_key(tmp_path):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    store = LocalBlobStore(tmp_path / "blobs")
+    with legacy.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE attachments (id INTEGER PRIMARY KEY, application_id INTEGER, "
+            "document_id INTEGER, file_name VARCHAR, data BLOB, is_confirmed BOOLEAN)"
+        ))
+        conn.execute(text("INSERT INTO attachments (application_id, file_name, data) VALUES (1, 'new.txt', :d)"),
+                     {"d": b"dup"})
+    prepare_schema(legacy)
+    # Two uploads of the same bytes on different days, before the migration
+    keys = []
+    for day in ("2024-01-02", "2024-01-01"):
+        staged = store.stage(io.BytesIO(b"dup"))
+        keys.append(store.publish(staged, f"{day}/{staged.content_hash}").storage_key)
+        with legacy.begin() as conn:
+            conn.execute(
+                text("INSERT INTO attachments (application_id, file_name, content_hash, storage_key, size) "
+                     "VALUES (1, 'old.txt', :h, :k, 3)"),
+                {"h": staged.content_hash, "k": keys[-1]},
+            )
+
+    assert migrate_batches(legacy, store) == 1
+    with legacy.connect() as conn:
+        migrated = conn.execute(text("SELECT storage_key FROM attachments WHERE file_name = 'new.txt'")).scalar()
+        assert conn.execute(text("SELECT COUNT(*) FROM blob_locks")).scalar() == 1
+    assert migrated == min(keys)
+    assert all(store.exists(key) for key in keys)
+    assert not list((tmp_path / "blobs" / ".tmp").iterdir())
+
+
+def test_release_waits_for_an_upload_of_the_same_content(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}", connect_args={"check_same_thread": False})
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    database.Base.metadata.create_all(bind=engine)
+    store = LocalBlobStore(tmp_path / "blobs")
+    db = Session()
+    user, call = User(email="u@example.com", hashed_password="x"), Call(title="c", is_open=True)
+    db.add_all([user, call])
+    db.flush()
+    application = Application(user_id=user.id, call_id=call.id, content="x")
+    db.add(application)
+    db.commit()
+    application_id = application.id
+    old = store_attachment(db, application_id=application_id, document_id=None, file_name="a.pdf",
+                           stream=io.BytesIO(b"same bytes"), store=store)
+    released = (old.content_hash, old.storage_key)
+    # The last row goes away; its blob is not released yet
+    db.delete(old)
+    db.commit()
+    db.close()
+
+    published, resume = threading.Event(), threading.Event()
+    publish = store.publish
+
+    def publish_then_wait(*args, **kwargs):
+        blob = publish(*args, **kwargs)
+        published.set()
+        resume.wait(5)
+        return blob
+
+    store.publish = publish_then_wait
+    uploaded = []
+
+    def upload():
+        session = Session()
+        uploaded.append(store_attachment(session, application_id=application_id, document_id=None,
+                                         file_name="b.pdf", stream=io.BytesIO(b"same bytes"), store=store))
+        session.close()
+
+    def release():
+        session = Session()
+        release_blobs(session, [released], store=store)
+        session.close()
+
+    uploader = threading.Thread(target=upload)
+    uploader.start()
+    assert published.wait(5)
+    releaser = threading.Thread(target=release)
+    releaser.start()
+    time.sleep(0.3)
+    # The upload holds the blob's lock until its row is committed
+    assert releaser.is_alive()
+    resume.set()
+    uploader.join(5)
+    releaser.join(5)
+
+    (attachment,) = uploaded
+    assert attachment.storage_key == released[1]
+    assert b"".join(store.iter_chunks(attachment.storage_key)) == b"same bytes"
@@ -0,0 +1,152 @@
+import csv
+import io
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.dependencies import get_db, get_current_admin
+from app.models.application import Application
+from app.models.application_reviewer import ApplicationReviewer
+from app.models.attachment import Attachment
+from app.crud.application import get_application_details
+from app.models.call import Call
+from app.models.review import Review
+from app.models.user import User, UserRole
+from app.services.call_export import CSV_COLUMNS, csv_stream, iter_call_export_rows
+
+
+class DummyAdmin:
+    id = 0
+    role = UserRole.ADMIN
+
+
+@pytest.fixture()
+def client(tmp_path):
+    test_engine = create_engine(f"sqlite:///{tmp_path / 'rows.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    db = TestingSessionLocal()
+    call = Call(title="rows call", is_open=True)
+    other = Call(title="other call", is_open=True)
+    reviewers = [
+        User(email=f"rev{i}@example.com", hashed_password="x", role=UserRole.REVIEWER,
+             first_name="Rev", last_name=str(i))
+        for i in range(2)
+    ]
+    db.add_all([call, other, *reviewers])
+    db.flush()
+    for i in range(5):
+        user = User(email=f"u{i}@example.com", hashed_password="x", first_name="App", last_name=str(i),
+                    organization="Uni, Dept" if i == 0 else None)
+        db.add(user)
+        db.flush()
+        application = Application(user_id=user.id, call_id=call.id, content=f"app {i}")
+        db.add(application)
+        db.flush()
+        db.add(Attachment(application_id=application.id, file_name=f"f{i}.pdf", content_hash="0" * 64,
+                          storage_key="k", size=10 + i, content_type="application/pdf", is_confirmed=i == 0))
+        if i < 2:
+            for j, reviewer in enumerate(reviewers):
+                db.add(ApplicationReviewer(application_id=application.id, user_id=reviewer.id))
+                db.add(Review(application_id=application.id, reviewer_id=reviewer.id, score=60 + 10 * j))
+    outsider = User(email="outsider@example.com", hashed_password="x")
+    db.add(outsider)
+    db.flush()
+    db.add(Application(user_id=outsider.id, call_id=other.id, content="elsewhere"))
+    db.commit()
+    call_id = call.id
+    db.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin] = lambda: DummyAdmin()
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.engine = test_engine
+        c.session_factory = TestingSessionLocal
+        c.call_id = call_id
+        yield c
+
+    app.dependency_overrides = {}
+
+
+def test_csv_export_joins_applicant_attachments_and_reviews(client):
+    resp = client.get(f"/calls/{client.call_id}/export.csv")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert "attachment" in resp.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert list(rows[0].keys()) == CSV_COLUMNS
+    assert len(rows) == 5
+    first = rows[0]
+    assert first["applicant_email"] == "u0@example.com"
+    assert first["applicant_organization"] == "Uni, Dept"
+    assert first["attachments"] == "f0.pdf"
+    assert first["reviewers"] == "Rev 0; Rev 1"
+    assert first["scores"] == "60; 70"
+    assert first["average_score"] == "65.0"
+    assert rows[4]["review_count"] == "0"
+    assert rows[4]["average_score"] == ""
+
+
+def test_ndjson_export_has_one_object_per_application(client):
+    resp = client.get(f"/calls/{client.call_id}/export.ndjson")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [row["applicant"]["email"] for row in rows] == [f"u{i}@example.com" for i in range(5)]
+    assert rows[1]["attachments"][0]["size"] == 11
+    assert [r["score"] for r in rows[1]["reviews"]] == [60, 70]
+    assert rows[2]["reviewers"] == []
+
+
+def test_missing_call_is_404(client):
+    assert client.get("/calls/999/export.csv").status_code == 404
+
+
+def test_rows_are_fetched_in_batches(client):
+    statements = []
+    event.listen(client.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    rows = list(iter_call_export_rows(client.session_factory, client.call_id, batch_size=2))
+
+    assert [row["application_id"] for row in rows] == sorted(row["application_id"] for row in rows)
+    assert len(rows) == 5
+    # One streamed query plus three detail queries for each of the three batches
+    assert len(statements) == 1 + 3 * 3
+
+
+def test_csv_header_is_sent_before_any_row_is_read():
+    def rows():
+        raise AssertionError("rows read too early")
+        yield
+
+    stream = csv_stream(rows())
+    assert next(stream).strip() == ",".join(CSV_COLUMNS)
+
+
+def test_documents_confirmed_matches_the_application_details(client):
+    db = client.session_factory()
+    rows = list(iter_call_export_rows(client.session_factory, client.call_id))
+    details = get_application_details(db, [row["application_id"] for row in rows])
+    db.close()
+    assert [row["documents_confirmed"] for row in rows] == [True, False, False, False, False]
+    assert [detail.documents_confirmed for detail in details] == [row["documents_confirmed"] for row in rows]
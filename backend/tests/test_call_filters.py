@@ -0,0 +1,126 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.dependencies import get_db, get_async_db
+from app.models.call import Call, CallStatus
+from app.services.response_cache import get_response_cache
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+DAY = timedelta(days=1)
+
+CALLS = [
+    # title, status, category, start, end
+    ("running, closes soon", CallStatus.PUBLISHED, "science", NOW - DAY, NOW + DAY),
+    ("running, closes later", CallStatus.PUBLISHED, "science", NOW - DAY, NOW + 5 * DAY),
+    ("running, never closes", CallStatus.PUBLISHED, "art", None, None),
+    ("running art", CallStatus.PUBLISHED, "art", NOW - DAY, NOW + 3 * DAY),
+    ("not started", CallStatus.PUBLISHED, "science", NOW + 2 * DAY, NOW + 9 * DAY),
+    ("ended", CallStatus.PUBLISHED, "science", NOW - 9 * DAY, NOW - DAY),
+    ("draft", CallStatus.DRAFT, "science", NOW - DAY, NOW + DAY),
+]
+
+
+@pytest.fixture()
+def client(tmp_path):
+    db_path = tmp_path / "filters.db"
+    test_engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    db = TestingSessionLocal()
+    for title, status, category, start, end in CALLS:
+        db.add(Call(title=title, status=status, category=category, start_date=start, end_date=end))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    get_response_cache.cache_clear()
+    app.middleware_stack = None
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.session_factory = TestingSessionLocal
+        yield c
+
+    app.dependency_overrides = {}
+
+
+def titles(resp):
+    assert resp.status_code == 200
+    return [call["title"] for call in resp.json()]
+
+
+def test_active_calls_in_a_category_by_deadline(client):
+    resp = client.get("/calls/?active=true&category=science&order=deadline")
+    assert titles(resp) == ["running, closes soon", "running, closes later"]
+    assert resp.headers["x-total-count"] == "2"
+    assert all(call["is_active"] for call in resp.json())
+
+
+def test_deadline_order_puts_open_ended_calls_last(client):
+    assert titles(client.get("/calls/?active=true&order=deadline")) == [
+        "running, closes soon", "running art", "running, closes later", "running, never closes",
+    ]
+
+
+def test_deadline_order_pages_without_gaps(client):
+    seen, url = [], "/calls/?order=deadline&limit=2"
+    while url:
+        resp = client.get(url)
+        assert resp.headers["x-total-count"] == str(len(CALLS))
+        seen.extend(titles(resp))
+        link = resp.headers.get("link")
+        url = link[1:link.index(">")] if link else None
+    assert sorted(seen) == sorted(title for title, *_ in CALLS)
+    assert seen[-1] == "running, never closes"
+
+
+def test_status_and_inactive_filters(client):
+    assert titles(client.get("/calls/?status=DRAFT")) == ["draft"]
+    assert set(titles(client.get("/calls/?active=false"))) == {"not started", "ended", "draft"}
+    assert client.get("/calls/?status=bogus").status_code == 422
+
+
+def test_active_at_a_given_time(client):
+    when = (NOW + 4 * DAY).isoformat()
+    resp = client.get("/calls/", params={"active": "true", "active_at": when, "order": "deadline"})
+    assert titles(resp) == ["running, closes later", "not started", "running, never closes"]
+
+
+def test_total_count_is_independent_of_page_size(client):
+    resp = client.get("/calls/?active=true&limit=1")
+    assert len(resp.json()) == 1
+    assert resp.headers["x-total-count"] == "4"
+
+
+def test_sql_expression_agrees_with_python_property(client):
+    db = client.session_factory()
+    in_sql = set(db.scalars(select(Call.title).where(Call.is_active)))
+    in_python = {call.title for call in db.scalars(select(Call)) if call.is_active}
+    db.close()
+    assert in_sql == in_python == {"running, closes soon", "running, closes later", "running, never closes", "running art"}
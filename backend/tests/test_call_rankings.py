@@ -0,0 +1,167 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.dependencies import get_db, get_async_db, get_current_admin, get_current_user
+from app.models.application import Application, ApplicationStatus
+from app.models.application_reviewer import ApplicationReviewer
+from app.models.call import Call
+from app.models.review import Review
+from app.models.user import User, UserRole
+from app.services.response_cache import get_rankings_cache
+
+
+class DummyAdmin:
+    id = 0
+    role = UserRole.ADMIN
+
+
+class DummyReviewer:
+    role = UserRole.REVIEWER
+
+    def __init__(self, user_id):
+        self.id = user_id
+
+
+@pytest.fixture()
+def client(tmp_path):
+    db_path = tmp_path / "rankings.db"
+    test_engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    db = TestingSessionLocal()
+    call = Call(title="Ranked call", is_open=True)
+    reviewers = [User(email=f"rev{i}@example.com", hashed_password="x", role=UserRole.REVIEWER) for i in range(3)]
+    applicants = [User(email=f"app{i}@example.com", hashed_password="x") for i in range(5)]
+    db.add_all([call, *reviewers, *applicants])
+    db.flush()
+    apps = [
+        Application(user_id=u.id, call_id=call.id, content="x",
+                    status=ApplicationStatus.CANCELLED if i == 4 else ApplicationStatus.SUBMITTED)
+        for i, u in enumerate(applicants)
+    ]
+    db.add_all(apps)
+    db.flush()
+    r0, r1, r2 = (r.id for r in reviewers)
+    assignments = {0: [r0, r1], 1: [r0, r1, r2], 2: [r0], 4: [r0]}
+    scores = {0: {r0: 80, r1: 90}, 1: {r0: 95, r1: 40}, 2: {r0: 85}, 4: {r0: 100}}
+    for i, users in assignments.items():
+        db.add_all(ApplicationReviewer(application_id=apps[i].id, user_id=u) for u in users)
+    for i, by_reviewer in scores.items():
+        db.add_all(Review(application_id=apps[i].id, reviewer_id=u, score=s) for u, s in by_reviewer.items())
+    db.commit()
+    ids = {"call": call.id, "apps": [a.id for a in apps], "reviewers": [r0, r1, r2]}
+    db.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_admin] = lambda: DummyAdmin()
+    get_rankings_cache.cache_clear()
+    app.middleware_stack = None
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.ids = ids
+        c.engine = async_engine.sync_engine
+        yield c
+
+    app.dependency_overrides = {}
+    get_rankings_cache.cache_clear()
+
+
+def test_rankings_are_aggregated_ordered_and_flagged(client):
+    apps = client.ids["apps"]
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(client.engine, "before_cursor_execute", capture)
+    resp = client.get(f"/calls/{client.ids['call']}/rankings")
+    event.remove(client.engine, "before_cursor_execute", capture)
+
+    assert resp.status_code == 200
+    # The call lookup and one aggregate query, however many reviews there are
+    assert len(statements) == 2
+    rows = resp.json()
+    assert [(r["rank"], r["application_id"]) for r in rows] == [(1, apps[0]), (1, apps[2]), (3, apps[1]), (4, apps[3])]
+    first, _, split, unreviewed = rows
+    assert first == {
+        "rank": 1, "application_id": apps[0], "user_id": first["user_id"], "review_count": 2,
+        "assigned_reviewers": 2, "mean_score": 85.0, "min_score": 80, "max_score": 90, "spread": 10,
+        "missing_reviews": False, "divergent": False,
+    }
+    assert (split["mean_score"], split["spread"], split["missing_reviews"], split["divergent"]) == (67.5, 55, True, True)
+    assert (unreviewed["review_count"], unreviewed["mean_score"], unreviewed["missing_reviews"]) == (0, None, True)
+
+    relaxed = client.get(f"/calls/{client.ids['call']}/rankings?divergence=60").json()
+    assert not any(r["divergent"] for r in relaxed)
+
+
+def test_rankings_are_paginated(client):
+    url = f"/calls/{client.ids['call']}/rankings?limit=3"
+    first = client.get(url)
+    assert [r["rank"] for r in first.json()] == [1, 1, 3]
+    second = client.get(url + f"&cursor={first.headers['x-next-cursor']}")
+    assert [r["application_id"] for r in second.json()] == [client.ids["apps"][3]]
+    assert "x-next-cursor" not in second.headers
+    assert client.get("/calls/999/rankings").status_code == 404
+
+
+def test_review_writes_invalidate_the_cached_rankings(client):
+    url = f"/calls/{client.ids['call']}/rankings"
+    assert client.get(url).headers["x-cache"] == "MISS"
+    assert client.get(url).headers["x-cache"] == "HIT"
+
+    app.dependency_overrides[get_current_user] = lambda: DummyReviewer(client.ids["reviewers"][2])
+    resp = client.post("/reviews/", json={"application_id": client.ids["apps"][1], "score": 60})
+    assert resp.status_code == 201
+    after_submit = client.get(url)
+    assert after_submit.headers["x-cache"] == "MISS"
+    split = next(r for r in after_submit.json() if r["application_id"] == client.ids["apps"][1])
+    assert (split["review_count"], split["mean_score"], split["missing_reviews"]) == (3, 65.0, False)
+
+    client.patch(f"/reviews/{resp.json()['id']}?score=100")
+    after_update = client.get(url)
+    assert after_update.headers["x-cache"] == "MISS"
+    split = next(r for r in after_update.json() if r["application_id"] == client.ids["apps"][1])
+    assert split["mean_score"] == pytest.approx(235 / 3)
+
+
+def test_normalized_rankings_sit_next_to_the_raw_ones(client):
+    raw = {r["application_id"]: r for r in client.get(f"/calls/{client.ids['call']}/rankings").json()}
+    for method in ("zscore", "calibration"):
+        resp = client.get(f"/calls/{client.ids['call']}/rankings/normalized?method={method}")
+        assert resp.status_code == 200
+        rows = resp.json()
+        # Only reviewed applications are ranked
+        assert {r["application_id"] for r in rows} == set(client.ids["apps"][:3])
+        assert [r["rank"] for r in rows] == sorted(r["rank"] for r in rows)
+        for row in rows:
+            assert row["raw_rank"] == raw[row["application_id"]]["rank"]
+            assert row["mean_score"] == raw[row["application_id"]]["mean_score"]
+    assert client.get(f"/calls/{client.ids['call']}/rankings/normalized?method=median").status_code == 422
+    assert client.get("/calls/999/rankings/normalized").status_code == 404
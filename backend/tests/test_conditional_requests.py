@@ -0,0 +1,201 @@
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from starlette.requests import Request
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.dependencies import get_db, get_async_db, get_current_user
+from app.models.application import Application
+from app.models.application_reviewer import ApplicationReviewer
+from app.models.attachment import Attachment
+from app.models.call import Call
+from app.models.user import User, UserRole
+from app.services.principal_cache import Principal
+from app.services.response_cache import get_response_cache
+from app.utils.conditional import Validators
+
+STAMP = datetime(2025, 3, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def make_request(**headers):
+    raw = [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def test_validators_match_weakly_and_prefer_if_none_match():
+    validators = Validators.from_version((1, STAMP))
+    strong = validators.etag.removeprefix("W/")
+    assert validators.matches(make_request(if_none_match=f'"other", {strong}'))
+    assert validators.matches(make_request(if_none_match="*"))
+    assert not validators.matches(make_request(if_none_match='"other"'))
+    # If-Modified-Since is ignored when If-None-Match is present
+    assert not validators.matches(
+        make_request(if_none_match='"other"', if_modified_since=format_datetime(STAMP, usegmt=True))
+    )
+
+
+def test_if_modified_since_uses_second_resolution():
+    validators = Validators.from_version((1, STAMP.replace(microsecond=500)))
+    assert validators.matches(make_request(if_modified_since=format_datetime(STAMP, usegmt=True)))
+    assert not validators.matches(make_request(if_modified_since="Sat, 01 Mar 2025 11:59:59 GMT"))
+    assert not validators.matches(make_request(if_modified_since="not a date"))
+
+
+@pytest.fixture()
+def client(tmp_path):
+    db_path = tmp_path / "conditional.db"
+    test_engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    db = TestingSessionLocal()
+    owner = User(email="owner@example.com", hashed_password="x", updated_at=STAMP)
+    admin = User(email="admin@example.com", hashed_password="x", role=UserRole.ADMIN, updated_at=STAMP)
+    reviewer = User(email="rev@example.com", hashed_password="x", role=UserRole.REVIEWER, updated_at=STAMP)
+    call = Call(title="conditional call", is_open=True)
+    db.add_all([owner, admin, reviewer, call])
+    db.flush()
+    application = Application(user_id=owner.id, call_id=call.id, content="x" * 10_000, updated_at=STAMP)
+    db.add(application)
+    db.flush()
+    db.add(Attachment(application_id=application.id, file_name="a.pdf", content_hash="0" * 64,
+                      storage_key="k", size=1, updated_at=STAMP))
+    db.commit()
+    ids = {"owner": owner.id, "admin": admin.id, "reviewer": reviewer.id, "app": application.id}
+    principals = {name: Principal.from_user(user) for name, user in (("owner", owner), ("admin", admin))}
+    db.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    caller = {"user": principals["admin"]}
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_user] = lambda: caller["user"]
+    get_response_cache.cache_clear()
+    app.middleware_stack = None
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.ids = ids
+        c.engine = test_engine
+        c.session_factory = TestingSessionLocal
+        c.login_as = lambda name: caller.update(user=principals[name])
+        yield c
+
+    app.dependency_overrides = {}
+
+
+def revalidate(client, url):
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    again = client.get(url, headers={"If-None-Match": etag})
+    return first, again
+
+
+def test_application_details_answer_304_after_one_version_query(client):
+    url = f"/applications/{client.ids['app']}/details"
+    first = client.get(url)
+    assert first.headers["etag"].startswith('W/"')
+    # Counts over nested rows cannot be expressed as a modification time
+    assert "last-modified" not in first.headers
+
+    statements = []
+    event.listen(client.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    again = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == first.headers["etag"]
+    assert len(statements) == 1
+
+
+def test_detail_etag_changes_with_nested_rows(client):
+    url = f"/applications/{client.ids['app']}/details"
+    etags = [client.get(url).headers["etag"]]
+
+    db = client.session_factory()
+    db.add(ApplicationReviewer(application_id=client.ids["app"], user_id=client.ids["reviewer"]))
+    db.commit()
+    etags.append(client.get(url).headers["etag"])
+
+    db.add(Attachment(application_id=client.ids["app"], file_name="b.pdf", content_hash="1" * 64,
+                      storage_key="k2", size=1))
+    db.commit()
+    etags.append(client.get(url).headers["etag"])
+
+    db.get(User, client.ids["reviewer"]).first_name = "Renamed"
+    db.commit()
+    db.close()
+    etags.append(client.get(url).headers["etag"])
+
+    assert len(set(etags)) == 4
+
+
+def test_if_modified_since_is_ignored_for_nested_rows(client):
+    url = f"/applications/{client.ids['app']}/details"
+    since = {"If-Modified-Since": format_datetime(STAMP, usegmt=True)}
+    assert client.get(url, headers=since).status_code == 200
+
+    # The reviewer was last updated before STAMP, so a max() of the stamps would not move
+    db = client.session_factory()
+    db.add(ApplicationReviewer(application_id=client.ids["app"], user_id=client.ids["reviewer"]))
+    db.commit()
+    db.close()
+    resp = client.get(url, headers=since)
+    assert resp.status_code == 200
+    assert [r["id"] for r in resp.json()["reviewers"]] == [client.ids["reviewer"]]
+
+    client.login_as("owner")
+    attachments = client.get(f"/applications/{client.ids['app']}/attachments", headers=since)
+    assert attachments.status_code == 200
+    assert "last-modified" not in attachments.headers
+
+
+def test_owner_application_and_attachment_list(client):
+    client.login_as("owner")
+    _, again = revalidate(client, f"/applications/{client.ids['app']}")
+    assert again.status_code == 304
+
+    _, again = revalidate(client, f"/applications/{client.ids['app']}/attachments")
+    assert again.status_code == 304
+
+    resp = client.get(f"/applications/{client.ids['app']}",
+                      headers={"If-Modified-Since": format_datetime(STAMP, usegmt=True)})
+    assert resp.status_code == 304
+
+
+def test_current_user_and_calls_revalidate(client):
+    client.login_as("owner")
+    _, again = revalidate(client, "/users/me")
+    assert again.status_code == 304
+
+    first, again = revalidate(client, "/calls/1")
+    assert again.status_code == 304
+    assert again.headers["etag"] == first.headers["etag"]
+
+
+def test_stale_etag_gets_full_response(client):
+    resp = client.get(f"/applications/{client.ids['app']}/details", headers={"If-None-Match": 'W/"stale"'})
+    assert resp.status_code == 200
+    assert resp.json()["id"] == client.ids["app"]
@@ -0,0 +1,236 @@
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.crud.email_outbox import claim_due_emails, count_by_status, enqueue_emails
+from app.config import settings
+from app.dependencies import get_db, get_async_db
+from app.models.email_outbox import EmailOutbox, EmailStatus
+from app.models.user import User
+from app.services.email_sender import OutboxSender, SmtpConnectionPool, TokenBucket
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    test_engine = create_engine(f"sqlite:///{tmp_path / 'outbox.db'}", connect_args={"check_same_thread": False})
+    database.Base.metadata.create_all(bind=test_engine)
+    yield sessionmaker(bind=test_engine)
+    test_engine.dispose()
+
+
+def queue(session_factory, count, to="user{}@example.com"):
+    db = session_factory()
+    enqueue_emails(db, [(to.format(i), f"subject {i}", f"<p>{i}</p>") for i in range(count)])
+    db.close()
+
+
+def outbox_rows(session_factory):
+    db = session_factory()
+    rows = db.scalars(select(EmailOutbox).order_by(EmailOutbox.id)).all()
+    db.close()
+    return rows
+
+
+@pytest.fixture()
+def smtp_server():
+    pytest.importorskip("aiosmtpd")
+    from aiosmtpd.controller import Controller
+
+    class Recorder:
+        def __init__(self):
+            self.messages = []
+            self.sessions = 0
+
+        async def handle_EHLO(self, server, session, envelope, hostname, responses):
+            self.sessions += 1
+            session.host_name = hostname
+            return responses
+
+        async def handle_DATA(self, server, session, envelope):
+            self.messages.append(envelope)
+            return "250 OK"
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    handler = Recorder()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield handler, SmtpConnectionPool("127.0.0.1", port, use_ssl=False, size=2, timeout=5)
+    controller.stop()
+
+
+def test_batches_reuse_pooled_connections(session_factory, smtp_server):
+    handler, pool = smtp_server
+    queue(session_factory, 12)
+    sender = OutboxSender(pool.send, session_factory, batch_size=5, rate_per_second=0, workers=2)
+
+    result = asyncio.run(sender.drain())
+    pool.close()
+
+    assert (result.claimed, result.sent, result.failed) == (12, 12, 0)
+    assert sorted(env.rcpt_tos[0] for env in handler.messages) == sorted(f"user{i}@example.com" for i in range(12))
+    # One TLS/login handshake per pooled connection, not per message
+    assert pool.connects <= 2
+    assert handler.sessions == pool.connects
+    assert all(row.status == EmailStatus.SENT and row.sent_at for row in outbox_rows(session_factory))
+
+
+def test_dropped_connection_is_replaced(session_factory, smtp_server):
+    handler, pool = smtp_server
+    queue(session_factory, 1)
+    sender = OutboxSender(pool.send, session_factory, rate_per_second=0)
+    asyncio.run(sender.drain())
+    # The server (or a NAT) closed the idle connection
+    pool._idle.queue[0].sock.shutdown(socket.SHUT_RDWR)
+
+    queue(session_factory, 1)
+    assert asyncio.run(sender.drain()).sent == 1
+    assert len(handler.messages) == 2
+    assert pool.connects == 2
+    pool.close()
+
+
+def test_failures_back_off_then_give_up(session_factory):
+    queue(session_factory, 3)
+    delivered = []
+
+    def flaky(msg):
+        if msg["To"] == "user1@example.com":
+            raise ConnectionRefusedError("relay down")
+        delivered.append(msg["To"])
+
+    sender = OutboxSender(flaky, session_factory, rate_per_second=0, max_attempts=2, retry_backoff=60)
+    assert asyncio.run(sender.drain()).failed == 1
+    # Not due again until the backoff has passed
+    assert asyncio.run(sender.drain()).claimed == 0
+    failed = outbox_rows(session_factory)[1]
+    assert (failed.status, failed.attempts, failed.last_error) == (EmailStatus.PENDING, 1, "relay down")
+
+    db = session_factory()
+    db.execute(update(EmailOutbox).values(next_attempt_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+    db.commit()
+    db.close()
+    assert asyncio.run(sender.drain()).claimed == 1
+    failed = outbox_rows(session_factory)[1]
+    assert (failed.status, failed.attempts) == (EmailStatus.FAILED, 2)
+    assert delivered == ["user0@example.com", "user2@example.com"]
+
+
+def test_claims_are_leased(session_factory):
+    queue(session_factory, 4)
+    db = session_factory()
+    first = claim_due_emails(db, limit=3, lease_seconds=300)
+    second = claim_due_emails(db, limit=3, lease_seconds=300)
+    assert [row.id for row in first] == [1, 2, 3]
+    assert [row.id for row in second] == [4]
+
+    # A sender that died holding its claim: the rows come back once the lease ends
+    queue(session_factory, 1)
+    crashed = claim_due_emails(db, limit=1, lease_seconds=0)
+    assert [row.id for row in claim_due_emails(db, limit=5, lease_seconds=300)] == [row.id for row in crashed]
+    assert count_by_status(db) == {"pending": 5, "sent": 0, "failed": 0}
+    db.close()
+
+
+def test_token_bucket_spreads_sends():
+    now = [0.0]
+    bucket = TokenBucket(rate=10, burst=2, clock=lambda: now[0])
+    assert [bucket.delay() for _ in range(4)] == pytest.approx([0, 0, 0.1, 0.2])
+    now[0] = 1.0
+    assert bucket.delay() == 0
+    assert TokenBucket(rate=0).delay() == 0
+
+
+def test_password_reset_is_queued_not_sent(session_factory):
+    db = session_factory()
+    db.add(User(email="reset@example.com", hashed_password="x"))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.middleware_stack = None
+    try:
+        with TestClient(app, base_url="http://localhost") as client:
+            assert client.post("/auth/password-reset", json={"email": "reset@example.com"}).status_code == 200
+            assert client.post("/auth/password-reset", json={"email": "nobody@example.com"}).status_code == 200
+    finally:
+        app.dependency_overrides = {}
+
+    [row] = outbox_rows(session_factory)
+    assert row.to_email == "reset@example.com"
+    assert "/password-reset/" in row.body
+    assert row.status == EmailStatus.PENDING
+
+
+def test_account_emails_are_queued_in_the_same_transaction(session_factory, monkeypatch):
+    db = session_factory()
+    db.add(User(email="reset@example.com", hashed_password="x"))
+    db.commit()
+    db.close()
+    url = session_factory.kw["bind"].url
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{url.database}", poolclass=NullPool)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    def failing_enqueue(*args, **kwargs):
+        raise RuntimeError("outbox unavailable")
+
+    async def failing_enqueue_async(*args, **kwargs):
+        failing_enqueue()
+
+    monkeypatch.setattr(settings, "environment", "production")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.middleware_stack = None
+    new_user = {"email": "new@example.com", "password": "Secret123!"}
+    try:
+        with TestClient(app, base_url="http://localhost", raise_server_exceptions=False) as client:
+            with monkeypatch.context() as m:
+                m.setattr("app.utils.email.enqueue_email_async", failing_enqueue_async)
+                m.setattr("app.utils.email.enqueue_email", failing_enqueue)
+                assert client.post("/auth/register", json=new_user).status_code == 500
+                assert client.post("/auth/password-reset", json={"email": "reset@example.com"}).status_code == 500
+            # Neither the account nor the reset token outlived the failed email
+            db = session_factory()
+            assert db.scalar(select(User).where(User.email == "new@example.com")) is None
+            assert db.scalar(select(User.password_reset_token).where(User.email == "reset@example.com")) is None
+            db.close()
+
+            assert client.post("/auth/register", json=new_user).status_code == 201
+    finally:
+        app.dependency_overrides = {}
+
+    [row] = outbox_rows(session_factory)
+    assert row.to_email == "new@example.com"
+    assert "/users/verify/" in row.body
@@ -0,0 +1,115 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.dependencies import get_db, get_async_db, get_current_admin
+from app.models.call import Call
+from app.models.user import User, UserRole
+from app.services.response_cache import get_response_cache
+from app.utils.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor
+
+
+class DummyAdmin:
+    id = 0
+    role = UserRole.ADMIN
+
+
+@pytest.fixture()
+def client(tmp_path):
+    db_path = tmp_path / "pages.db"
+    test_engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    session = TestingSessionLocal()
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    # Several calls share a timestamp so the id tie-breaker is exercised
+    for i in range(7):
+        session.add(Call(title=f"call {i}", is_open=i % 2 == 0, created_at=base + timedelta(days=i // 3)))
+    for i in range(5):
+        session.add(User(email=f"r{i}@example.com", hashed_password="x", role=UserRole.REVIEWER, created_at=base))
+    session.add(User(email="a@example.com", hashed_password="x", role=UserRole.APPLICANT, created_at=base))
+    session.commit()
+    session.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_admin] = lambda: DummyAdmin()
+    get_response_cache.cache_clear()
+
+    with TestClient(app, base_url="http://localhost") as c:
+        yield c
+
+    app.dependency_overrides = {}
+
+
+def collect(client, url):
+    seen, pages = [], 0
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        seen.extend(item["id"] for item in resp.json())
+        pages += 1
+        link = resp.headers.get("link")
+        url = link[1:link.index(">")] if link else None
+    return seen, pages
+
+
+def test_cursor_roundtrip():
+    ts = datetime(2025, 5, 1, 12, 30, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+
+
+def test_calls_are_paged_without_gaps_or_duplicates(client):
+    seen, pages = collect(client, "/calls/?limit=3")
+    assert seen == list(range(1, 8))
+    assert pages == 3
+
+    open_ids, _ = collect(client, "/calls/?only_open=true&limit=2")
+    assert open_ids == [1, 3, 5, 7]
+
+
+def test_user_lists_are_paged(client):
+    reviewers, pages = collect(client, "/users/admin/reviewers?limit=2")
+    assert len(reviewers) == 5
+    assert pages == 3
+    everyone, _ = collect(client, "/users/?limit=4")
+    assert len(everyone) == 6
+
+
+def test_last_page_has_no_next_link(client):
+    resp = client.get("/calls/?limit=50")
+    assert "link" not in resp.headers
+    assert "x-next-cursor" not in resp.headers
+
+
+def test_page_size_is_capped(client):
+    assert client.get(f"/calls/?limit={MAX_PAGE_SIZE + 1}").status_code == 422
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/calls/?cursor=not-a-cursor").status_code == 400
@@ -0,0 +1,189 @@
+import io
+import os
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from pypdf import PdfReader
+from pypdf import PdfWriter
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.dependencies import get_current_admin
+from app.models.application import Application
+from app.models.attachment import Attachment
+from app.models.call import Call
+from app.models.user import User, UserRole
+from app.routes import calls as calls_routes
+from app.services.pdf_export import CHUNK_TEMPLATE, TOC_TEMPLATE, PdfExportService, load_export_context
+
+renders = []
+
+
+def fake_renderer(template, context, out_path):
+    """Stand-in for wkhtmltopdf: one page per application (two for even ids)."""
+    renders.append((template, context))
+    writer = PdfWriter()
+    if template == TOC_TEMPLATE:
+        for _ in range(max(1, len(context["entries"]) // 4)):
+            writer.add_blank_page(200, 200)
+    else:
+        for app in context["applications"]:
+            first = len(writer.pages)
+            for _ in range(2 if app["id"] % 2 == 0 else 1):
+                writer.add_blank_page(200, 200)
+            writer.add_outline_item(f"Application #{app['id']}", first)
+    with open(out_path, "wb") as f:
+        writer.write(f)
+
+
+def chunk_renders():
+    return [context for template, context in renders if template == CHUNK_TEMPLATE]
+
+
+class DummyAdmin:
+    id = 0
+    role = UserRole.ADMIN
+
+
+@pytest.fixture()
+def client(tmp_path, monkeypatch):
+    test_engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    db = TestingSessionLocal()
+    call = Call(title="export call", is_open=True)
+    db.add(call)
+    db.flush()
+    for i in range(3):
+        user = User(email=f"u{i}@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        application = Application(user_id=user.id, call_id=call.id, content=f"app {i}")
+        db.add(application)
+        db.flush()
+        db.add(Attachment(application_id=application.id, file_name=f"f{i}.pdf", content_hash="0" * 64,
+                          storage_key="k", size=1))
+    db.commit()
+    db.close()
+
+    service = PdfExportService(
+        tmp_path / "exports",
+        executor_factory=lambda: ThreadPoolExecutor(max_workers=2),
+        renderer=fake_renderer,
+        session_factory=TestingSessionLocal,
+        chunk_size=2,
+    )
+    monkeypatch.setattr(calls_routes, "get_pdf_export_service", lambda: service)
+    app.dependency_overrides[get_current_admin] = lambda: DummyAdmin()
+    renders.clear()
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.session_factory = TestingSessionLocal
+        yield c
+
+    service.shutdown()
+    app.dependency_overrides = {}
+
+
+def wait_done(client, url):
+    for _ in range(100):
+        data = client.get(url).json()
+        if data["status"] in ("done", "failed"):
+            return data
+        time.sleep(0.02)
+    raise AssertionError("export did not finish")
+
+
+def test_export_job_lifecycle(client):
+    resp = client.post("/calls/1/exports")
+    assert resp.status_code == 202
+    job = wait_done(client, resp.headers["location"])
+    assert job["status"] == "done"
+
+    pdf = client.get(job["download_url"])
+    assert pdf.status_code == 200
+    assert pdf.headers["content-type"] == "application/pdf"
+    reader = PdfReader(io.BytesIO(pdf.content))
+    # TOC page, then applications 1 (1 page), 2 (2 pages) and 3 (1 page)
+    assert len(reader.pages) == 5
+    assert [(o.title, reader.get_destination_page_number(o)) for o in reader.outline] == [
+        ("Application #1", 1), ("Application #2", 2), ("Application #3", 4),
+    ]
+    assert sorted(len(c["applications"]) for c in chunk_renders()) == [1, 2]
+
+    events = client.get(job["events_url"])
+    assert events.headers["content-type"].startswith("text/event-stream")
+    assert '"status":"done"' in events.text
+
+
+def test_unchanged_call_reuses_cached_artifact(client):
+    first = client.post("/calls/1/exports").json()
+    wait_done(client, first["status_url"])
+    again = client.post("/calls/1/exports").json()
+    assert again["id"] == first["id"]
+    assert again["status"] == "done"
+    assert len(chunk_renders()) == 2
+
+    db = client.session_factory()
+    edited = db.get(Application, 1)
+    edited.content = "edited"
+    # SQLite timestamps have one-second resolution; make the edit visible
+    edited.updated_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    db.commit()
+    db.close()
+    changed = client.post("/calls/1/exports").json()
+    assert changed["id"] != first["id"]
+    wait_done(client, changed["status_url"])
+    assert len(chunk_renders()) == 4
+    # The previous version's artifact is pruned
+    assert client.get(first["status_url"]).status_code == 404
+
+
+def test_legacy_url_serves_cached_pdf(client):
+    resp = client.get("/calls/1/export-applications.pdf")
+    assert resp.status_code == 202
+    wait_done(client, resp.headers["location"])
+    assert client.get("/calls/1/export-applications.pdf").content.startswith(b"%PDF")
+
+
+def test_unknown_call(client):
+    assert client.post("/calls/999/exports").status_code == 404
+
+
+def test_export_context_includes_attachments(client):
+    db = client.session_factory()
+    context = load_export_context(db, 1)
+    db.close()
+    assert [a["attachments"][0]["file_name"] for a in context["applications"]] == ["f0.pdf", "f1.pdf", "f2.pdf"]
+
+
+def test_toc_page_numbers_account_for_long_toc(client):
+    db = client.session_factory()
+    call = Call(title="large call", is_open=True)
+    db.add(call)
+    db.flush()
+    for i in range(9):
+        user = User(email=f"large{i}@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add(Application(user_id=user.id, call_id=call.id, content="c"))
+    db.commit()
+    call_id = call.id
+    db.close()
+
+    job = wait_done(client, client.post(f"/calls/{call_id}/exports").json()["status_url"])
+    reader = PdfReader(io.BytesIO(client.get(job["download_url"]).content))
+    toc = [c for t, c in renders if t == TOC_TEMPLATE][-1]
+    # Nine entries need two TOC pages, so the first application starts on page 3
+    assert toc["entries"][0]["page"] == 3
+    first = reader.outline[0]
+    assert reader.get_destination_page_number(first) == 2
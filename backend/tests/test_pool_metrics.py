@@ -0,0 +1,72 @@
+import os
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app.database import InstrumentedQueuePool, PoolMetrics, pool_status
+from app.dependencies import get_current_admin
+from app.models.user import UserRole
+
+
+class DummyAdmin:
+    id = 0
+    role = UserRole.ADMIN
+
+
+def make_engine(tmp_path, **kwargs):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, **kwargs
+    )
+    engine.pool.metrics = PoolMetrics()
+    return engine
+
+
+def test_checkouts_and_timeouts_are_counted(tmp_path):
+    engine = make_engine(tmp_path, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    held = engine.connect()
+    status = pool_status(engine)
+    assert status["checked_out"] == 1
+    assert status["checkouts"] == 1
+
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    status = pool_status(engine)
+    assert status["timeouts"] == 1
+    assert status["wait_seconds_max"] >= 0.05
+    assert status["wait_histogram"]["+Inf"] == 2
+    held.close()
+
+
+def test_waiting_checkout_is_timed(tmp_path):
+    engine = make_engine(tmp_path, pool_size=1, max_overflow=0, pool_timeout=5)
+    held = engine.connect()
+    threading.Timer(0.1, held.close).start()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert pool_status(engine)["wait_histogram"]["0.05"] == 1
+
+
+def test_metrics_survive_dispose(tmp_path):
+    engine = make_engine(tmp_path)
+    engine.connect().close()
+    engine.dispose()
+    assert pool_status(engine)["checkouts"] == 1
+
+
+def test_pool_metrics_endpoint_is_admin_only():
+    with TestClient(app, base_url="http://localhost") as client:
+        assert client.get("/admin/metrics/db-pool").status_code == 401
+        app.dependency_overrides[get_current_admin] = lambda: DummyAdmin()
+        try:
+            data = client.get("/admin/metrics/db-pool").json()
+        finally:
+            app.dependency_overrides = {}
+    assert {"settings", "sync", "async"} <= data.keys()
+    assert "wait_histogram" in data["sync"]
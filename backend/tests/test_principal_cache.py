@@ -0,0 +1,62 @@
+import os
+import time
+from datetime import datetime, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.models.user import UserRole
+from app.services.principal_cache import Principal, PrincipalCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_principal(user_id):
+    now = datetime.now(timezone.utc)
+    return Principal(
+        id=user_id, email=f"u{user_id}@example.com", role=UserRole.APPLICANT, first_name=None,
+        last_name=None, organization=None, is_active=True, is_verified=True, last_login=None,
+        created_at=now, updated_at=now,
+    )
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = PrincipalCache(maxsize=10, ttl=30, clock=clock)
+    cache.put("token", make_principal(1))
+    assert cache.get("token").id == 1
+    clock.now = 31
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_entries_do_not_outlive_the_token():
+    cache = PrincipalCache(maxsize=10, ttl=3600)
+    cache.put("expired", make_principal(1), token_exp=time.time() - 1)
+    assert cache.get("expired") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PrincipalCache(maxsize=2, ttl=60)
+    cache.put("a", make_principal(1))
+    cache.put("b", make_principal(2))
+    cache.get("a")
+    cache.put("c", make_principal(3))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+
+def test_invalidate_drops_every_token_of_a_user():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    cache.put("t1", make_principal(1))
+    cache.put("t2", make_principal(1))
+    cache.put("t3", make_principal(2))
+    cache.invalidate(1)
+    assert cache.get("t1") is None and cache.get("t2") is None
+    assert cache.get("t3").id == 2
@@ -0,0 +1,224 @@
+import asyncio
+import os
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app import database
+from app import migrate_indexes
+from app.crud import application as application_crud
+from app.crud.call import filter_calls, search_calls_async
+from app.crud import attachment as attachment_crud
+from app.crud import document as document_crud
+from app.crud import review as review_crud
+from app.crud import user as user_crud
+from app.crud.review_queue import pending_assignments
+from app.crud.reviewer_invite import accept_invite
+from app.services.score_normalization import load_score_matrix
+from app.models.application import Application
+from app.models.application_reviewer import ApplicationReviewer
+from app.models.attachment import Attachment
+from app.models.call import Call, CallStatus
+from app.models.call_reviewer import CallReviewer
+from app.models.document import DocumentDefinition
+from app.models.review import Review
+from app.models.reviewer_invite import ReviewerInvite
+from app.models.user import User, UserRole
+
+USERS, CALLS = 60, 6
+
+# "SCAN t" reads the whole table; "SCAN t USING INDEX" walks an index in order
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?! USING (COVERING )?INDEX)")
+
+
+@pytest.fixture()
+def seeded(tmp_path):
+    test_engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    database.Base.metadata.create_all(bind=test_engine)
+    Session = sessionmaker(bind=test_engine)
+
+    db = Session()
+    users = [
+        User(email=f"user{i}@example.com", hashed_password="x",
+             role=UserRole.REVIEWER if i % 10 == 0 else UserRole.APPLICANT,
+             verification_token=f"verify-{i}", password_reset_token=f"reset-{i}",
+             password_reset_expires=datetime.utcnow() + timedelta(hours=1))
+        for i in range(USERS)
+    ]
+    calls = [Call(title=f"call {i}", is_open=True) for i in range(CALLS)]
+    db.add_all(users + calls)
+    db.flush()
+    reviewers = [u for u in users if u.role == UserRole.REVIEWER]
+    for call in calls:
+        db.add(DocumentDefinition(call_id=call.id, name="CV", allowed_formats="pdf"))
+        db.add_all(CallReviewer(call_id=call.id, reviewer_id=r.id) for r in reviewers)
+        for user in users:
+            if user.role == UserRole.REVIEWER:
+                continue
+            application = Application(user_id=user.id, call_id=call.id, content="x")
+            db.add(application)
+            db.flush()
+            db.add(Attachment(application_id=application.id, file_name="a.pdf",
+                              content_hash=f"{application.id:064d}", storage_key="k", size=1))
+            db.add(ApplicationReviewer(application_id=application.id, user_id=reviewers[0].id))
+            db.add(Review(application_id=application.id, reviewer_id=reviewers[0].id, score=5))
+    db.add(ReviewerInvite(call_id=calls[0].id, email="new@example.com", token="invite",
+                          expires_at=datetime.utcnow() + timedelta(days=1)))
+    db.commit()
+    db.close()
+
+    yield test_engine, Session
+    test_engine.dispose()
+
+
+def query_plans(engine, operation, source=None):
+    """Run ``operation`` and return each of its queries with its plan details.
+
+    Queries are captured on ``source`` (default ``engine``) and explained on ``engine``.
+    """
+    source = source or engine
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(source, "before_cursor_execute", capture)
+    try:
+        operation()
+    finally:
+        event.remove(source, "before_cursor_execute", capture)
+    assert statements, "operation ran no queries"
+
+    with engine.connect() as conn:
+        return [
+            (statement, [detail for *_, detail in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)])
+            for statement, parameters in statements
+        ]
+
+
+def full_scans(engine, operation):
+    """Run ``operation`` and return every full table scan in its queries' plans."""
+    scans = []
+    for statement, details in query_plans(engine, operation):
+        for detail in details:
+            match = FULL_SCAN.match(detail)
+            # Subqueries show up as SCAN of their alias; only real tables count
+            if match and match.group(1) in database.Base.metadata.tables:
+                scans.append((detail, statement))
+    return scans
+
+
+def crud_operations(Session):
+    db = Session()
+    app_id, reviewer_id, user_id, call_id = 7, 1, 2, 1
+    invite = db.query(ReviewerInvite).first()
+    return db, {
+        "application by user and call": lambda: application_crud.get_application_by_user_and_call(db, user_id, call_id),
+        "reviewer assigned": lambda: application_crud.is_reviewer_assigned(db, app_id, reviewer_id),
+        "application detail": lambda: application_crud.get_application_detail(db, app_id),
+        "application detail version": lambda: application_crud.get_application_detail_version(db, app_id),
+        "applications by call": lambda: application_crud.paginate_applications_by_call(db, call_id, limit=10),
+        "applications by user": lambda: application_crud.get_applications_by_user(db, user_id),
+        "attachments": lambda: attachment_crud.get_attachments_by_application(db, app_id),
+        "attachments version": lambda: attachment_crud.get_attachments_version(db, app_id),
+        "attachments confirmed": lambda: attachment_crud.attachments_confirmed(db, app_id),
+        "reviews by application": lambda: review_crud.get_reviews_by_application(db, app_id),
+        "reviews by reviewer": lambda: review_crud.get_reviews_by_reviewer(db, reviewer_id),
+        "call rankings": lambda: review_crud.get_call_rankings(db, call_id, limit=10),
+        "score matrix": lambda: load_score_matrix(db, call_id),
+        "review queue": lambda: db.execute(pending_assignments(reviewer_id, datetime.utcnow())).all(),
+        "document definitions": lambda: document_crud.list_document_definitions(db, call_id),
+        "accept invite": lambda: accept_invite(db, invite, reviewer_id),
+        "verify email": lambda: user_crud.verify_user(db, "verify-3"),
+        "reset password": lambda: user_crud.reset_password(db, "reset-4", "new-password"),
+    }
+
+
+def test_crud_queries_use_indexes(seeded):
+    engine, Session = seeded
+    db, operations = crud_operations(Session)
+    try:
+        failures = {name: full_scans(engine, operation) for name, operation in operations.items()}
+    finally:
+        db.close()
+    assert {name: scans for name, scans in failures.items() if scans} == {}
+
+
+def test_deadline_listing_is_ordered_by_an_index(seeded):
+    engine, _ = seeded
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{engine.url.database}", poolclass=NullPool)
+
+    async def list_by_deadline(**filters):
+        async with AsyncSession(async_engine) as db:
+            page, _ = await search_calls_async(db, filter_calls(**filters), order="deadline", limit=2)
+            # The second page starts among the calls without a deadline
+            await search_calls_async(db, filter_calls(**filters), order="deadline", cursor=page.next_cursor)
+
+    for filters in ({"status": CallStatus.DRAFT}, {"status": CallStatus.DRAFT, "category": "science"}):
+        plans = query_plans(engine, lambda: asyncio.run(list_by_deadline(**filters)), async_engine.sync_engine)
+        pages = [details for statement, details in plans if "ORDER BY" in statement]
+        assert len(pages) == 2
+        for details in pages:
+            assert any("USING INDEX ix_calls_" in detail for detail in details), details
+            assert not any("TEMP B-TREE" in detail for detail in details), details
+    asyncio.run(async_engine.dispose())
+
+
+def test_dropping_an_index_is_caught(seeded):
+    engine, Session = seeded
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_attachments_application_id"))
+    db = Session()
+    try:
+        scans = full_scans(engine, lambda: attachment_crud.get_attachments_by_application(db, 7))
+    finally:
+        db.close()
+    assert [detail for detail, _ in scans] == ["SCAN attachments"]
+
+
+def test_migration_creates_missing_indexes_and_skips_duplicates(seeded):
+    engine, _ = seeded
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_document_definitions_call_id"))
+        conn.execute(text("DROP INDEX uq_call_reviewers_call_id_reviewer_id"))
+        conn.execute(text("INSERT INTO call_reviewers (call_id, reviewer_id) VALUES (1, 1)"))
+
+    assert {ix.name for ix in migrate_indexes.missing_indexes(engine)} == {
+        "ix_document_definitions_call_id", "uq_call_reviewers_call_id_reviewer_id",
+    }
+    created, skipped = migrate_indexes.migrate(engine)
+    assert created == ["ix_document_definitions_call_id"]
+    assert skipped == ["uq_call_reviewers_call_id_reviewer_id"]
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM call_reviewers WHERE id = (SELECT MAX(id) FROM call_reviewers)"))
+    assert migrate_indexes.migrate(engine) == (["uq_call_reviewers_call_id_reviewer_id"], [])
+    assert migrate_indexes.missing_indexes(engine) == []
+
+
+def test_unique_indexes_reject_duplicates(seeded):
+    _, Session = seeded
+    db = Session()
+    try:
+        db.add(Application(user_id=2, call_id=1, content="again"))
+        with pytest.raises(IntegrityError):
+            db.commit()
+        db.rollback()
+        db.add(Review(application_id=7, reviewer_id=1, score=1))
+        with pytest.raises(IntegrityError):
+            db.commit()
+        db.rollback()
+        with pytest.raises(ValueError, match="already assigned"):
+            application_crud.assign_reviewer(db, 7, 1)
+    finally:
+        db.close()
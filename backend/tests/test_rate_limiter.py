@@ -0,0 +1,68 @@
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.middleware.security import RateLimiter, classify_route
+
+SECOND = 1_000_000_000
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_limit_within_window():
+    clock = FakeClock()
+    limiter = RateLimiter(3, clock=clock)
+    assert all(limiter.is_allowed("1.1.1.1") for _ in range(3))
+    assert not limiter.is_allowed("1.1.1.1")
+    assert limiter.is_allowed("2.2.2.2")
+
+
+def test_previous_window_is_weighted():
+    clock = FakeClock()
+    limiter = RateLimiter(10, clock=clock)
+    for _ in range(10):
+        limiter.is_allowed("ip")
+    # Halfway through the next window half of the old requests still count
+    clock.now = 90 * SECOND
+    allowed = sum(limiter.is_allowed("ip") for _ in range(10))
+    assert allowed == 5
+    clock.now = 240 * SECOND
+    assert limiter.is_allowed("ip")
+
+
+def test_route_classes_have_separate_budgets():
+    clock = FakeClock()
+    limiter = RateLimiter(100, {"auth": 2, "upload": 0}, clock=clock)
+    assert limiter.is_allowed("ip", "auth")
+    assert limiter.is_allowed("ip", "auth")
+    assert not limiter.is_allowed("ip", "auth")
+    assert limiter.is_allowed("ip")
+    assert all(limiter.is_allowed("ip", "upload") for _ in range(500))
+
+
+def test_memory_is_bounded_and_idle_clients_expire():
+    clock = FakeClock()
+    limiter = RateLimiter(10, max_clients=100, clock=clock)
+    for i in range(1_000):
+        limiter.is_allowed(f"client-{i}")
+    assert len(limiter) == 100
+
+    clock.now = 10 * 60 * SECOND
+    for _ in range(60):
+        limiter.is_allowed("active")
+    assert len(limiter) < 100
+
+
+def test_classify_route():
+    assert classify_route("POST", "/auth/login") == "auth"
+    assert classify_route("POST", "/auth/password-reset/confirm") == "auth"
+    assert classify_route("POST", "/applications/4/attachments") == "upload"
+    assert classify_route("GET", "/applications/4/attachments") == "default"
+    assert classify_route("GET", "/calls/3/export-applications.pdf") == "export"
@@ -0,0 +1,87 @@
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from redis.asyncio import Redis
+
+from app.middleware.redis_limiter import RedisRateLimiter
+from app.middleware.security import RateLimiter
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+
+def redis_client():
+    """Real Redis when REDIS_TEST_URL is set, otherwise an in-process fake."""
+    url = os.environ.get("REDIS_TEST_URL")
+    return Redis.from_url(url) if url else fakeredis.FakeAsyncRedis()
+
+
+def test_limit_is_shared_between_workers():
+    async def scenario():
+        client = redis_client()
+        await client.flushdb()
+        workers = [RedisRateLimiter(client, RateLimiter(5)) for _ in range(2)]
+        results = await asyncio.gather(
+            *(workers[i % 2].check("10.0.0.1") for i in range(8))
+        )
+        assert sum(results) == 5
+        assert await workers[0].check("10.0.0.2")
+        await client.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_checks_in_one_tick_share_a_pipeline():
+    async def scenario():
+        client = redis_client()
+        await client.flushdb()
+        limiter = RedisRateLimiter(client, RateLimiter(100, {"auth": 3}))
+        executed = []
+        original = client.pipeline
+
+        def counting_pipeline(*args, **kwargs):
+            pipe = original(*args, **kwargs)
+            executed.append(pipe)
+            return pipe
+
+        client.pipeline = counting_pipeline
+        results = await asyncio.gather(*(limiter.check("ip", "auth") for _ in range(5)))
+        assert results == [True, True, True, False, False]
+        assert len(executed) == 1
+        await client.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_falls_back_to_local_limiter_when_redis_is_down():
+    async def scenario():
+        client = Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1)
+        limiter = RedisRateLimiter(client, RateLimiter(2))
+        results = [await limiter.check("ip") for _ in range(3)]
+        assert results == [True, True, False]
+        assert len(limiter.fallback) == 1
+        await client.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_flushes_are_kept_until_done_and_awaited_on_close():
+    async def scenario():
+        client = redis_client()
+        await client.flushdb()
+        limiter = RedisRateLimiter(client, RateLimiter(5))
+        checks = [asyncio.ensure_future(limiter.check("ip")) for _ in range(3)]
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert len(limiter._flushes) == 1
+        await limiter.aclose()
+        assert not limiter._flushes
+        assert await asyncio.gather(*checks) == [True, True, True]
+        await client.aclose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,219 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app.config import settings
+from app.routes import calls as calls_routes
+from app import database
+from app.dependencies import get_db, get_async_db, get_current_admin, get_current_user
+from app.models.call import Call
+from app.models.user import UserRole
+from app.services.response_cache import (
+    CachedResponse,
+    RedisResponseCache,
+    ResponseCache,
+    get_response_cache,
+    seconds_until_next_boundary,
+)
+
+
+class DummyAdmin:
+    id = 0
+    role = UserRole.ADMIN
+
+
+def entry(body=b"[]", ttl=60):
+    return CachedResponse(body=body, expires_at=time.time() + ttl)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResponseCache(maxsize=2)
+    for key in ("a", "b"):
+        cache.put(key, 0, entry())
+    cache.get("a")
+    cache.put("c", 0, entry())
+    assert cache.get("b")[0] is None
+    assert cache.get("a")[0] is not None
+
+
+def test_response_built_before_invalidation_is_not_stored():
+    cache = ResponseCache(maxsize=10)
+    _, generation = cache.get("k")
+    cache.invalidate()
+    cache.put("k", generation, entry(b"stale"))
+    assert cache.get("k")[0] is None
+
+
+def test_expired_entries_are_dropped():
+    cache = ResponseCache(maxsize=10)
+    cache.put("k", 0, CachedResponse(body=b"[]", expires_at=time.time() + 0.01))
+    time.sleep(0.02)
+    assert cache.get("k")[0] is None
+    assert len(cache) == 0
+
+
+def test_next_boundary_covers_start_and_just_after_end():
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert seconds_until_next_boundary([(now + timedelta(seconds=30), None)], now) == 30
+    assert seconds_until_next_boundary([(None, now)], now) == pytest.approx(0.001)
+    assert seconds_until_next_boundary([(now - timedelta(days=1), now - timedelta(hours=1))], now) is None
+    # Naive datetimes (SQLite) are treated as UTC
+    assert seconds_until_next_boundary([(datetime(2025, 1, 1, 0, 0, 5), None)], now) == 5
+
+
+def test_redis_cache_is_shared_and_invalidated_by_generation():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+
+    async def scenario():
+        server = fakeredis.FakeServer()
+        workers = [
+            RedisResponseCache(fakeredis.FakeAsyncRedis(server=server), fakeredis.FakeRedis(server=server),
+                               ResponseCache(10))
+            for _ in range(2)
+        ]
+        cached, generation = await workers[0].lookup("/calls/")
+        assert cached is None
+        await workers[0].store("/calls/", generation, CachedResponse(b'[{"id":1}]', time.time() + 60, {"link": "x"}))
+
+        hit, _ = await workers[1].lookup("/calls/")
+        assert hit.body == b'[{"id":1}]'
+        assert hit.headers == {"link": "x"}
+
+        workers[1].invalidate()
+        assert (await workers[0].lookup("/calls/"))[0] is None
+
+    asyncio.run(scenario())
+
+
+def test_async_invalidation_uses_the_async_client_and_skips_redis_while_down():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    from redis.exceptions import ConnectionError as RedisConnectionError
+
+    class NoSyncCalls:
+        def incr(self, key):
+            raise AssertionError("blocking client used on the event loop")
+
+    class DownRedis(fakeredis.FakeAsyncRedis):
+        calls = 0
+
+        async def incr(self, key, amount=1):
+            DownRedis.calls += 1
+            raise RedisConnectionError("down")
+
+    async def scenario():
+        async_redis = fakeredis.FakeAsyncRedis()
+        cache = RedisResponseCache(async_redis, NoSyncCalls(), ResponseCache(10))
+        await cache.invalidate_async()
+        assert await async_redis.get(cache.generation_key) == b"1"
+
+        down = RedisResponseCache(DownRedis(), NoSyncCalls(), ResponseCache(10))
+        down.fallback.put("k", 0, entry())
+        await down.invalidate_async()
+        await down.invalidate_async()
+        assert DownRedis.calls == 1
+        assert down.fallback.get("k")[0] is None
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture()
+def client(tmp_path):
+    db_path = tmp_path / "cache.db"
+    test_engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    session = TestingSessionLocal()
+    session.add(Call(title="cached call", is_open=True))
+    session.commit()
+    session.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_admin] = lambda: DummyAdmin()
+    app.dependency_overrides[get_current_user] = lambda: DummyAdmin()
+    get_response_cache.cache_clear()
+    # Rebuild the middleware stack so earlier tests' requests don't count towards the rate limit
+    app.middleware_stack = None
+
+    with TestClient(app, base_url="http://localhost") as c:
+        yield c
+
+    app.dependency_overrides = {}
+    get_response_cache.cache_clear()
+
+
+def test_listing_and_detail_are_served_from_cache(client):
+    first = client.get("/calls/")
+    assert first.headers["x-cache"] == "MISS"
+    second = client.get("/calls/")
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json()
+
+    detail = client.get("/calls/1")
+    assert detail.headers["x-cache"] == "MISS"
+    assert client.get("/calls/1").headers["x-cache"] == "HIT"
+    assert first.json() == [detail.json()]
+    assert {"description", "is_open", "is_active", "status"} <= detail.json().keys()
+    assert client.get("/calls/?only_open=true").headers["x-cache"] == "MISS"
+
+
+def test_pagination_headers_are_replayed_on_hits(client):
+    client.post("/calls/", json={"title": "second call"})
+    client.get("/calls/?limit=1")
+    hit = client.get("/calls/?limit=1")
+    assert hit.headers["x-cache"] == "HIT"
+    assert "x-next-cursor" in hit.headers
+
+
+def test_call_changes_invalidate_the_cache(client):
+    client.get("/calls/1")
+    client.put("/calls/1", json={"title": "renamed call"})
+    resp = client.get("/calls/1")
+    assert resp.headers["x-cache"] == "MISS"
+    assert resp.json()["title"] == "renamed call"
+
+    client.post("/calls/", json={"title": "new call"})
+    assert len(client.get("/calls/").json()) == 2
+
+
+def test_document_changes_invalidate_the_cache(client):
+    assert client.get("/calls/1/documents").json() == []
+    client.post("/admin/calls/1/documents/", json={"name": "CV", "allowed_formats": "pdf"})
+    resp = client.get("/calls/1/documents")
+    assert resp.headers["x-cache"] == "MISS"
+    assert [doc["name"] for doc in resp.json()] == ["CV"]
+
+
+def test_ttl_is_cut_short_by_an_upcoming_start_date():
+    soon = datetime.now(timezone.utc) + timedelta(seconds=5)
+    calls = [Call(start_date=None, end_date=None), Call(start_date=soon, end_date=None)]
+    assert 0 < calls_routes._cache_ttl(calls) <= 5
+    assert calls_routes._cache_ttl(calls[:1]) == settings.response_cache_ttl
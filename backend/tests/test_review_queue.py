@@ -0,0 +1,188 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.crud.review_queue import claim_next_review_async
+from app.dependencies import get_db, get_async_db, get_current_user
+from app.models.application import Application, ApplicationStatus
+from app.models.application_reviewer import ApplicationReviewer
+from app.models.attachment import Attachment
+from app.models.call import Call
+from app.models.review import Review
+from app.models.review_lease import ReviewLease
+from app.models.user import User, UserRole
+
+
+class DummyReviewer:
+    role = UserRole.REVIEWER
+
+    def __init__(self, user_id):
+        self.id = user_id
+
+
+@pytest.fixture()
+def client(tmp_path):
+    db_path = tmp_path / "queue.db"
+    test_engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    db = TestingSessionLocal()
+    soon = Call(title="Closing soon", is_open=True, end_date=datetime.utcnow() + timedelta(days=2))
+    open_ended = Call(title="Open ended", is_open=True)
+    reviewer, other = (User(email=f"rev{i}@example.com", hashed_password="x", role=UserRole.REVIEWER) for i in range(2))
+    applicants = [User(email=f"app{i}@example.com", hashed_password="x") for i in range(5)]
+    db.add_all([open_ended, soon, reviewer, other, *applicants])
+    db.flush()
+    calls = [open_ended, soon, soon, soon, soon]
+    apps = [
+        Application(user_id=u.id, call_id=c.id, content="x",
+                    status=ApplicationStatus.CANCELLED if i == 3 else ApplicationStatus.SUBMITTED)
+        for i, (u, c) in enumerate(zip(applicants, calls))
+    ]
+    db.add_all(apps)
+    db.flush()
+    # 0 and 1 are pending, 2 is reviewed, 3 is cancelled, 4 belongs to someone else
+    db.add_all(ApplicationReviewer(application_id=a.id, user_id=reviewer.id) for a in apps[:4])
+    db.add(ApplicationReviewer(application_id=apps[4].id, user_id=other.id))
+    db.add(Review(application_id=apps[2].id, reviewer_id=reviewer.id, score=70))
+    db.add(Attachment(application_id=apps[1].id, file_name="plan.pdf", content_hash="0" * 64,
+                      storage_key="k", size=10, content_type="application/pdf"))
+    db.commit()
+    ids = {"apps": [a.id for a in apps], "reviewer": reviewer.id}
+    db.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_user] = lambda: DummyReviewer(ids["reviewer"])
+    app.middleware_stack = None
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.ids = ids
+        c.engine = async_engine.sync_engine
+        c.session_factory = TestingSessionLocal
+        c.async_session_factory = AsyncTestingSessionLocal
+        yield c
+
+    app.dependency_overrides = {}
+
+
+def test_queue_lists_pending_assignments_by_deadline(client):
+    apps = client.ids["apps"]
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(client.engine, "before_cursor_execute", capture)
+    resp = client.get("/reviews/queue")
+    event.remove(client.engine, "before_cursor_execute", capture)
+
+    assert resp.status_code == 200
+    # The anti-join and one query for the attachments of the page
+    assert len(statements) == 2
+    items = resp.json()
+    assert [i["application_id"] for i in items] == [apps[1], apps[0]]
+    closing, open_ended = items
+    assert closing["call_title"] == "Closing soon" and closing["deadline"] is not None
+    assert open_ended["deadline"] is None
+    assert [a["file_name"] for a in closing["attachments"]] == ["plan.pdf"]
+    assert closing["leased_until"] is None
+
+    first_page = client.get("/reviews/queue?limit=1")
+    rest = client.get(f"/reviews/queue?limit=1&cursor={first_page.headers['x-next-cursor']}")
+    assert [i["application_id"] for i in rest.json()] == [apps[0]]
+
+
+def test_sessions_get_different_items_and_keep_their_own(client):
+    apps = client.ids["apps"]
+    first = client.post("/reviews/queue/next").json()
+    second = client.post("/reviews/queue/next").json()
+    assert first["item"]["application_id"] == apps[1]
+    assert second["item"]["application_id"] == apps[0]
+    assert first["lease_token"] != second["lease_token"]
+    assert client.post("/reviews/queue/next").status_code == 204
+
+    again = client.post("/reviews/queue/next", json={"lease_token": first["lease_token"]}).json()
+    assert again["item"]["application_id"] == apps[1]
+    assert again["lease_token"] == first["lease_token"]
+    assert all(i["leased_until"] for i in client.get("/reviews/queue").json())
+
+
+def test_expired_leases_are_taken_over(client):
+    first = client.post("/reviews/queue/next").json()
+    db = client.session_factory()
+    db.execute(update(ReviewLease).values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+    db.close()
+
+    taken = client.post("/reviews/queue/next").json()
+    assert taken["item"]["application_id"] == first["item"]["application_id"]
+    assert taken["lease_token"] != first["lease_token"]
+    # The old token no longer holds anything, so that session moves on
+    moved = client.post("/reviews/queue/next", json={"lease_token": first["lease_token"]}).json()
+    assert moved["item"]["application_id"] == client.ids["apps"][0]
+
+
+def test_reviewed_items_leave_the_queue(client):
+    item = client.post("/reviews/queue/next").json()["item"]
+    client.post("/reviews/", json={"application_id": item["application_id"], "score": 80})
+    assert [i["application_id"] for i in client.get("/reviews/queue").json()] == [client.ids["apps"][0]]
+
+
+def test_renewal_does_not_extend_a_lease_taken_over_meanwhile(client):
+    first = client.post("/reviews/queue/next").json()
+
+    def take_over():
+        db = client.session_factory()
+        db.execute(update(ReviewLease).values(token="other-session"))
+        db.commit()
+        db.close()
+
+    async def scenario():
+        async with client.async_session_factory() as db:
+            execute = db.execute
+
+            async def execute_then_take_over(*args, **kwargs):
+                result = await execute(*args, **kwargs)
+                if db.execute is execute_then_take_over:
+                    # Right after the renewal's SELECT
+                    db.execute = execute
+                    take_over()
+                return result
+
+            db.execute = execute_then_take_over
+            return await claim_next_review_async(db, client.ids["reviewer"], 60, first["lease_token"])
+
+    item, token, _ = asyncio.run(scenario())
+    assert item.application_id == client.ids["apps"][0]
+    assert token != first["lease_token"]
+    db = client.session_factory()
+    tokens = {lease.assignment_id: lease.token for lease in db.query(ReviewLease)}
+    db.close()
+    assert tokens[first["item"]["assignment_id"]] == "other-session"
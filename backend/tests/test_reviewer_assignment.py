@@ -0,0 +1,170 @@
+import os
+from collections import Counter
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.dependencies import get_db, get_current_admin
+from app.models.application import Application, ApplicationStatus
+from app.models.application_reviewer import ApplicationReviewer
+from app.models.call import Call
+from app.models.call_reviewer import CallReviewer
+from app.models.user import User, UserRole
+from app.services.reviewer_assignment import Candidate, plan_assignments
+
+
+class DummyAdmin:
+    id = 0
+    role = UserRole.ADMIN
+
+
+def test_load_is_balanced_across_the_pool():
+    applications = [Candidate(id=i, user_id=100 + i) for i in range(30)]
+    reviewers = [Candidate(id=r, user_id=r) for r in range(1, 8)]
+    plan = plan_assignments(applications, reviewers, {}, per_application=3)
+
+    per_app = Counter(a for a, _ in plan.assignments)
+    assert set(per_app.values()) == {3}
+    assert len(set(plan.assignments)) == 90
+    assert set(plan.loads.values()) <= {12, 13}
+    assert plan.shortfalls == {}
+
+
+def test_conflicts_of_interest_are_skipped():
+    applications = [
+        Candidate(id=1, user_id=10, organization="Acme Labs"),
+        Candidate(id=2, user_id=3, organization=None),  # a reviewer applying themselves
+    ]
+    reviewers = [
+        Candidate(id=1, user_id=1, organization=" acme labs"),
+        Candidate(id=2, user_id=2, organization="Other Uni"),
+        Candidate(id=3, user_id=3, organization="Third Inst"),
+    ]
+    plan = plan_assignments(applications, reviewers, {}, per_application=2)
+    assert sorted(plan.assignments) == [(1, 2), (1, 3), (2, 1), (2, 2)]
+
+
+def test_existing_assignments_count_and_shortfalls_are_reported():
+    applications = [Candidate(id=i, user_id=100 + i) for i in range(1, 4)]
+    reviewers = [Candidate(id=r, user_id=r) for r in (1, 2)]
+    plan = plan_assignments(applications, reviewers, {1: {1, 2}, 2: {1}}, per_application=3)
+
+    assert plan.assignments == [(2, 2), (3, 1), (3, 2)]
+    assert plan.shortfalls == {1: 1, 2: 1, 3: 1}
+    assert plan.loads == {1: 3, 2: 3}
+
+
+@pytest.fixture()
+def client(tmp_path):
+    test_engine = create_engine(f"sqlite:///{tmp_path / 'assign.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    db = TestingSessionLocal()
+    call = Call(title="Assignment call", is_open=True)
+    reviewers = [
+        User(email=f"rev{i}@example.com", hashed_password="x", role=UserRole.REVIEWER, organization=f"Org {i}")
+        for i in range(4)
+    ]
+    applicants = [
+        User(email=f"app{i}@example.com", hashed_password="x", organization=f"Org {i % 6}")
+        for i in range(20)
+    ]
+    db.add_all([call, *reviewers, *applicants])
+    db.flush()
+    db.add_all(CallReviewer(call_id=call.id, reviewer_id=r.id) for r in reviewers)
+    applications = [
+        Application(user_id=u.id, call_id=call.id, content="x",
+                    status=ApplicationStatus.CANCELLED if i == 19 else ApplicationStatus.SUBMITTED)
+        for i, u in enumerate(applicants)
+    ]
+    db.add_all(applications)
+    db.flush()
+    db.add(ApplicationReviewer(application_id=applications[0].id, user_id=reviewers[1].id))
+    db.commit()
+    ids = {"call": call.id}
+    db.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin] = lambda: DummyAdmin()
+    app.middleware_stack = None
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.ids = ids
+        c.engine = test_engine
+        c.session_factory = TestingSessionLocal
+        yield c
+
+    app.dependency_overrides = {}
+
+
+def assignment_count(client):
+    db = client.session_factory()
+    try:
+        return db.scalar(select(func.count()).select_from(ApplicationReviewer))
+    finally:
+        db.close()
+
+
+def test_dry_run_previews_without_writing(client):
+    url = f"/applications/admin/calls/{client.ids['call']}/assign-reviewers"
+    resp = client.post(url, json={"per_application": 2, "dry_run": True})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["created"] == 0
+    # 19 active applications, two reviewers each, one already assigned
+    assert len(body["assignments"]) == 37
+    assert assignment_count(client) == 1
+
+
+def test_assignment_is_written_in_one_transaction_and_is_idempotent(client):
+    url = f"/applications/admin/calls/{client.ids['call']}/assign-reviewers"
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(client.engine, "before_cursor_execute", capture)
+    body = client.post(url, json={"per_application": 2}).json()
+    event.remove(client.engine, "before_cursor_execute", capture)
+
+    assert body["created"] == 37
+    assert body["shortfalls"] == []
+    loads = [load["assigned"] for load in body["reviewer_loads"]]
+    assert sum(loads) == 38 and max(loads) - min(loads) <= 1
+    # Call lookup, three loads and one batched INSERT, whatever the call's size
+    assert len(statements) == 5
+    assert assignment_count(client) == 38
+
+    db = client.session_factory()
+    rows = db.execute(
+        select(ApplicationReviewer.application_id, User.organization, Application.user_id)
+        .join(User, User.id == ApplicationReviewer.user_id)
+        .join(Application, Application.id == ApplicationReviewer.application_id)
+    ).all()
+    applicant_orgs = dict(db.execute(select(User.id, User.organization)).all())
+    db.close()
+    assert all(applicant_orgs[user_id] != org for _, org, user_id in rows)
+    assert set(Counter(app_id for app_id, _, _ in rows).values()) == {2}
+
+    assert client.post(url, json={"per_application": 2}).json()["created"] == 0
+
+
+def test_unknown_call_and_cap(client):
+    assert client.post("/applications/admin/calls/999/assign-reviewers", json={}).status_code == 404
+    url = f"/applications/admin/calls/{client.ids['call']}/assign-reviewers"
+    assert client.post(url, json={"per_application": 4}).status_code == 422
@@ -0,0 +1,150 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.crud import reviewer_invite as invite_crud
+from app.dependencies import get_db, get_current_admin
+from app.models.call import Call
+from app.models.call_reviewer import CallReviewer
+from app.models.email_outbox import EmailOutbox
+from app.models.reviewer_invite import ReviewerInvite
+from app.models.user import User, UserRole
+
+
+class DummyAdmin:
+    id = 0
+    role = UserRole.ADMIN
+
+
+@pytest.fixture()
+def client(tmp_path):
+    test_engine = create_engine(f"sqlite:///{tmp_path / 'invites.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    db = TestingSessionLocal()
+    call = Call(title="Invite call", is_open=True)
+    reviewer = User(email="member@example.com", hashed_password="x", role=UserRole.REVIEWER)
+    db.add_all([call, reviewer])
+    db.flush()
+    db.add(CallReviewer(call_id=call.id, reviewer_id=reviewer.id))
+    db.add(ReviewerInvite(call_id=call.id, email="pending@example.com", token="PEND01",
+                          expires_at=datetime.utcnow() + timedelta(days=1)))
+    db.add(ReviewerInvite(call_id=call.id, email="lapsed@example.com", token="LAPS01",
+                          expires_at=datetime.utcnow() - timedelta(days=1)))
+    db.commit()
+    call_id = call.id
+    db.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin] = lambda: DummyAdmin()
+    app.middleware_stack = None
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.call_id = call_id
+        c.engine = test_engine
+        c.session_factory = TestingSessionLocal
+        yield c
+
+    app.dependency_overrides = {}
+
+
+def count(client, model):
+    db = client.session_factory()
+    try:
+        return db.scalar(select(func.count()).select_from(model))
+    finally:
+        db.close()
+
+
+def test_bulk_invite_reports_each_email(client):
+    resp = client.post("/reviewer/invites/bulk", json={
+        "call_id": client.call_id,
+        "emails": ["new@example.com", "not-an-email", "NEW@example.com", "member@example.com",
+                   "pending@example.com", "lapsed@example.com"],
+    })
+    assert resp.status_code == 201
+    body = resp.json()
+    assert [(r["email"], r["status"]) for r in body["results"]] == [
+        ("new@example.com", "invited"),
+        ("not-an-email", "invalid"),
+        ("NEW@example.com", "duplicate"),
+        ("member@example.com", "already_reviewer"),
+        ("pending@example.com", "already_invited"),
+        ("lapsed@example.com", "invited"),
+    ]
+    assert body["invited"] == 2
+    assert all(r["invite_id"] for r in body["results"] if r["status"] == "invited")
+
+    db = client.session_factory()
+    emails = db.scalars(select(EmailOutbox).order_by(EmailOutbox.to_email)).all()
+    tokens = dict(db.execute(select(ReviewerInvite.email, ReviewerInvite.token)).all())
+    db.close()
+    assert [e.to_email for e in emails] == ["lapsed@example.com", "new@example.com"]
+    assert tokens["new@example.com"] in emails[1].body
+    assert "Invite call" in emails[1].subject
+
+
+def test_existing_invites_and_reviewers_match_case_insensitively(client):
+    resp = client.post("/reviewer/invites/bulk", json={
+        "call_id": client.call_id,
+        "emails": ["Member@example.com", "Pending@example.com"],
+    })
+    assert [r["status"] for r in resp.json()["results"]] == ["already_reviewer", "already_invited"]
+    assert resp.json()["invited"] == 0
+
+
+def test_thousand_invites_take_a_constant_number_of_statements(client):
+    emails = [f"reviewer{i}@example.com" for i in range(1000)]
+    statements = []
+    event.listen(client.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    resp = client.post("/reviewer/invites/bulk", json={"call_id": client.call_id, "emails": emails})
+    assert resp.json()["invited"] == 1000
+    # call lookup, open invites, existing reviewers, token check, invites INSERT, outbox INSERT
+    assert len(statements) <= 6
+    assert count(client, ReviewerInvite) == 1002
+    assert count(client, EmailOutbox) == 1000
+
+    db = client.session_factory()
+    assert db.scalar(select(func.count(func.distinct(ReviewerInvite.token)))) == 1002
+    db.close()
+
+
+def test_bulk_request_is_bounded_and_call_must_exist(client):
+    emails = [f"r{i}@example.com" for i in range(1001)]
+    assert client.post("/reviewer/invites/bulk", json={"call_id": client.call_id, "emails": emails}).status_code == 422
+    assert client.post("/reviewer/invites/bulk", json={"call_id": 999, "emails": ["a@example.com"]}).status_code == 404
+
+
+def test_generated_tokens_skip_existing_ones(client, monkeypatch):
+    candidates = iter(["PEND01", "PEND01", "FRESH1", "FRESH2"])
+    monkeypatch.setattr(invite_crud, "new_token", lambda: next(candidates))
+    db = client.session_factory()
+    try:
+        assert sorted(invite_crud.generate_tokens(db, 2)) == ["FRESH1", "FRESH2"]
+    finally:
+        db.close()
+
+
+def test_single_invite_is_created_and_mailed(client):
+    resp = client.post("/reviewer/invites/generate", json={"call_id": client.call_id, "email": "solo@example.com"})
+    assert resp.status_code == 201
+    assert len(resp.json()["token"]) == 6
+    assert count(client, EmailOutbox) == 1
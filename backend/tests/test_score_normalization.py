@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.services.score_normalization import (
+    ScoreMatrix,
+    competition_rank,
+    normalize_rankings,
+    zscore_scores,
+)
+
+
+def harsh_reviewer_matrix():
+    """Six applications of falling quality, two reviews each; reviewer 102 scores 30 points low."""
+    quality = [90, 80, 70, 60, 50, 40]
+    bias = {100: 0, 101: 0, 102: -30}
+    reviews = [(a, 100 + (a + k) % 3) for a in range(6) for k in (0, 1)]
+    return ScoreMatrix.from_triples(
+        [a for a, _ in reviews], [r for _, r in reviews], [quality[a] + bias[r] for a, r in reviews]
+    )
+
+
+@pytest.mark.parametrize("method", ["zscore", "calibration"])
+def test_normalization_undoes_a_harsh_reviewer(method):
+    ranking = normalize_rankings(harsh_reviewer_matrix(), method)
+    assert ranking.application_ids.tolist() == [0, 1, 2, 3, 4, 5]
+    assert ranking.rank.tolist() == [1, 2, 3, 4, 5, 6]
+    # Application 2 was read by the harsh reviewer twice and falls behind 3 on raw means
+    assert ranking.raw_rank.tolist() == [1, 2, 4, 3, 5, 6]
+
+
+def test_zscores_match_a_per_reviewer_loop():
+    rng = np.random.default_rng(7)
+    apps, reviewers = rng.integers(0, 40, 300), rng.integers(0, 12, 300)
+    scores = rng.integers(0, 101, 300)
+    matrix = ScoreMatrix.from_triples(apps, reviewers, scores)
+
+    mean, std = scores.mean(), scores.std()
+    expected = []
+    for reviewer, score in zip(reviewers, scores):
+        own = scores[reviewers == reviewer]
+        expected.append(mean + (score - own.mean()) / own.std() * std)
+    assert zscore_scores(matrix) == pytest.approx(expected)
+
+
+def test_ties_share_a_rank_and_pages_follow_it():
+    assert competition_rank(np.array([70.0, 90.0, 70.0, 50.0])).tolist() == [2, 1, 2, 4]
+
+    matrix = ScoreMatrix.from_rows([(a, 1, s) for a, s in [(10, 70), (11, 90), (12, 70), (13, 50)]])
+    ranking = normalize_rankings(matrix, "calibration")
+    first = ranking.page(limit=2)
+    assert [(r["rank"], r["application_id"]) for r in first.items] == [(1, 11), (2, 10)]
+    second = ranking.page(cursor=first.next_cursor, limit=2)
+    assert [(r["rank"], r["application_id"]) for r in second.items] == [(2, 12), (4, 13)]
+    assert second.next_cursor is None
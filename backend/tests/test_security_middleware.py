@@ -0,0 +1,69 @@
+import os
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.middleware.security import RateLimiter, SecurityMiddleware
+
+
+async def ok(request):
+    return JSONResponse({"ok": True})
+
+
+async def stream(request):
+    async def body():
+        for i in range(3):
+            yield f"chunk{i}".encode()
+    return StreamingResponse(body())
+
+
+def make_client(limit=100, hosts=("localhost",)):
+    inner = Starlette(routes=[Route("/", ok), Route("/stream", stream)])
+    app = SecurityMiddleware(inner, rate_limiter=RateLimiter(limit), allowed_hosts=list(hosts))
+    return TestClient(app, base_url="http://localhost")
+
+
+def test_security_headers_are_added():
+    resp = make_client().get("/")
+    assert resp.status_code == 200
+    assert resp.headers["x-frame-options"] == "DENY"
+    assert resp.headers["x-content-type-options"] == "nosniff"
+
+
+def test_streamed_body_passes_through():
+    resp = make_client().get("/stream")
+    assert resp.content == b"chunk0chunk1chunk2"
+    assert "strict-transport-security" in resp.headers
+
+
+def test_invalid_host_is_rejected():
+    client = make_client()
+    assert client.get("/", headers={"host": "evil.example"}).status_code == 400
+    forwarded = client.get("/", headers={"x-forwarded-host": "localhost, proxy"})
+    assert forwarded.status_code == 200
+
+
+def test_rate_limit_returns_429():
+    client = make_client(limit=2)
+    assert [client.get("/").status_code for _ in range(3)] == [200, 200, 429]
+    assert client.get("/").json() == {"detail": "Too many requests"}
+
+
+def test_limiter_is_closed_on_shutdown():
+    class ClosingLimiter(RateLimiter):
+        closed = False
+
+        async def aclose(self):
+            self.closed = True
+
+    limiter = ClosingLimiter(100)
+    app = SecurityMiddleware(Starlette(routes=[Route("/", ok)]), rate_limiter=limiter, allowed_hosts=["localhost"])
+    with TestClient(app, base_url="http://localhost") as client:
+        assert client.get("/").status_code == 200
+        assert not limiter.closed
+    assert limiter.closed
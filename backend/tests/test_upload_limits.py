@@ -0,0 +1,189 @@
+import io
+import os
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.main import app
+from app import database
+from app.config import settings
+from app.dependencies import get_db, get_current_user
+from app.middleware.upload_limit import RequestSizeLimitMiddleware
+from app.models.application import Application
+from app.models.attachment import Attachment
+from app.models.call import Call
+from app.models.document import DocumentDefinition, DocumentFormat
+from app.models.user import User, UserRole
+from app.services.blob_store import get_blob_store
+from app.services.file_upload import UploadStream
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+def test_upload_stream_aborts_once_limit_is_crossed():
+    source = CountingReader(b"a" * 1_000_000)
+    stream = UploadStream(source, max_size=100_000)
+    with pytest.raises(HTTPException) as exc:
+        while stream.read(8192):
+            pass
+    assert exc.value.status_code == 413
+    assert source.consumed < 100_000 + 8192 * 2
+
+
+def test_upload_stream_sniffs_mime_before_consuming():
+    stream = UploadStream(io.BytesIO(b"%PDF-1.4\n" + b"x" * 10_000), 1 << 20, ["pdf"])
+    data = b"".join(iter(lambda: stream.read(1000), b""))
+    assert stream.content_type == "application/pdf"
+    assert data.startswith(b"%PDF-1.4")
+    assert stream.size == len(data)
+
+    with pytest.raises(HTTPException) as exc:
+        UploadStream(io.BytesIO(b"plain text"), 1 << 20, ["pdf"]).read(1000)
+    assert exc.value.status_code == 400
+
+
+def test_request_size_middleware_rejects_streamed_body():
+    async def echo(request):
+        form = await request.form()
+        return JSONResponse({"fields": len(form)})
+
+    inner = Starlette(routes=[Route("/", echo, methods=["POST"])])
+    with TestClient(RequestSizeLimitMiddleware(inner, max_size=1024)) as c:
+        ok = c.post("/", files={"f": ("a.txt", b"x" * 100, "text/plain")})
+        assert ok.status_code == 200
+        too_big = c.post("/", files={"f": ("a.txt", b"x" * 4096, "text/plain")})
+        assert too_big.status_code == 413
+
+
+@pytest.fixture()
+def client(tmp_path):
+    settings.upload_dir = str(tmp_path / "uploads")
+    get_blob_store.cache_clear()
+    test_engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    database.Base.metadata.create_all(bind=test_engine)
+
+    session = TestingSessionLocal()
+    user = User(email="u@example.com", hashed_password="x", role=UserRole.APPLICANT)
+    call = Call(title="test call", description="d", is_open=True)
+    session.add_all([user, call])
+    session.commit()
+    document = DocumentDefinition(call_id=call.id, name="Proposal", allowed_formats=DocumentFormat.pdf)
+    application = Application(user_id=user.id, call_id=call.id, content="content")
+    session.add_all([document, application])
+    session.commit()
+    url = f"/applications/{application.id}/attachments?document_id={document.id}"
+    session.refresh(user)
+    session.expunge_all()
+    session.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: user
+    original_limit = settings.max_upload_size
+
+    with TestClient(app, base_url="http://localhost") as c:
+        c.url = url
+        c.session_factory = TestingSessionLocal
+        yield c
+
+    settings.max_upload_size = original_limit
+    app.dependency_overrides = {}
+    get_blob_store.cache_clear()
+
+
+def test_oversized_upload_is_rejected_and_not_stored(client):
+    settings.max_upload_size = 10_000
+    resp = client.post(
+        client.url,
+        files={"file": ("big.pdf", io.BytesIO(b"%PDF-1.4\n" + b"x" * 50_000), "application/pdf")},
+    )
+    assert resp.status_code == 413
+    db = client.session_factory()
+    assert db.query(Attachment).count() == 0
+    db.close()
+    assert not [p for p in Path(settings.upload_dir).rglob("*") if p.is_file()]
+
+
+def test_chunked_upload_over_the_request_limit_gets_413(client, monkeypatch):
+    (limit,) = [m for m in app.user_middleware if m.cls is RequestSizeLimitMiddleware]
+    monkeypatch.setitem(limit.kwargs, "max_size", 10_000)
+    app.middleware_stack = None
+    boundary = "limit-test"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"big.pdf\"\r\n"
+        f"Content-Type: application/pdf\r\n\r\n".encode()
+        + b"%PDF-1.4\n" + b"x" * 50_000 + f"\r\n--{boundary}--\r\n".encode()
+    )
+
+    def chunks():
+        # A generator body is sent without Content-Length
+        for i in range(0, len(body), 4096):
+            yield body[i:i + 4096]
+
+    try:
+        resp = client.post(
+            client.url, content=chunks(), headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+        )
+    finally:
+        app.middleware_stack = None
+    assert resp.status_code == 413
+    assert resp.json()["detail"] == "Request body too large"
+    db = client.session_factory()
+    assert db.query(Attachment).count() == 0
+    db.close()
+
+
+def test_sniffed_content_type_is_recorded(client):
+    resp = client.post(
+        client.url,
+        files={"file": ("doc.pdf", io.BytesIO(b"%PDF-1.4\nbody"), "application/octet-stream")},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["content_type"] == "application/pdf"
+
+
+def test_spoofed_extension_is_rejected(client):
+    resp = client.post(
+        client.url,
+        files={"file": ("doc.pdf", io.BytesIO(b"just text"), "application/pdf")},
+    )
+    assert resp.status_code == 400
+
+
+def test_empty_upload_is_rejected_and_not_stored(client):
+    resp = client.post(client.url, files={"file": ("empty.pdf", io.BytesIO(b""), "application/pdf")})
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Empty file"
+    db = client.session_factory()
+    assert db.query(Attachment).count() == 0
+    db.close()
+    assert not [p for p in Path(settings.upload_dir).rglob("*") if p.is_file()]
@@ -1,5 +1,5 @@
 import { authHeaders } from './auth'
-import { API_BASE } from './config'
+import { API_BASE, fetchAllPages } from './config'
 
 export interface ApplicationData {
   call_id: number
@@ -70,20 +70,20 @@ export async function fetchApplicationByUserAndCall(callId: number): Promise<App
 
 // 3. Kullanıcıya ait tüm başvuruları getir
 export async function fetchMyApplications(): Promise<MyApplication[]> {
-  const res = await fetch(`${API_BASE}/applications/me`, {
-    headers: authHeaders(),
-  })
-  if (!res.ok) throw new Error('Failed to fetch my applications')
-  return res.json()
+  return fetchAllPages<MyApplication>(
+    `${API_BASE}/applications/me`,
+    { headers: authHeaders() },
+    'Failed to fetch my applications'
+  )
 }
 
 // 4. Admin/Reviewer için tüm başvuruları getir
 export async function fetchApplications(callId: number): Promise<ApplicationDetail[]> {
-  const res = await fetch(`${API_BASE}/calls/${callId}/applications`, {
-    headers: authHeaders(),
-  })
-  if (!res.ok) throw new Error('Failed to fetch applications')
-  return res.json()
+  return fetchAllPages<ApplicationDetail>(
+    `${API_BASE}/calls/${callId}/applications`,
+    { headers: authHeaders() },
+    'Failed to fetch applications'
+  )
 }
 
 // 5. Admin/Reviewer için başvuru detaylarını getir
@@ -210,9 +210,9 @@ export async function assignReviewer(applicationId: number, reviewerId: number):
 
 // 11. Hakem listesini getir (admin için)
 export async function fetchReviewers(): Promise<User[]> {
-  const res = await fetch(`${API_BASE}/users/admin/reviewers`, {
-    headers: authHeaders(),
-  })
-  if (!res.ok) throw new Error('Failed to fetch reviewers')
-  return res.json()
+  return fetchAllPages<User>(
+    `${API_BASE}/users/admin/reviewers`,
+    { headers: authHeaders() },
+    'Failed to fetch reviewers'
+  )
 }
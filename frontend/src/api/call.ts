@@ -1,5 +1,5 @@
 import { authHeaders } from './auth'
-import { API_BASE } from './config'
+import { API_BASE, fetchAllPages } from './config'
 
 export interface Call { id: number; title: string; description?: string; is_open: boolean; start_date?: string; end_date?: string; category?: string; max_applications?: number; updated_at?: string }
 export interface CallInput { title?: string; description?: string|null; is_open?: boolean; start_date?: string|null; end_date?: string|null; category?: string|null; max_applications?: number|null; status?: string }
@@ -7,9 +7,7 @@ export interface CallInput { title?: string; description?: string|null; is_open?
 export async function fetchCalls(onlyOpen = false): Promise<Call[]> {
   const url = new URL(`${API_BASE}/calls/`)
   if (onlyOpen) url.searchParams.set('only_open','true')
-  const res = await fetch(url.toString())
-  if (!res.ok) throw new Error('Failed to fetch calls')
-  return res.json()
+  return fetchAllPages<Call>(url.toString(), {}, 'Failed to fetch calls')
 }
 
 export async function fetchCall(callId: number): Promise<Call> {
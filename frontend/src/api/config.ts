@@ -1 +1,16 @@
 export const API_BASE = import.meta.env.VITE_API_BASE || 'http://localhost:8000'
+
+// Liste uç noktaları cursor ile sayfalanır; X-Next-Cursor bitene kadar tüm sayfaları toplar
+export async function fetchAllPages<T>(url: string, init: RequestInit, errorMessage: string): Promise<T[]> {
+  const items: T[] = []
+  let cursor: string | null = null
+  do {
+    const pageUrl = new URL(url)
+    if (cursor) pageUrl.searchParams.set('cursor', cursor)
+    const res = await fetch(pageUrl.toString(), init)
+    if (!res.ok) throw new Error(errorMessage)
+    items.push(...(await res.json()))
+    cursor = res.headers.get('X-Next-Cursor')
+  } while (cursor)
+  return items
+}
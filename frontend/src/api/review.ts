@@ -1,4 +1,4 @@
-import { API_BASE } from './config'
+import { API_BASE, fetchAllPages } from './config'
 import { authHeaders } from './auth'
 
 export interface ReviewCreate {
@@ -30,11 +30,11 @@ export async function submitReview(payload: ReviewCreate): Promise<ReviewOut> {
 
 // Reviewer kendi yaptığı değerlendirmeleri alır
 export async function fetchMyReviews(): Promise<ReviewOut[]> {
-  const res = await fetch(`${API_BASE}/reviews/me`, {
-    headers: { ...authHeaders() },
-  })
-  if (!res.ok) throw new Error('Failed to fetch my reviews')
-  return res.json()
+  return fetchAllPages<ReviewOut>(
+    `${API_BASE}/reviews/me`,
+    { headers: { ...authHeaders() } },
+    'Failed to fetch my reviews'
+  )
 }
 
 // Reviewer bir başvuruya ait tüm reviewları görür